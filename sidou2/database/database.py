@@ -44,6 +44,20 @@ def get_db_connection():
         conn.row_factory = sqlite3.Row
         # Enforce foreign key constraints. By default, SQLite doesn't, so this is important for data integrity.
         conn.execute("PRAGMA foreign_keys = ON;")
+        # Performance tuning, applied once per connection (the WAL journal mode is stored
+        # in the database file, so it is set once by initialize_database()):
+        # - synchronous=NORMAL: safe with WAL and avoids an fsync on every commit.
+        # - temp_store=MEMORY: sorts and GROUP BY temporaries stay in RAM.
+        # - cache_size=-65536: 64 MiB page cache (negative value = size in KiB).
+        # - mmap_size: memory-map up to 256 MiB of the file for read-heavy queries.
+        conn.executescript(
+            """
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -65536;
+            PRAGMA mmap_size = 268435456;
+            """
+        )
         logger.debug("Database connection established.")
         return conn
     except sqlite3.Error as e:
@@ -52,6 +66,38 @@ def get_db_connection():
         raise DatabaseError(f"Could not connect to the database: {e}")
 
 
+# --- Reference Data Cache ---
+# Results of the product and customer list queries: {table name: {SQL: rows}}.
+# Several views reload these lists on every refresh while the tables rarely change,
+# so each query is run once and its rows are dropped by the functions writing to
+# its table.
+_reference_cache = {}
+
+
+def _invalidate_cache(*tables):
+    """Drops the cached lists of the given tables (e.g. "Products", "Customers")."""
+    for table in tables:
+        _reference_cache.pop(table, None)
+
+
+def _cached_query(table, sql):
+    """
+    Returns the rows of 'sql', a SELECT reading only 'table', from the cache when possible
+    (the query is run again after _invalidate_cache(table)).
+    Returns a copy of the cached list, so callers cannot alter it.
+    """
+    queries = _reference_cache.setdefault(table, {})
+    rows = queries.get(sql)
+    if rows is None:
+        conn = get_db_connection()
+        try:
+            rows = conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+        queries[sql] = rows
+    return list(rows)
+
+
 # --- Database Initialization ---
 def initialize_database():
     """
@@ -62,6 +108,11 @@ def initialize_database():
     conn = get_db_connection()  # Get a database connection.
     cursor = conn.cursor()  # Create a cursor object to execute SQL commands.
     try:
+        # WAL journal: readers (dashboard, lists) don't block writers (sales, purchases).
+        # The mode is persistent (stored in the file), so later connections use it
+        # without issuing the PRAGMA again.
+        conn.execute("PRAGMA journal_mode = WAL;")
+
         # --- Table Creation ---
         # SQL statements use "CREATE TABLE IF NOT EXISTS" to avoid errors if tables already exist.
 
@@ -202,6 +253,8 @@ def initialize_database():
             "idx_saleitems_sale_id": "CREATE INDEX IF NOT EXISTS idx_saleitems_sale_id ON SaleItems(sale_id);",
             "idx_saleitems_product_id": "CREATE INDEX IF NOT EXISTS idx_saleitems_product_id ON SaleItems(product_id);",
             "idx_purchases_product_id": "CREATE INDEX IF NOT EXISTS idx_purchases_product_id ON Purchases(product_id);",
+            # Matches the ORDER BY of get_purchase_history: the most recent page is read from the index.
+            "idx_purchases_date": "CREATE INDEX IF NOT EXISTS idx_purchases_date ON Purchases(purchase_date DESC, id DESC);",
             "idx_sales_customer_id": "CREATE INDEX IF NOT EXISTS idx_sales_customer_id ON Sales(customer_id);",
             "idx_sales_sale_date": "CREATE INDEX IF NOT EXISTS idx_sales_sale_date ON Sales(sale_date);",
         }
@@ -242,6 +295,7 @@ def add_customer(name, phone=None, email=None, address=None):
             (name, address, phone, email),
         )
         conn.commit()  # Save the changes.
+        _invalidate_cache("Customers")
         customer_id = cursor.lastrowid  # Get the ID of the newly inserted row.
         logger.info(f"Customer '{name}' (ID: {customer_id}) added successfully.")
         return customer_id
@@ -253,21 +307,17 @@ def add_customer(name, phone=None, email=None, address=None):
 def get_all_customers():
     """
     Retrieves all customers from the database, ordered by name (case-insensitive).
+    The result is cached until a customer is added, updated or deleted.
     Returns a list of customer records.
     """
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        # Selects specified columns from all rows in Customers, ordered by name.
-        # COLLATE NOCASE ensures case-insensitive sorting.
-        cursor.execute(
-            "SELECT id, name, address, phone, email FROM Customers ORDER BY name COLLATE NOCASE"
-        )
-        customers = cursor.fetchall()  # Fetch all rows from the query result.
-        logger.debug(f"Retrieved {len(customers)} customers.")
-        return customers
-    finally:
-        conn.close()
+    # Selects specified columns from all rows in Customers, ordered by name.
+    # COLLATE NOCASE ensures case-insensitive sorting.
+    customers = _cached_query(
+        "Customers",
+        "SELECT id, name, address, phone, email FROM Customers ORDER BY name COLLATE NOCASE",
+    )
+    logger.debug(f"Retrieved {len(customers)} customers.")
+    return customers
 
 
 @handle_db_error
@@ -291,6 +341,7 @@ def update_customer(customer_id, name, phone=None, email=None, address=None):
             (name, address, phone, email, customer_id),
         )
         conn.commit()
+        _invalidate_cache("Customers")
         if cursor.rowcount == 0:  # Check if any row was actually updated.
             logger.warning(
                 f"Attempted to update non-existent customer ID: {customer_id}"
@@ -315,6 +366,7 @@ def delete_customer(customer_id):
         # SQL DELETE statement to remove a row.
         cursor.execute("DELETE FROM Customers WHERE id = ?", (customer_id,))
         conn.commit()
+        _invalidate_cache("Customers")
         if cursor.rowcount == 0:
             logger.warning(
                 f"Attempted to delete non-existent customer ID: {customer_id}"
@@ -358,6 +410,7 @@ def add_product(
             (name, description, category, purchase_price, selling_price, initial_stock),
         )
         conn.commit()
+        _invalidate_cache("Products")
         product_id = cursor.lastrowid
         logger.info(f"Product '{name}' (ID: {product_id}) added successfully.")
         return product_id
@@ -369,16 +422,50 @@ def add_product(
 def get_all_products():
     """
     Retrieves all products from the database, ordered by name (case-insensitive).
+    The result is cached until a product, purchase or sale changes the Products table.
+    Returns a list of product records.
+    """
+    products = _cached_query(
+        "Products",
+        "SELECT id, name, description, category, purchase_price, selling_price, quantity_in_stock FROM Products ORDER BY name COLLATE NOCASE",
+    )
+    logger.debug(f"Retrieved {len(products)} products.")
+    return products
+
+
+@handle_db_error
+def get_products_for_sale():
+    """
+    Retrieves the id, name, selling price and stock of the products that can be sold
+    (stock > 0), ordered by name (case-insensitive). Out-of-stock products are
+    filtered by SQLite instead of being transferred and skipped by the caller.
+    The result is cached until the Products table changes.
+    Returns a list of product records.
+    """
+    products = _cached_query(
+        "Products",
+        "SELECT id, name, selling_price, quantity_in_stock FROM Products "
+        "WHERE quantity_in_stock > 0 ORDER BY name COLLATE NOCASE",
+    )
+    logger.debug(f"Retrieved {len(products)} products available for sale.")
+    return products
+
+
+@handle_db_error
+def get_product_summaries():
+    """
+    Retrieves only the id, name and stock of every product, ordered by name (case-insensitive).
+    Lighter than get_all_products() for product selection lists.
     Returns a list of product records.
     """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
         cursor.execute(
-            "SELECT id, name, description, category, purchase_price, selling_price, quantity_in_stock FROM Products ORDER BY name COLLATE NOCASE"
+            "SELECT id, name, quantity_in_stock FROM Products ORDER BY name COLLATE NOCASE"
         )
         products = cursor.fetchall()
-        logger.debug(f"Retrieved {len(products)} products.")
+        logger.debug(f"Retrieved {len(products)} product summaries.")
         return products
     finally:
         conn.close()
@@ -432,6 +519,7 @@ def update_product(
             (name, description, category, purchase_price, selling_price, product_id),
         )
         conn.commit()
+        _invalidate_cache("Products")
         if cursor.rowcount == 0:
             logger.warning(f"Attempted to update non-existent product ID: {product_id}")
             raise DatabaseError(f"Product with ID {product_id} not found for update.")
@@ -454,6 +542,7 @@ def delete_product(product_id):
         cursor = conn.cursor()
         cursor.execute("DELETE FROM Products WHERE id = ?", (product_id,))
         conn.commit()
+        _invalidate_cache("Products")
         if cursor.rowcount == 0:
             logger.warning(f"Attempted to delete non-existent product ID: {product_id}")
             return False
@@ -463,35 +552,93 @@ def delete_product(product_id):
         conn.close()
 
 
+# SQL text of the product search/count queries, built once per query shape
+# (kind, has_query, has_category, paged, has_min_qty, has_max_qty) and reused on later calls.
+_PRODUCT_SEARCH_SQL = {}
+
+
+def _product_search_sql(
+    kind, has_query, has_category, paged=False, has_min_qty=False, has_max_qty=False
+):
+    """
+    Returns the SQL text for a product search ('select') or count ('count') query.
+    Only a handful of shapes exist, so each one is assembled once and cached.
+    """
+    shape = (kind, has_query, has_category, paged, has_min_qty, has_max_qty)
+    sql = _PRODUCT_SEARCH_SQL.get(shape)
+    if sql is None:
+        if kind == "count":
+            sql = "SELECT COUNT(*) FROM Products WHERE 1=1"
+        else:
+            sql = "SELECT id, name, description, category, purchase_price, selling_price, quantity_in_stock FROM Products WHERE 1=1"
+        if has_query:  # Search in name and description.
+            sql += " AND (LOWER(name) LIKE LOWER(?) OR LOWER(description) LIKE LOWER(?))"
+        if has_category:  # Category filter.
+            sql += " AND category = ?"
+        if has_min_qty:  # Stock level filter (lower bound).
+            sql += " AND quantity_in_stock >= ?"
+        if has_max_qty:  # Stock level filter (upper bound).
+            sql += " AND quantity_in_stock <= ?"
+        if kind != "count":
+            sql += " ORDER BY name COLLATE NOCASE"  # Always order results.
+            if paged:  # Only one page of results.
+                sql += " LIMIT ? OFFSET ?"
+        _PRODUCT_SEARCH_SQL[shape] = sql
+    return sql
+
+
+def _product_search_params(query="", category_filter=None, min_qty=None, max_qty=None):
+    """
+    Returns the (has_query, has_category, has_min_qty, has_max_qty, params) of a
+    product search, shared by search_products and count_products.
+    """
+    params = []  # List to hold parameters for the SQL query.
+    has_query = bool(query)
+    if has_query:  # If a search query is provided.
+        params.extend(
+            [f"%{query}%", f"%{query}%"]
+        )  # Add wildcard % for partial matching.
+    has_category = bool(
+        category_filter and category_filter != "Toutes les catégories"
+    )  # If a category filter is active.
+    if has_category:
+        params.append(category_filter)
+    has_min_qty = min_qty is not None
+    if has_min_qty:
+        params.append(min_qty)
+    has_max_qty = max_qty is not None
+    if has_max_qty:
+        params.append(max_qty)
+    return has_query, has_category, has_min_qty, has_max_qty, params
+
+
 @handle_db_error
-def search_products(query="", category_filter=None):
+def search_products(
+    query="", category_filter=None, limit=None, offset=0, min_qty=None, max_qty=None
+):
     """
     Searches for products by name or description (case-insensitive).
-    Can also filter by a specific category.
+    Can also filter by a specific category, and by stock quantity: only products
+    with min_qty <= quantity_in_stock <= max_qty (either bound may be None).
+    If 'limit' is given, returns at most 'limit' products starting at 'offset'
+    (used to load long product lists page by page).
     Returns a list of matching product records.
     """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        sql = "SELECT id, name, description, category, purchase_price, selling_price, quantity_in_stock FROM Products WHERE 1=1"
-        params = []  # List to hold parameters for the SQL query.
-
-        if query:  # If a search query is provided.
-            sql += (
-                " AND (LOWER(name) LIKE LOWER(?) OR LOWER(description) LIKE LOWER(?))"
-            )
-            params.extend(
-                [f"%{query}%", f"%{query}%"]
-            )  # Add wildcard % for partial matching.
-
-        if (
-            category_filter and category_filter != "Toutes les catégories"
-        ):  # If a category filter is active.
-            sql += " AND category = ?"
-            params.append(category_filter)
-
-        sql += " ORDER BY name COLLATE NOCASE"  # Always order results.
-        cursor.execute(sql, params)
+        has_query, has_category, has_min_qty, has_max_qty, params = (
+            _product_search_params(query, category_filter, min_qty, max_qty)
+        )
+        paged = limit is not None
+        if paged:
+            params.extend([limit, offset])
+        cursor.execute(
+            _product_search_sql(
+                "select", has_query, has_category, paged, has_min_qty, has_max_qty
+            ),
+            params,
+        )
         products = cursor.fetchall()
         logger.debug(
             f"Search for '{query}' in category '{category_filter}' found {len(products)} products."
@@ -502,38 +649,59 @@ def search_products(query="", category_filter=None):
 
 
 @handle_db_error
-def get_all_categories():
+def count_products(query="", category_filter=None, min_qty=None, max_qty=None):
     """
-    Retrieves a list of unique product categories from the Products table.
-    Returns a list of category names.
+    Returns the number of products matching the same criteria as search_products.
     """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        # Select distinct, non-null, non-empty categories.
+        has_query, has_category, has_min_qty, has_max_qty, params = (
+            _product_search_params(query, category_filter, min_qty, max_qty)
+        )
         cursor.execute(
-            "SELECT DISTINCT category FROM Products WHERE category IS NOT NULL AND category != '' ORDER BY category COLLATE NOCASE"
+            _product_search_sql(
+                "count", has_query, has_category, False, has_min_qty, has_max_qty
+            ),
+            params,
         )
-        categories = [
-            row["category"] for row in cursor.fetchall()
-        ]  # Extract category names from rows.
-        logger.debug(f"Retrieved {len(categories)} unique categories.")
-        return categories
+        return cursor.fetchone()[0]
     finally:
         conn.close()
 
 
+@handle_db_error
+def get_all_categories():
+    """
+    Retrieves a list of unique product categories from the Products table.
+    The result is cached until the Products table changes.
+    Returns a list of category names.
+    """
+    # Select distinct, non-null, non-empty categories.
+    rows = _cached_query(
+        "Products",
+        "SELECT DISTINCT category FROM Products WHERE category IS NOT NULL AND category != '' ORDER BY category COLLATE NOCASE",
+    )
+    categories = [row["category"] for row in rows]  # Extract category names from rows.
+    logger.debug(f"Retrieved {len(categories)} unique categories.")
+    return categories
+
+
 # --- Purchase Management ---
 
 
-@handle_db_error
-def add_purchase(
+# SQL of a purchase insertion, shared by add_purchase and add_purchases_bulk
+# (the same statement text lets sqlite3 reuse its prepared statement).
+_INSERT_PURCHASE_SQL = """INSERT INTO Purchases (product_id, quantity, purchase_date, cost_per_unit, supplier)
+               VALUES (?, ?, ?, ?, ?)"""
+
+
+def _prepare_purchase(
     product_id, quantity, cost_per_unit, supplier=None, purchase_date_str=None
 ):
     """
-    Records a new product purchase.
-    Stock quantity is updated automatically by the 'increase_stock_on_purchase' trigger.
-    Returns the ID of the new purchase record.
+    Validates a purchase and returns the parameters of _INSERT_PURCHASE_SQL.
+    Shared by add_purchase and add_purchases_bulk.
     """
     validate_required(product_id, "Product ID for purchase")
     quantity = validate_numeric(
@@ -546,19 +714,33 @@ def add_purchase(
     ):  # If no date string is provided, use current date/time.
         purchase_date_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     # TODO: Add validation for purchase_date_str format if it's user-provided.
+    return (product_id, quantity, purchase_date_str, cost_per_unit, supplier)
+
+
+@handle_db_error
+def add_purchase(
+    product_id, quantity, cost_per_unit, supplier=None, purchase_date_str=None
+):
+    """
+    Records a new product purchase.
+    Stock quantity is updated automatically by the 'increase_stock_on_purchase' trigger.
+    Returns the ID of the new purchase record.
+    """
+    params = _prepare_purchase(
+        product_id, quantity, cost_per_unit, supplier, purchase_date_str
+    )
 
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            """INSERT INTO Purchases (product_id, quantity, purchase_date, cost_per_unit, supplier)
-               VALUES (?, ?, ?, ?, ?)""",
-            (product_id, quantity, purchase_date_str, cost_per_unit, supplier),
-        )
+        # The insertion and the stock update done by the trigger are part of
+        # the same transaction, committed once.
+        cursor.execute(_INSERT_PURCHASE_SQL, params)
         conn.commit()
+        _invalidate_cache("Products")  # Stock changed (triggers).
         purchase_id = cursor.lastrowid
         logger.info(
-            f"Purchase ID {purchase_id} recorded for product ID {product_id}, quantity {quantity}."
+            f"Purchase ID {purchase_id} recorded for product ID {product_id}, quantity {params[1]}."
         )
         return purchase_id
     finally:
@@ -566,29 +748,74 @@ def add_purchase(
 
 
 @handle_db_error
-def get_purchase_history(limit=100):
+def add_purchases_bulk(purchases):
+    """
+    Records several purchases in a single transaction (one commit for all of them).
+    'purchases' is a list of dicts with the same keys as the add_purchase() arguments:
+    'product_id', 'quantity', 'cost_per_unit' (required), 'supplier' and
+    'purchase_date_str' (optional).
+    Stock quantities are updated by the 'increase_stock_on_purchase' trigger, once per purchase.
+    If any purchase fails, none of them is recorded.
+    Returns the number of purchases recorded.
+    """
+    rows = [
+        _prepare_purchase(
+            purchase["product_id"],
+            purchase["quantity"],
+            purchase["cost_per_unit"],
+            purchase.get("supplier"),
+            purchase.get("purchase_date_str"),
+        )
+        for purchase in purchases
+    ]
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        conn.execute("BEGIN TRANSACTION;")  # One transaction for all the purchases.
+        cursor.executemany(_INSERT_PURCHASE_SQL, rows)
+        conn.commit()  # Single commit (and disk sync) for the whole batch.
+        _invalidate_cache("Products")  # Stock changed (triggers).
+        logger.info(f"{len(rows)} purchase(s) recorded in a single transaction.")
+        return len(rows)
+    except Exception as e:  # Catch any exception during the transaction.
+        conn.rollback()  # Rollback all changes if an error occurs.
+        logger.error(
+            f"Error during bulk purchase transaction: {e}. Transaction rolled back."
+        )
+        if isinstance(e, (ValidationError, DatabaseError)):
+            raise
+        raise DatabaseError(f"Bulk purchase recording failed: {e}")
+    finally:
+        conn.close()
+
+
+@handle_db_error
+def get_purchase_history(limit=100, offset=0):
     """
     Retrieves recent purchase history, joining with product names for display.
-    Limited by 'limit' parameter (default 100).
+    Limited by 'limit' parameter (default 100), starting after the 'offset' most
+    recent purchases (used to load the history page by page).
     Returns a list of purchase history records.
     """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
         # SQL query to join Purchases with Products to get product names.
+        # p.id breaks ties between purchases with the same date, so pages do not overlap.
         cursor.execute(
             """
             SELECT p.id, p.purchase_date, pr.name AS product_name, p.quantity, p.cost_per_unit, p.supplier
             FROM Purchases p
             JOIN Products pr ON p.product_id = pr.id
-            ORDER BY p.purchase_date DESC
-            LIMIT ?
+            ORDER BY p.purchase_date DESC, p.id DESC
+            LIMIT ? OFFSET ?
             """,
-            (limit,),  # Parameter for LIMIT clause.
+            (limit, offset),  # Parameters for LIMIT and OFFSET clauses.
         )
         purchases = cursor.fetchall()
         logger.debug(
-            f"Retrieved {len(purchases)} purchase history records (limit {limit})."
+            f"Retrieved {len(purchases)} purchase history records (limit {limit}, offset {offset})."
         )
         return purchases
     finally:
@@ -598,13 +825,19 @@ def get_purchase_history(limit=100):
 # --- Sale Management ---
 
 
-@handle_db_error
-def add_sale(sale_items, customer_id=None, sale_date_str=None):
+# SQL of a sale and of its items' insertion, used by _insert_sale for add_sale and
+# bulk_add_sales (the same statement text lets sqlite3 reuse its prepared statement).
+_INSERT_SALE_SQL = (
+    "INSERT INTO Sales (customer_id, sale_date, total_amount) VALUES (?, ?, ?)"
+)
+_INSERT_SALE_ITEM_SQL = """INSERT INTO SaleItems (sale_id, product_id, quantity, price_at_sale)
+           VALUES (?, ?, ?, ?)"""
+
+
+def _prepare_sale(sale_items, sale_date_str=None):
     """
-    Records a new sale and its associated items.
-    This function uses a transaction to ensure all or no changes are made (atomicity).
-    Stock quantity is updated automatically by the 'decrease_stock_on_sale' trigger.
-    Returns the ID of the new sale.
+    Validates the items of a sale before it is recorded.
+    Returns a (sale_date_str, total_amount) tuple, with the date defaulting to now.
     """
     if not sale_items:  # A sale must have at least one item.
         logger.error("add_sale called with no items.")
@@ -628,36 +861,56 @@ def add_sale(sale_items, customer_id=None, sale_date_str=None):
     validate_numeric(
         total_amount, "Total sale amount", min_value=0  # Validate the calculated total.
     )
+    return sale_date_str, total_amount
+
+
+def _insert_sale(cursor, sale_items, customer_id, sale_date_str, total_amount):
+    """
+    Inserts one sale and its items using an open cursor, without committing.
+    The caller owns the transaction (see add_sale and bulk_add_sales).
+    Returns the ID of the new sale.
+    """
+    # 1. Insert into Sales table.
+    cursor.execute(_INSERT_SALE_SQL, (customer_id, sale_date_str, total_amount))
+    sale_id = cursor.lastrowid  # Get the ID of the new sale.
+    if not sale_id:
+        raise DatabaseError("Failed to get sale_id after Sales insert.")
+
+    # 2. Insert all the items into SaleItems table with one prepared statement.
+    # Stock is decremented per inserted row by the 'decrease_stock_on_sale' trigger;
+    # the CHECK constraint on Products.quantity_in_stock prevents it from going negative.
+    cursor.executemany(
+        _INSERT_SALE_ITEM_SQL,
+        [
+            (sale_id, item["product_id"], item["quantity"], item["price_at_sale"])
+            for item in sale_items
+        ],
+    )
+    return sale_id
+
+
+@handle_db_error
+def add_sale(sale_items, customer_id=None, sale_date_str=None):
+    """
+    Records a new sale and its associated items.
+    This function uses a transaction to ensure all or no changes are made (atomicity).
+    Stock quantity is updated automatically by the 'decrease_stock_on_sale' trigger.
+    Returns the ID of the new sale.
+    """
+    sale_date_str, total_amount = _prepare_sale(sale_items, sale_date_str)
 
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        conn.execute("BEGIN TRANSACTION;")  # Start a database transaction.
-
-        # 1. Insert into Sales table.
-        cursor.execute(
-            "INSERT INTO Sales (customer_id, sale_date, total_amount) VALUES (?, ?, ?)",
-            (customer_id, sale_date_str, total_amount),
-        )
-        sale_id = cursor.lastrowid  # Get the ID of the new sale.
-        if not sale_id:
-            raise DatabaseError("Failed to get sale_id after Sales insert.")
-
-        # 2. Insert each item into SaleItems table.
-        for item in sale_items:
-            # Optional: Check stock availability here before inserting,
-            # though the trigger handles decrement and CHECK constraint on Products.quantity_in_stock
-            # should prevent it from going negative if properly defined (or UI should prevent this state).
-            # product_stock_info = get_product_by_id(item["product_id"])
-            # if product_stock_info and item["quantity"] > product_stock_info["quantity_in_stock"]:
-            #    raise ValidationError(f"Not enough stock for product ID {item['product_id']}. Available: {product_stock_info['quantity_in_stock']}, Requested: {item['quantity']}")
-
-            cursor.execute(
-                """INSERT INTO SaleItems (sale_id, product_id, quantity, price_at_sale)
-                   VALUES (?, ?, ?, ?)""",
-                (sale_id, item["product_id"], item["quantity"], item["price_at_sale"]),
-            )
+        # Start a database transaction, taking the write lock right away: a sale is
+        # always a write, so it never has to upgrade a read lock (and wait on busy)
+        # while a purchase is recorded from another thread.
+        conn.execute("BEGIN IMMEDIATE;")
+        sale_id = _insert_sale(
+            cursor, sale_items, customer_id, sale_date_str, total_amount
+        )
         conn.commit()  # Commit the transaction if all operations are successful.
+        _invalidate_cache("Products")  # Stock changed (triggers).
         logger.info(
             f"Sale ID {sale_id} recorded successfully with {len(sale_items)} item(s). Total: {total_amount}"
         )
@@ -676,28 +929,74 @@ def add_sale(sale_items, customer_id=None, sale_date_str=None):
 
 
 @handle_db_error
-def get_sales_history(limit=100):
+def bulk_add_sales(sales):
+    """
+    Records several sales in a single transaction (one commit for all of them).
+    'sales' is a list of dicts with the same keys as the add_sale() arguments:
+    'sale_items' (required), 'customer_id' and 'sale_date_str' (optional).
+    If any sale fails, none of them is recorded.
+    Returns the list of new sale IDs, in the same order as 'sales'.
+    """
+    prepared = [
+        _prepare_sale(sale["sale_items"], sale.get("sale_date_str")) for sale in sales
+    ]
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        conn.execute("BEGIN IMMEDIATE;")  # One write transaction for all the sales.
+        sale_ids = [
+            _insert_sale(
+                cursor,
+                sale["sale_items"],
+                sale.get("customer_id"),
+                sale_date_str,
+                total_amount,
+            )
+            for sale, (sale_date_str, total_amount) in zip(sales, prepared)
+        ]
+        conn.commit()  # Single commit (and disk sync) for the whole batch.
+        _invalidate_cache("Products")  # Stock changed (triggers).
+        logger.info(f"{len(sale_ids)} sale(s) recorded in a single transaction.")
+        return sale_ids
+    except Exception as e:  # Catch any exception during the transaction.
+        conn.rollback()  # Rollback all changes if an error occurs.
+        logger.error(f"Error during bulk sale transaction: {e}. Transaction rolled back.")
+        if isinstance(e, (ValidationError, DatabaseError)):
+            raise
+        raise DatabaseError(f"Bulk sale recording failed: {e}")
+    finally:
+        conn.close()
+
+
+@handle_db_error
+def get_sales_history(limit=100, offset=0):
     """
     Retrieves recent sales history, joining with customer names for display.
-    Limited by 'limit' parameter.
+    Limited by 'limit' parameter, starting after the 'offset' most recent sales
+    (used to load the history page by page).
     Returns a list of sale history records.
     """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
         # LEFT JOIN with Customers to include sales even if customer_id is NULL (anonymous sale).
+        # s.id breaks ties between sales with the same date, so pages do not overlap
+        # (idx_sales_sale_date already ends with the rowid, so both keys use the index).
         cursor.execute(
             """
             SELECT s.id, s.sale_date, c.name AS customer_name, s.total_amount
             FROM Sales s
             LEFT JOIN Customers c ON s.customer_id = c.id
-            ORDER BY s.sale_date DESC
-            LIMIT ?
+            ORDER BY s.sale_date DESC, s.id DESC
+            LIMIT ? OFFSET ?
             """,
-            (limit,),
+            (limit, offset),
         )
         sales = cursor.fetchall()
-        logger.debug(f"Retrieved {len(sales)} sales history records (limit {limit}).")
+        logger.debug(
+            f"Retrieved {len(sales)} sales history records (limit {limit}, offset {offset})."
+        )
         return sales
     finally:
         conn.close()
@@ -731,6 +1030,40 @@ def get_sale_items(sale_id):
         conn.close()
 
 
+@handle_db_error
+def get_sale_receipt(sale_id):
+    """
+    Retrieves everything needed to print the receipt of a sale in one query:
+    one row per sale item, each carrying the sale header (date, total) and the
+    customer's name, address and phone (NULL for anonymous sales).
+    Returns an empty list if the sale does not exist or has no items.
+    """
+    validate_required(sale_id, "Sale ID")
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT s.sale_date, s.total_amount,
+                   c.name AS customer_name, c.address AS customer_address,
+                   c.phone AS customer_phone,
+                   p.name AS product_name, si.quantity, si.price_at_sale
+            FROM Sales s
+            LEFT JOIN Customers c ON c.id = s.customer_id
+            JOIN SaleItems si ON si.sale_id = s.id
+            JOIN Products p ON p.id = si.product_id
+            WHERE s.id = ?
+            ORDER BY p.name COLLATE NOCASE
+            """,
+            (sale_id,),
+        )
+        rows = cursor.fetchall()
+        logger.debug(f"Retrieved {len(rows)} receipt rows for sale ID {sale_id}.")
+        return rows
+    finally:
+        conn.close()
+
+
 @handle_db_error
 def get_sales_by_customer(customer_id):
     """
@@ -757,20 +1090,83 @@ def get_sales_by_customer(customer_id):
         conn.close()
 
 
+@handle_db_error
+def has_any_sale():
+    """
+    Returns True if at least one sale has been recorded.
+    Stops at the first row found instead of reading or aggregating the Sales table.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM Sales LIMIT 1")
+        return cursor.fetchone() is not None
+    finally:
+        conn.close()
+
+
 # --- Dashboard Analytics ---
 # These functions provide data for the dashboard view.
 
 
+# Above this many months, the trend is reduced with the M4 algorithm before being
+# returned, so the chart never receives more points than it can actually draw.
+M4_THRESHOLD_MONTHS = 24
+# Number of M4 bins; each bin yields at most 4 points (first, min, max, last).
+M4_NUM_BINS = 24
+
+
 @handle_db_error
 def get_monthly_sales_trend(num_months=12):
     """
     Retrieves total sales amount grouped by month for the last 'num_months'.
     Used for generating sales trend charts on the dashboard.
     Returns a list of (sale_month, monthly_total) tuples.
+    For long periods (more than M4_THRESHOLD_MONTHS), only the first, last, minimum
+    and maximum month of each bin are kept (M4 aggregation, done in SQL).
     """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
+        # Window functions (ntile, ROW_NUMBER) require SQLite 3.25+.
+        if num_months > M4_THRESHOLD_MONTHS and sqlite3.sqlite_version_info >= (3, 25, 0):
+            # M4: split the monthly series into M4_NUM_BINS bins and keep, for each bin,
+            # the rows that are first, last, minimum or maximum. The selected points keep
+            # their real month, so the curve shape is preserved with far fewer points.
+            query = """
+                WITH monthly AS (
+                    SELECT
+                        strftime('%Y-%m', sale_date) AS sale_month,
+                        SUM(total_amount) AS monthly_total
+                    FROM Sales
+                    WHERE date(sale_date) >= date('now', '-' || CAST(? AS TEXT) || ' months')
+                    GROUP BY sale_month
+                ),
+                binned AS (
+                    SELECT sale_month, monthly_total,
+                           ntile(?) OVER (ORDER BY sale_month) AS bin
+                    FROM monthly
+                ),
+                ranked AS (
+                    SELECT sale_month, monthly_total,
+                           ROW_NUMBER() OVER (PARTITION BY bin ORDER BY sale_month ASC) AS rn_first,
+                           ROW_NUMBER() OVER (PARTITION BY bin ORDER BY sale_month DESC) AS rn_last,
+                           ROW_NUMBER() OVER (PARTITION BY bin ORDER BY monthly_total ASC, sale_month) AS rn_min,
+                           ROW_NUMBER() OVER (PARTITION BY bin ORDER BY monthly_total DESC, sale_month) AS rn_max
+                    FROM binned
+                )
+                SELECT sale_month, monthly_total
+                FROM ranked
+                WHERE 1 IN (rn_first, rn_last, rn_min, rn_max)
+                ORDER BY sale_month ASC;
+            """
+            cursor.execute(query, (num_months, M4_NUM_BINS))
+            trend_data = cursor.fetchall()
+            logger.debug(
+                f"Fetched M4-reduced sales trend for last {num_months} months: {len(trend_data)} data points."
+            )
+            return [(row["sale_month"], row["monthly_total"]) for row in trend_data]
+
         # SQL query to group sales by month and sum total_amount.
         # strftime('%Y-%m', sale_date) extracts year and month.
         # date('now', '-X months') calculates a date X months ago.
@@ -934,6 +1330,7 @@ def dangerously_delete_all_data():
             )
 
         initialize_database()  # This will recreate the DB file and all tables/triggers
+        _invalidate_cache("Products", "Customers")
         logger.info("Database has been re-initialized after deleting all data.")
 
         # Option 2: Drop tables individually (more complex if FKs are strict and not CASCADE)
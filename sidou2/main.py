@@ -2,6 +2,7 @@
 # Standard library imports for system-specific parameters and operating system functionalities.
 import sys  # Provides access to system-specific parameters and functions, like command-line arguments. Essential for GUI applications.
 import os  # Provides a way of using operating system dependent functionality like reading or writing to the file system. Used here for path manipulations (e.g., icon paths, database path).
+import functools  # partial binds the page to refresh to the deferred call of _refresh_page_data.
 import logging  # Import logging to enable logging functionality throughout the application.
 
 # PyQt6 imports for building the graphical user interface.
@@ -29,13 +30,13 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import (
     Qt,  # Contains various flags and enumerations (e.g., alignment flags, mouse buttons).
     QSize,  # Represents the size of a 2D object using integer point precision. Used here for icon sizes.
+    QTimer,  # Used to defer the loading of a page's data until the page is painted.
 )
 
 # QtGui imports for GUI-related classes that are not widgets.
 from PyQt6.QtGui import (
-    QIcon,
     QFont,
-)  # QIcon for handling icons, QFont for managing font properties.
+)  # QFont for managing font properties.
 
 # --- Local Module Imports ---
 # These imports bring in custom-coded parts of the application.
@@ -53,6 +54,7 @@ from theme import (
     COLORS,  # Dictionary defining the color palette of the application.
     FONTS,  # Dictionary defining font families, sizes, and weights.
     ICON_DIR,  # Directory path where icon files are stored.
+    get_icon,  # Returns a (cached) QIcon from the icon directory.
     apply_global_style,  # Function to apply a global stylesheet to the application.
     SPACING,  # Import spacing
     RADIUS,  # Import radius
@@ -144,15 +146,15 @@ class SettingsView(BaseView):
         self.delete_all_data_button.setStyleSheet(delete_button_style)
 
         # Add an icon to the delete button
-        warning_icon_path = os.path.join(
-            ICON_DIR, "alert-triangle-svgrepo-com.svg"
+        warning_icon = get_icon(
+            "alert-triangle-svgrepo-com.svg"
         )  # Assuming you have a warning icon
-        if os.path.exists(warning_icon_path):
-            self.delete_all_data_button.setIcon(QIcon(warning_icon_path))
+        if warning_icon:
+            self.delete_all_data_button.setIcon(warning_icon)
             self.delete_all_data_button.setIconSize(QSize(20, 20))
         else:
             logger.warning(
-                f"Warning icon not found for delete button: {warning_icon_path}"
+                f"Warning icon not found for delete button: {os.path.join(ICON_DIR, 'alert-triangle-svgrepo-com.svg')}"
             )
 
         self.delete_all_data_button.clicked.connect(self.handle_delete_all_data)
@@ -404,14 +406,15 @@ class MainWindow(
         item.setSizeHint(QSize(0, int(FONTS.get("sidebar_item_height", 55))))
 
         if icon_name:  # If an icon file name is provided:
-            icon_path = os.path.join(
-                ICON_DIR, icon_name
-            )  # Construct the full, absolute path to the icon file.
-            if os.path.exists(
-                icon_path
-            ):  # Check if the icon file actually exists at the path.
-                item.setIcon(QIcon(icon_path))  # Set the icon for the list item.
+            icon = get_icon(
+                icon_name
+            )  # Cached icon, or None if the file does not exist in ICON_DIR.
+            if icon:
+                item.setIcon(icon)  # Set the icon for the list item.
             else:
+                icon_path = os.path.join(
+                    ICON_DIR, icon_name
+                )  # Full, absolute path to the missing icon file.
                 # Print a warning if the icon file is not found. This helps in debugging missing assets.
                 print(f"Sidebar icon not found: {icon_path}")
                 logger.warning(f"Sidebar icon not found: {icon_path}")
@@ -427,13 +430,22 @@ class MainWindow(
         self, index
     ):  # Method called when the selected item in the navigation list changes.
         # `index` is the row number of the selected item in QListWidget, which corresponds to the index in QStackedWidget.
+        current_widget = self.stacked_widget.widget(
+            index
+        )  # Get a reference to the page that becomes visible.
+        # The page's data is (re)loaded right after this call, once the page is painted.
+        # The timer is started before the page is shown, so this refresh runs before the
+        # first-show load scheduled by BaseView.showEvent (which then finds the view's
+        # data already loaded and skips it): the first show queries the database once.
+        QTimer.singleShot(
+            0, functools.partial(self._refresh_page_data, current_widget)
+        )
         self.stacked_widget.setCurrentIndex(
             index
         )  # Change the visible page in the QStackedWidget.
-        current_widget = self.stacked_widget.widget(
-            index
-        )  # Get a reference to the currently visible widget (the page).
 
+    def _refresh_page_data(self, current_widget):
+        """Loads or refreshes the data of the page selected by change_page."""
         # --- Data Loading/Refreshing Logic for Different Views ---
         # When a page becomes active, it's often necessary to load or refresh its data.
         # This section checks if the current_widget has specific data loading methods and calls them.
@@ -515,27 +527,39 @@ class MainWindow(
         ):
             self.dashboard_view.load_data()
 
-        # Refresh Product View:
+        # Refresh Product View (unless the change comes from it: ProductView has already
+        # updated the changed row and its categories):
+        from_product_view = self.sender() is self.product_view
         # - Product list itself might have changed (e.g., stock count if displayed, or if product details were edited).
-        if hasattr(self.product_view, "load_products") and callable(
-            getattr(self.product_view, "load_products")
+        if (
+            not from_product_view
+            and hasattr(self.product_view, "load_products")
+            and callable(getattr(self.product_view, "load_products"))
         ):
             self.product_view.load_products()
         # - Categories might change if a product update involved a new category.
-        if hasattr(self.product_view, "load_categories") and callable(
-            getattr(self.product_view, "load_categories")
+        if (
+            not from_product_view
+            and hasattr(self.product_view, "load_categories")
+            and callable(getattr(self.product_view, "load_categories"))
         ):
             self.product_view.load_categories()
 
-        # Refresh Purchase View:
+        # Refresh Purchase View (unless the change is a purchase: PurchaseView has already
+        # updated its product's stock and its history for the purchase it recorded):
+        from_purchase_view = self.sender() is self.purchase_view
         # - The list of products available for purchase (in a combobox) needs to be up-to-date.
-        if hasattr(self.purchase_view, "load_products_for_combo") and callable(
-            getattr(self.purchase_view, "load_products_for_combo")
+        if (
+            not from_purchase_view
+            and hasattr(self.purchase_view, "load_products_for_combo")
+            and callable(getattr(self.purchase_view, "load_products_for_combo"))
         ):
             self.purchase_view.load_products_for_combo()
         # - Purchase history itself should be current.
-        if hasattr(self.purchase_view, "load_purchase_history") and callable(
-            getattr(self.purchase_view, "load_purchase_history")
+        if (
+            not from_purchase_view
+            and hasattr(self.purchase_view, "load_purchase_history")
+            and callable(getattr(self.purchase_view, "load_purchase_history"))
         ):
             self.purchase_view.load_purchase_history()
 
@@ -550,7 +574,10 @@ class MainWindow(
         ):
             self.stock_view.load_categories_filter()
 
-        # Refresh Sale View:
+        # Refresh Sale View (unless the change is a sale: SaleView has already
+        # updated its product list and history for the sale it recorded):
+        if self.sender() is self.sale_view:
+            return
         # - The list of products available for sale (in a combobox) needs up-to-date stock and product info.
         if hasattr(self.sale_view, "load_products_for_sale") and callable(
             getattr(self.sale_view, "load_products_for_sale")
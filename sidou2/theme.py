@@ -19,6 +19,20 @@ from PyQt6.QtGui import (
 # This robust approach ensures icons are found regardless of where the main application script is executed from.
 ICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
 
+# Cache of the icons already loaded, keyed by icon file name (see get_icon).
+_icon_cache = {}
+
+
+def get_icon(icon_name):
+    """
+    Returns the QIcon of a file in ICON_DIR, or None if the file does not exist.
+    The file is looked up and loaded only once; later calls return the cached QIcon.
+    """
+    if icon_name not in _icon_cache:
+        icon_path = os.path.join(ICON_DIR, icon_name)
+        _icon_cache[icon_name] = QIcon(icon_path) if os.path.exists(icon_path) else None
+    return _icon_cache[icon_name]
+
 # --- Color Palette (COLORS) ---
 # A dictionary defining various colors used throughout the application.
 # Colors are specified in hexadecimal string format (e.g., "#RRGGBB").
@@ -159,6 +173,9 @@ SPACING = {
     "4xl": "40px",
     "5xl": "48px",
 }
+# The same spacing values as integers (pixels), parsed once here for the Qt layout
+# methods (setSpacing, setContentsMargins) that need numbers instead of 'px' strings.
+SPACING_PX = {key: int(value.replace("px", "")) for key, value in SPACING.items()}
 
 # --- Border Radius (RADIUS) ---
 # Defines common border radius values for rounded corners on UI elements.
@@ -446,9 +463,9 @@ STYLES = {
             image: url('{os.path.join(ICON_DIR, "chevron-down-svgrepo-com.svg").replace(os.sep, '/')}'); /* Down arrow icon. */
         }}
     """,
-    # --- Table Styles (QTableWidget) ---
+    # --- Table Styles (QTableView, also matches QTableWidget) ---
     "table": f"""
-        QTableWidget {{
+        QTableView {{
             border: 1px solid {COLORS['border']}; /* Border around the table. */
             border-radius: {RADIUS['lg']}; /* Rounded corners for the table container. */
             background-color: {COLORS['surface']}; /* Background of the table. */
@@ -457,18 +474,18 @@ STYLES = {
             selection-background-color: {COLORS['primary_bg']}; /* Background of selected cells/rows. */
             font-size: {FONTS['body']}pt; /* Font size for cell content. */
         }}
-        QTableWidget::item {{
+        QTableView::item {{
             padding: {SPACING['md']}; /* Padding within each cell. */
             border-bottom: 1px solid {COLORS['divider']}; /* Horizontal grid line below item. */
             border-right: 1px solid {COLORS['divider']}; /* Vertical grid line to the right of item. */
             /* Note: QTableWidget's gridline-color often handles this better globally.
                Individual item borders might be redundant or conflict. */
         }}
-        QTableWidget::item:selected {{
+        QTableView::item:selected {{
             background-color: {COLORS['primary']}; /* Selected item background. */
             color: {COLORS['white']}; /* Selected item text color. */
         }}
-        QTableWidget::item:hover {{
+        QTableView::item:hover {{
             background-color: {COLORS['hover']}; /* Hover effect for items. */
         }}
 
@@ -921,7 +938,7 @@ def apply_global_style(app):  # Function to apply styles to the QApplication ins
         + STYLES[
             "input"
         ]  # General style for all input fields (QLineEdit, QComboBox, etc.).
-        + STYLES["table"]  # General style for tables (QTableWidget).
+        + STYLES["table"]  # General style for tables (QTableView and QTableWidget).
         + STYLES["label"]  # General style for labels (QLabel).
         + STYLES["scrollbar"]  # Style for scrollbars.
         + STYLES["tooltip"]  # Style for tooltips.
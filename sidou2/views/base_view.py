@@ -1,4 +1,5 @@
 # Updated content for sidou2/views/base_view.py
+from collections import OrderedDict  # Ordered dict backing the LRUCache of search results
 # Import necessary Qt modules for creating graphical user interfaces
 from PyQt6.QtWidgets import (
     QWidget,  # Base class for all user interface objects
@@ -8,6 +9,7 @@ from PyQt6.QtWidgets import (
     QPushButton,  # Command button
     QTableWidget,  # Table display
     QTableWidgetItem,  # Item for use in QTableWidget
+    QTableView,  # Table display backed by a model (no per-cell item objects)
     QMessageBox,  # Dialog for showing messages
     QHeaderView,  # Header for tables and trees
     QAbstractItemView,  # Abstract model for item views
@@ -18,10 +20,91 @@ from PyQt6.QtWidgets import (
     QDoubleSpinBox,  # Double precision spin box
     QTextEdit,  # Multi-line text input
 )
-from PyQt6.QtCore import Qt, pyqtSignal  # Core Qt functionalities, including signals
+from PyQt6.QtCore import (
+    Qt,
+    pyqtSignal,
+    QObject,  # Base class of the worker's signal holder
+    QRunnable,  # Task run by a QThreadPool thread
+    QThreadPool,  # Runs the workers off the GUI thread
+    QTimer,  # Schedules the first-show data load after the first paint
+)  # Core Qt functionalities, including signals
 
 # Import theme settings (colors, fonts, spacing, radius) from a local 'theme.py' file
-from theme import COLORS, FONTS, SPACING, RADIUS, STYLES  # Added STYLES
+from theme import COLORS, FONTS, SPACING, SPACING_PX, RADIUS, STYLES  # Added STYLES
+
+# Maximum number of search results kept by the views' LRUCache.
+SEARCH_CACHE_SIZE = 32
+
+
+class LRUCache:
+    """
+    Small least-recently-used cache of search results, keyed on the query, so going
+    back to a previous search or filter does not query the database again.
+    Once 'size' entries are cached, the least recently used one is dropped.
+    """
+
+    def __init__(self, size=SEARCH_CACHE_SIZE):
+        self._size = size
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Returns the cached value for 'key' (now the most recently used), or None."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)  # Mark as most recently used
+        return value
+
+    def put(self, key, value):
+        """Caches 'value' under 'key', dropping the least recently used entry if full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._size:
+            self._entries.popitem(last=False)  # Drop the least recently used entry
+
+    def get_or_fetch(self, key, fetch):
+        """Returns the cached value for 'key', or calls fetch() and caches its result."""
+        value = self.get(key)
+        if value is None:
+            value = fetch()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drops every cached entry (the cached results are outdated)."""
+        self._entries.clear()
+
+
+class WorkerSignals(QObject):
+    """
+    Signals of a Worker (a QRunnable cannot define signals itself).
+    done(result, error_message): error_message is empty if the call succeeded;
+    result is None if it failed.
+    """
+
+    done = pyqtSignal(object, str)
+
+
+class Worker(QRunnable):
+    """
+    Runs fn(*args) in a QThreadPool thread, so a database query or write (or a file
+    export) does not freeze the interface. fn must not use any widget; each database
+    call opens its own connection, so the database functions are safe there.
+    The result is sent back to the GUI thread through signals.done.
+    """
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.signals = WorkerSignals()
+        self._fn = fn
+        self._args = args
+
+    def run(self):
+        try:
+            result = self._fn(*self._args)
+        except Exception as e:  # Reported by the view in the GUI thread.
+            self.signals.done.emit(None, str(e) or type(e).__name__)
+        else:
+            self.signals.done.emit(result, "")
 
 
 class BaseView(QWidget):  # Define a class named BaseView that inherits from QWidget
@@ -36,6 +119,10 @@ class BaseView(QWidget):  # Define a class named BaseView that inherits from QWi
     # Other parts of the application can connect to this signal.
     data_updated = pyqtSignal()
 
+    # True once the view's data has been loaded. Set by the views' load methods, so a
+    # load already done (e.g. by MainWindow.change_page) skips the first-show load.
+    _loaded = False
+
     def __init__(self, title=""):  # Constructor for the BaseView class
         """
         Initializes the BaseView.
@@ -51,6 +138,39 @@ class BaseView(QWidget):  # Define a class named BaseView that inherits from QWi
         # This ensures that all views inheriting from BaseView will have a consistent background style.
         self.setStyleSheet(STYLES.get("main_window", ""))
 
+    def run_in_background(self, on_done, fn, *args):
+        """
+        Runs fn(*args) on a Worker; on_done(result, error_message) is then called
+        in the GUI thread. Returns the worker's signal holder, which the caller
+        must keep (e.g. in an attribute) until the result arrives.
+        """
+        worker = Worker(fn, *args)
+        worker.signals.done.connect(on_done)
+        QThreadPool.globalInstance().start(worker)
+        return worker.signals
+
+    def showEvent(self, event):
+        """
+        Called by Qt when the view is shown. Until the view's data is loaded,
+        schedules _initial_load right after this event, so the view is painted
+        without waiting for the database queries.
+        """
+        super().showEvent(event)
+        if not self._loaded:
+            QTimer.singleShot(0, self._first_show_load)
+
+    def _first_show_load(self):
+        """Runs _initial_load, unless the data was loaded meanwhile."""
+        if not self._loaded:
+            self._initial_load()
+
+    def _initial_load(self):
+        """
+        Loads the view's data when it is first shown. Views loading their data
+        on show override it (their load methods then set self._loaded).
+        """
+        self._loaded = True  # Nothing to load.
+
     def create_title(self, title=None):
         """
         Creates and adds a standardized title label to the main layout.
@@ -123,6 +243,44 @@ class BaseView(QWidget):  # Define a class named BaseView that inherits from QWi
             columns
         )  # Set the labels for the horizontal header
 
+        self._configure_table(
+            table, hide_vertical_header, selection_behavior, selection_mode
+        )
+        return table  # Return the created table
+
+    def create_table_view(
+        self,
+        model,
+        hide_vertical_header=True,
+        selection_behavior="rows",
+        selection_mode="single",
+    ):
+        """
+        Creates and returns a QTableView displaying the given model, with the same
+        look and behavior as the tables built by create_table().
+        Unlike QTableWidget, a QTableView does not create one item object per cell:
+        it asks the model for the visible cells only, which scales to large tables.
+
+        Args:
+            model (QAbstractItemModel): The model providing the rows and the header labels.
+            hide_vertical_header, selection_behavior, selection_mode: See create_table().
+        Returns:
+            QTableView: The configured table view.
+        """
+        table = QTableView()  # Create a QTableView instance
+        table.setModel(model)  # Columns and header labels come from the model
+        self._configure_table(
+            table, hide_vertical_header, selection_behavior, selection_mode
+        )
+        return table  # Return the created table view
+
+    def _configure_table(
+        self, table, hide_vertical_header, selection_behavior, selection_mode
+    ):
+        """
+        Applies the common style, selection and header settings to a table.
+        Shared by create_table() (QTableWidget) and create_table_view() (QTableView).
+        """
         # Apply table style from theme.py. This ensures all tables have a consistent look.
         table.setStyleSheet(STYLES.get("table", ""))
 
@@ -153,8 +311,6 @@ class BaseView(QWidget):  # Define a class named BaseView that inherits from QWi
         )
         table.horizontalHeader().setStretchLastSection(True)
 
-        return table  # Return the created table
-
     def create_button_layout(self):
         """
         Creates and returns a QHBoxLayout, typically used for arranging buttons.
@@ -164,8 +320,8 @@ class BaseView(QWidget):  # Define a class named BaseView that inherits from QWi
             QHBoxLayout: An empty horizontal box layout, styled with spacing from the theme.
         """
         button_layout = QHBoxLayout()  # Create a horizontal box layout
-        # Add spacing from theme.py, converting the string 'px' value to an integer.
-        button_layout.setSpacing(int(SPACING.get("md", "12px").replace("px", "")))
+        # Add spacing from theme.py (SPACING_PX holds the values as integers).
+        button_layout.setSpacing(SPACING_PX["md"])
         return button_layout  # Return the layout
 
     def create_button(
@@ -330,17 +486,13 @@ class BaseView(QWidget):  # Define a class named BaseView that inherits from QWi
             tuple: (QLineEdit, QComboBox or None) - The search input and category combo box (if created).
         """
         search_filter_layout = QHBoxLayout()  # Create a horizontal layout
-        search_filter_layout.setSpacing(
-            int(SPACING.get("md", "12px").replace("px", ""))
-        )
+        search_filter_layout.setSpacing(SPACING_PX["md"])
         # Define content margins for the search/filter layout itself
         search_filter_layout.setContentsMargins(
             0,  # left
-            int(SPACING.get("sm", "8px").replace("px", "")),  # top
+            SPACING_PX["sm"],  # top
             0,  # right
-            int(
-                SPACING.get("lg", "16px").replace("px", "")
-            ),  # bottom (more space before the main content like a table)
+            SPACING_PX["lg"],  # bottom (more space before the main content like a table)
         )
 
         search_label = QLabel("Rechercher:")  # Label for the search input
@@ -409,15 +561,13 @@ class BaseView(QWidget):  # Define a class named BaseView that inherits from QWi
         form_layout = QGridLayout(
             form_widget
         )  # Create a QGridLayout and set it on the form_widget
-        form_layout.setSpacing(
-            int(SPACING["md"].replace("px", ""))
-        )  # Spacing between cells in the grid
+        form_layout.setSpacing(SPACING_PX["md"])  # Spacing between cells in the grid
         # Content margins define the padding inside the form_widget, around the grid layout.
         form_layout.setContentsMargins(
-            int(SPACING["lg"].replace("px", "")),  # Left margin
-            int(SPACING["lg"].replace("px", "")),  # Top margin
-            int(SPACING["lg"].replace("px", "")),  # Right margin
-            int(SPACING["lg"].replace("px", "")),  # Bottom margin
+            SPACING_PX["lg"],  # Left margin
+            SPACING_PX["lg"],  # Top margin
+            SPACING_PX["lg"],  # Right margin
+            SPACING_PX["lg"],  # Bottom margin
         )
         return form_widget, form_layout
 
@@ -502,6 +652,8 @@ class BaseView(QWidget):  # Define a class named BaseView that inherits from QWi
         input_style = STYLES.get(
             "input", ""
         )  # Get the general 'input' style from the theme
+        # Whether the style already sets a minimum height (checked once, not per widget)
+        style_has_min_height = "min-height" in input_style
         for widget in widgets:
             if widget:  # Check if widget is not None
                 widget.setStyleSheet(input_style)
@@ -509,13 +661,13 @@ class BaseView(QWidget):  # Define a class named BaseView that inherits from QWi
                 # defined in the stylesheet for 'input'. This improves usability.
                 if isinstance(widget, (QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox)):
                     # Check if 'min-height' is already part of the applied style string
-                    if "min-height" not in input_style:
+                    if not style_has_min_height:
                         widget.setMinimumHeight(
                             35
                         )  # Default minimum height for single-line inputs
                 elif isinstance(widget, QTextEdit):
                     # QTextEdit (multi-line) might need a larger default minimum height
-                    if "min-height" not in input_style:
+                    if not style_has_min_height:
                         widget.setMinimumHeight(70)
 
     def apply_label_styles(self, labels, style_key="label"):
@@ -2,6 +2,9 @@
 import os  # Standard library for interacting with the operating system, e.g., for path manipulation.
 import sys  # Standard library for system-specific parameters and functions, e.g., for running the app.
 import datetime  # Standard library for working with dates and times.
+import contextlib  # Standard library helpers for 'with' statements (context managers).
+import functools  # Standard library helpers for functions, used here for lru_cache.
+import importlib.util  # Standard library helper to check if a module is installed without importing it.
 from PyQt6.QtWidgets import (  # Import necessary UI components from PyQt6.
     QApplication,  # Manages the application's control flow and main settings.
     QWidget,  # Base class for all UI objects.
@@ -12,6 +15,7 @@ from PyQt6.QtWidgets import (  # Import necessary UI components from PyQt6.
     QHBoxLayout,  # Arranges widgets horizontally.
     QGraphicsDropShadowEffect,  # Provides a drop shadow effect for widgets.
     QSizePolicy,  # Describes how a widget should resize.
+    QGraphicsItem,  # Base class of chart items; used for its cache mode setting.
 )
 from PyQt6.QtCore import Qt, pyqtProperty  # Import core Qt functionalities.
 from PyQt6.QtGui import (  # Import classes for graphical elements.
@@ -19,8 +23,11 @@ from PyQt6.QtGui import (  # Import classes for graphical elements.
     QColor,  # For specifying colors.
     QPalette,  # Manages the color scheme of widgets.
     QLinearGradient,  # For creating linear gradient brushes.
-    QGradient,  # Base class for gradient brushes.
     QBrush,  # For filling shapes with patterns or colors.
+    QPen,  # For drawing lines and text outlines.
+    QPixmap,  # Off-screen image, used for the pre-rendered bar gradients.
+    QPainter,  # Draws into the bar gradient pixmaps.
+    QTransform,  # Scales the bar gradient textures to the bar heights.
 )
 
 # Ensure all necessary theme components are imported. These are custom modules for styling.
@@ -34,22 +41,61 @@ from theme import (
     RADIUS,  # Dictionary for border-radius values.
 )
 
-try:
-    # Attempt to import pyqtgraph for plotting charts.
-    import pyqtgraph as pg
-    from pyqtgraph import (
-        DateAxisItem,
-        BarGraphItem,
-    )  # Specific items for date-based axes and bar graphs.
-
-    PYQTGRAPH_AVAILABLE = (
-        True  # Flag to indicate if pyqtgraph is successfully imported.
-    )
-except ImportError:
-    PYQTGRAPH_AVAILABLE = False  # Flag if pyqtgraph is not found.
+# pyqtgraph (and numpy, which it depends on) are heavy to import. Only check here that
+# the library is installed; the actual import happens in _load_pyqtgraph() when the first
+# DashboardView is created. That first call pays the one-time import cost (typically a
+# few hundred milliseconds); later calls return immediately.
+PYQTGRAPH_AVAILABLE = (
+    importlib.util.find_spec("pyqtgraph") is not None
+)  # Flag to indicate if pyqtgraph can be used.
+if not PYQTGRAPH_AVAILABLE:
     print(
         "Warning: pyqtgraph not found. Graphs will not be displayed on the dashboard."
     )
+pg = None  # pyqtgraph module, set by _load_pyqtgraph().
+np = None  # numpy module, set by _load_pyqtgraph().
+
+
+# Imports pyqtgraph and numpy on first use and applies the global pyqtgraph options.
+# Sets the module-level 'pg' and 'np' names. Returns False if the import fails.
+def _load_pyqtgraph():
+    global pg, np, PYQTGRAPH_AVAILABLE
+    if pg is not None:
+        return True  # Already imported.
+    try:
+        import pyqtgraph
+        import numpy  # Installed with pyqtgraph; used to prepare chart data arrays.
+    except ImportError:
+        PYQTGRAPH_AVAILABLE = False  # Installed but not importable (broken install).
+        print(
+            "Warning: pyqtgraph could not be imported. Graphs will not be displayed on the dashboard."
+        )
+        return False
+    pg, np = pyqtgraph, numpy
+
+    # Global pyqtgraph options for background and foreground colors, matching the theme.
+    # These are process-wide settings, so they are applied only once.
+    pg.setConfigOption(
+        "background",
+        QColor(theme_COLORS.get("background_medium", "#334155")),  # Plot background.
+    )
+    pg.setConfigOption(
+        "foreground",
+        QColor(theme_COLORS.get("text_light_hex", "#f8fafc")),  # Axes and labels.
+    )
+
+    # Render the plots through OpenGL when PyOpenGL is installed: line and symbol
+    # rasterization is then done by the GPU instead of QPainter on the CPU.
+    # If rendering problems appear on a given machine, set "useOpenGL" back to False here.
+    try:
+        import OpenGL  # noqa: F401  (only checks that PyOpenGL is available)
+
+        pg.setConfigOption("useOpenGL", True)
+        pg.setConfigOption("enableExperimental", True)
+    except ImportError:
+        pass  # No PyOpenGL: keep the default software rendering.
+    return True
+
 
 # Import database interaction functions.
 from database.database import (
@@ -59,11 +105,47 @@ from database.database import (
 )
 
 
+# Converts a 'YYYY-MM' month string (as returned by get_monthly_sales_trend) into the
+# Unix timestamp of the first day of that month, for the DateAxisItem.
+# The same few months come back on every refresh, so the parsed results are cached.
+@functools.lru_cache(maxsize=256)
+def _month_to_timestamp(month_str):
+    return datetime.datetime.strptime(month_str + "-01", "%Y-%m-%d").timestamp()
+
+
+# Theme values used by the charts, looked up once at import time since the theme does
+# not change while the application runs.
+_TEXT_LIGHT_HEX = theme_COLORS.get("text_light_hex", "#FFFFFF")
+_TEXT_LIGHT_QCOLOR = QColor(_TEXT_LIGHT_HEX)
+_TEXT_DISABLED = theme_COLORS.get("text_disabled", "gray")
+_FONT_FAMILY = theme_FONTS.get("font_family", "Arial")
+_FONT_XS = int(theme_FONTS.get("xs", 9))
+
+# Maximum length of a product name under the top products chart, and the character
+# appended when a name is cut.
+MAX_BAR_LABEL_LENGTH = 15
+ELLIPSIS = "…"
+# Height in pixels of the pre-rendered bar gradient textures.
+BAR_TEXTURE_HEIGHT = 64
+
+# Summary cards shown at the top of the dashboard, one tuple per card:
+# (title, key in DASHBOARD_COLORS / self._cards, initial value, fallback color, grid row, grid column).
+# "DA" refers to the Algerian Dinar, the local currency.
+SUMMARY_CARDS = (
+    ("Clients Actifs", "clients", "0", "#3498DB", 0, 0),
+    ("Produits Référencés", "products", "0", "#2ECC71", 0, 1),
+    ("Ventes (Mois Actuel)", "sales", "0.00 DA", "#E74C3C", 1, 0),
+    ("Stock Faible (<5)", "low_stock", "0", "#F39C12", 1, 1),
+)
+
+
 class DashboardView(
     QWidget
 ):  # Main class for the dashboard view, inheriting from QWidget.
     def __init__(self):  # Constructor for the DashboardView.
         super().__init__()  # Call the constructor of the parent class (QWidget).
+        if PYQTGRAPH_AVAILABLE:
+            _load_pyqtgraph()  # Import pyqtgraph/numpy now that the charts are needed.
 
         # Set the background and text colors for the dashboard using the application's palette.
         palette = self.palette()
@@ -84,6 +166,34 @@ class DashboardView(
         )  # Ensure the background is filled automatically.
         self.setPalette(palette)  # Apply the configured palette.
 
+        # Last KPI values written to the cards (clients, products, sales, low stock).
+        # Used by load_data() to skip setText() when a value has not changed.
+        self._last_kpis = (None, None, None, None)
+
+        # Pre-rendered gradient textures for the bar chart, keyed by chart color (hex string).
+        # The palette is small and fixed, so each texture is rendered only once.
+        self._bar_pixmap_cache = {}
+        # Theme colors, pens and fonts used by the charts. They never change during a
+        # session, so they are built once here instead of on every chart refresh.
+        self._text_color = _TEXT_LIGHT_QCOLOR
+        self._text_pen = QPen(self._text_color)  # Axis tick labels, shared by both charts.
+        self._message_color = QColor(_TEXT_DISABLED)
+        self._error_color = QColor(theme_COLORS.get("error", "red"))
+        self._tick_font = QFont(
+            _FONT_FAMILY, _FONT_XS
+        )  # Smaller font for X-axis tick labels.
+        # Color of the sales trend line and symbols, from theme.CHART_COLORS or theme.COLORS.
+        line_color = QColor(
+            CHART_COLORS[0] if CHART_COLORS else theme_COLORS.get("primary", "#3498DB")
+        )
+        self._line_pen = (
+            pg.mkPen(color=line_color, width=2) if PYQTGRAPH_AVAILABLE else None
+        )
+        self._symbol_brush = QBrush(line_color)
+        # Set once the axes of each chart have been styled (labels, tick pens, fonts).
+        self._sales_axes_styled = False
+        self._bar_axes_styled = False
+
         self.init_ui()  # Initialize the user interface elements.
         self.load_data()  # Load the data to be displayed on the dashboard.
 
@@ -106,7 +216,7 @@ class DashboardView(
         # Create and style the main title label for the dashboard.
         title_label = QLabel("Tableau de Bord")
         title_font = QFont(
-            theme_FONTS.get("font_family", "Arial"),
+            _FONT_FAMILY,
             int(theme_FONTS.get("display", 24)),  # Font family and size from theme.
         )
         title_font.setBold(True)  # Make title bold.
@@ -124,34 +234,29 @@ class DashboardView(
         )  # Spacing for the grid.
         main_layout.addLayout(summary_grid)  # Add grid to the main layout.
 
-        # Create summary cards for key metrics using a helper function.
-        # Each card displays a title, a value (initially "0" or "0.00 DA"), and has a specific background color.
-        self.total_clients_card = self._create_summary_card(
-            "Clients Actifs",  # Title of the card
-            "0",  # Initial value displayed
-            DASHBOARD_COLORS.get(
-                "clients", "#3498DB"
-            ),  # Background color for this specific card, defined in theme.DASHBOARD_COLORS
-        )
-        self.total_products_card = self._create_summary_card(
-            "Produits Référencés", "0", DASHBOARD_COLORS.get("products", "#2ECC71")
-        )
-        self.total_sales_card = self._create_summary_card(
-            "Ventes (Mois Actuel)",
-            "0.00 DA",  # "DA" likely refers to Algerian Dinar, the local currency.
-            DASHBOARD_COLORS.get("sales", "#E74C3C"),
+        # Create the summary cards (KPIs) from the SUMMARY_CARDS table in a single pass.
+        # The title and value fonts are built once here and shared by every card.
+        title_font = QFont(
+            _FONT_FAMILY,
+            int(theme_FONTS.get("card_title_size", 11)),  # Font size for card titles.
         )
-        self.low_stock_card = self._create_summary_card(
-            "Stock Faible (<5)",  # Indicates products with stock quantity less than 5.
-            "0",
-            DASHBOARD_COLORS.get("low_stock", "#F39C12"),
+        value_font = QFont(
+            _FONT_FAMILY,
+            int(theme_FONTS.get("card_value_size", 20)),  # Larger font size for values.
         )
+        value_font.setBold(True)  # Make the value text bold.
 
-        # Add summary cards to the grid layout at specified positions (row, column).
-        summary_grid.addWidget(self.total_clients_card, 0, 0)  # Row 0, Column 0.
-        summary_grid.addWidget(self.total_products_card, 0, 1)  # Row 0, Column 1.
-        summary_grid.addWidget(self.total_sales_card, 1, 0)  # Row 1, Column 0.
-        summary_grid.addWidget(self.low_stock_card, 1, 1)  # Row 1, Column 1.
+        self._cards = {}  # Maps a card key ("clients", "sales", ...) to its QFrame.
+        for title, key, initial_value, fallback_color, row, col in SUMMARY_CARDS:
+            card = self._create_summary_card(
+                title,
+                initial_value,
+                DASHBOARD_COLORS.get(key, fallback_color),  # Card color from theme.
+                title_font,
+                value_font,
+            )
+            self._cards[key] = card
+            summary_grid.addWidget(card, row, col)  # Place the card in the 2x2 grid.
 
         # Check if the pyqtgraph library is available for displaying charts.
         if PYQTGRAPH_AVAILABLE:
@@ -181,6 +286,9 @@ class DashboardView(
             charts_layout.addWidget(
                 self.top_products_plot_widget  # Add the top products chart frame to the charts layout.
             )
+
+            # Create the persistent curve/bar items that load_data() will update in place.
+            self._init_chart_items()
         else:
             # If pyqtgraph is not available, display a warning message to the user.
             no_graph_label = QLabel(
@@ -205,7 +313,10 @@ class DashboardView(
     #   title_text (str): The title to display on the card (e.g., "Clients Actifs").
     #   value_text (str): The initial value to display (e.g., "0"). This will be updated by load_data().
     #   bg_color_hex (str): The background color for the card in hexadecimal format.
-    def _create_summary_card(self, title_text, value_text, bg_color_hex):
+    #   title_font / value_font (QFont): Shared fonts for the title and value labels.
+    def _create_summary_card(
+        self, title_text, value_text, bg_color_hex, title_font, value_font
+    ):
         card = QFrame()  # Create a QFrame, which will serve as the card container.
         card.setObjectName(
             "summaryCard"  # Set an object name for specific styling via QSS (Qt Style Sheets).
@@ -260,12 +371,6 @@ class DashboardView(
 
         # Create and style the title label for the card.
         title_label = QLabel(title_text)
-        title_font = QFont(
-            theme_FONTS.get("font_family", "Arial"),  # Font family from theme.FONTS.
-            int(
-                theme_FONTS.get("card_title_size", 11)
-            ),  # Font size for card titles from theme.FONTS.
-        )
         title_label.setFont(title_font)
         title_label.setAlignment(
             Qt.AlignmentFlag.AlignLeft
@@ -277,13 +382,6 @@ class DashboardView(
 
         # Create and style the value label for the card.
         value_label = QLabel(str(value_text))  # Display the metric's value.
-        value_font = QFont(
-            theme_FONTS.get("font_family", "Arial"),
-            int(
-                theme_FONTS.get("card_value_size", 20)
-            ),  # Larger font size for the value from theme.FONTS.
-        )
-        value_font.setBold(True)  # Make the value text bold.
         value_label.setFont(value_font)
         value_label.setAlignment(
             Qt.AlignmentFlag.AlignLeft
@@ -350,7 +448,7 @@ class DashboardView(
         # Create and style the title label for the chart.
         title_label = QLabel(title_text)
         title_font = QFont(
-            theme_FONTS.get("font_family", "Arial"),
+            _FONT_FAMILY,
             int(
                 theme_FONTS.get("chart_widget_title_size", 12)
             ),  # Font size for chart titles from theme.FONTS.
@@ -367,20 +465,6 @@ class DashboardView(
 
         # If the pyqtgraph library is available, create and configure the plot widget.
         if PYQTGRAPH_AVAILABLE:
-            # Configure global pyqtgraph options for background and foreground colors to match the theme.
-            pg.setConfigOption(
-                "background",
-                QColor(
-                    theme_COLORS.get("background_medium", "#334155")
-                ),  # Set pyqtgraph background.
-            )
-            pg.setConfigOption(
-                "foreground",
-                QColor(
-                    theme_COLORS.get("text_light_hex", "#f8fafc")
-                ),  # Set pyqtgraph foreground (axes, labels).
-            )
-
             plot_widget = pg.PlotWidget()  # Create the pyqtgraph plot widget.
             plot_widget.getPlotItem().getViewBox().setBackgroundColor(
                 None  # Make the plot area background transparent to see the frame's background color.
@@ -497,12 +581,28 @@ class DashboardView(
             # --- Update UI Elements with Fetched Data ---
 
             # Update the text of the value labels in the summary cards.
-            self.total_clients_card.value_label.setText(str(total_clients))
-            self.total_products_card.value_label.setText(str(total_products))
-            self.total_sales_card.value_label.setText(
-                f"{total_sales_current_month:.2f} DA"  # Format sales as currency with 2 decimal places.
+            # QLabel.setText() triggers a relayout and repaint even for identical text,
+            # so only the cards whose value actually changed are updated.
+            new_kpis = (
+                total_clients,
+                total_products,
+                total_sales_current_month,
+                low_stock_count,
             )
-            self.low_stock_card.value_label.setText(str(low_stock_count))
+            for key, old_value, new_value, text in zip(
+                ("clients", "products", "sales", "low_stock"),
+                self._last_kpis,
+                new_kpis,
+                (
+                    str(total_clients),
+                    str(total_products),
+                    f"{total_sales_current_month:.2f} DA",  # Sales as currency with 2 decimals.
+                    str(low_stock_count),
+                ),
+            ):
+                if new_value != old_value:
+                    self._cards[key].value_label.setText(text)
+            self._last_kpis = new_kpis
 
             # If pyqtgraph is available, plot the fetched data on the charts.
             if PYQTGRAPH_AVAILABLE:
@@ -516,10 +616,97 @@ class DashboardView(
         except Exception as e:  # Catch any errors that occur during UI updates.
             print(f"Dashboard: Error updating UI: {e}")  # Print the error message.
 
+    # Helper method creating the plot items that are kept for the whole life of the dashboard.
+    # The charts are refreshed by updating these items in place (setData/setOpts) rather than
+    # clearing the PlotItem and re-adding new items on every load_data() call.
+    def _init_chart_items(self):
+        # --- Sales trend chart ---
+        sales_plot_item = self.sales_trend_plot_widget.plot_widget.getPlotItem()
+        # Use DateAxisItem for the bottom (X) axis to display dates correctly.
+        sales_plot_item.setAxisItems({"bottom": pg.DateAxisItem(orientation="bottom")})
+        # Let pyqtgraph reduce the curve to what the plot width can show ('peak' keeps the
+        # min/max of each pixel column) and skip points outside the visible range.
+        # Long periods are already M4-reduced by get_monthly_sales_trend().
+        sales_plot_item.setDownsampling(ds=True, auto=True, mode="peak")
+        sales_plot_item.setClipToView(True)
+
+        # The sales curve, created empty and filled by _plot_sales_trend().
+        self._sales_curve = sales_plot_item.plot(
+            [],  # X-values (time).
+            [],  # Y-values (sales amounts).
+            pen=self._line_pen,  # Line style (color and width).
+            symbol="o",  # Use circle ('o') symbols for data points.
+            symbolBrush=self._symbol_brush,  # Fill color for the symbols.
+            # No outline: with one uniform brush and no pen, every symbol is identical and
+            # pyqtgraph draws them all from a single cached pixmap (its fast path).
+            symbolPen=None,
+            symbolSize=6,  # Size of the symbols.
+            antialias=True,  # Enable antialiasing for smoother lines and symbols.
+        )
+        # Cache the rendered line and symbols as a device pixmap: repaints that do not
+        # change the data (hover, sibling widgets, window exposure) become a simple blit.
+        # The cache is invalidated by setData() whenever new data is plotted.
+        self._sales_curve.curve.setCacheMode(
+            QGraphicsItem.CacheMode.DeviceCoordinateCache
+        )
+        self._sales_curve.scatter.setCacheMode(
+            QGraphicsItem.CacheMode.DeviceCoordinateCache
+        )
+        # Message shown on the chart when there is nothing to plot (hidden otherwise).
+        self._sales_message = pg.TextItem("")
+        self._sales_message.setVisible(False)
+        sales_plot_item.addItem(self._sales_message)
+
+        # --- Top products chart ---
+        bar_plot_item = self.top_products_plot_widget.plot_widget.getPlotItem()
+        # One BarGraphItem per palette color, created on demand by _plot_top_products().
+        self._bar_items = []
+        self._bar_message = pg.TextItem("")
+        self._bar_message.setVisible(False)
+        bar_plot_item.addItem(self._bar_message)
+
+    # Context manager used while a chart is being updated.
+    # Every setXRange/setYRange/setTicks call normally makes the ViewBox emit range and
+    # transform signals, each one causing the axes to recompute and repaint. Signals are
+    # blocked for the duration of the update and the final state is notified once on exit.
+    # sigRangeChanged (which items connect to their viewRangeChanged) is not replayed:
+    # set the ranges before the data, so clipToView/downsampling use the final view range.
+    # Parameters:
+    #   vb (pg.ViewBox): The ViewBox of the chart being updated.
+    @contextlib.contextmanager
+    def _deferred_viewbox(self, vb):
+        vb.blockSignals(True)
+        try:
+            yield vb
+        finally:
+            vb.blockSignals(False)
+            # Replay the signals the axes listen to, with the final ranges.
+            x_range, y_range = vb.viewRange()
+            vb.sigXRangeChanged.emit(vb, tuple(x_range))
+            vb.sigYRangeChanged.emit(vb, tuple(y_range))
+            vb.sigTransformChanged.emit(vb)
+            vb.sigStateChanged.emit(vb)
+            vb.update()
+
+    # Helper method showing (or hiding, when text is None) the message item of a chart.
+    # Parameters:
+    #   message_item (pg.TextItem): The chart's message item.
+    #   text (str or None): The message to display, or None to hide it.
+    #   color (QColor or None): Text color; defaults to the theme's disabled text color.
+    def _set_chart_message(self, message_item, text, color=None):
+        if text is None:
+            message_item.setVisible(False)
+            return
+        message_item.setText(text, color=color or self._message_color)
+        message_item.setPos(0, 1)  # Top-left corner of the default (0..1) range.
+        message_item.setVisible(True)
+
     # Helper method to plot the sales trend data on its chart.
     # Parameters:
     #   data (list of tuples): A list where each tuple is (month_string, total_sales_amount).
     #                          Example: [('2023-01', 1500.00), ('2023-02', 2200.50), ...]
+    #                          For long periods the list is already M4-reduced by the database
+    #                          (first/min/max/last month of each bin, in chronological order).
     def _plot_sales_trend(self, data):
         # Check if plotting is possible (pyqtgraph available and plot widget exists).
         if (
@@ -537,121 +724,121 @@ class DashboardView(
         plot_item = (
             plot_widget.getPlotItem()
         )  # Get the PlotItem from the PlotWidget. This is where data is plotted.
-        plot_item.clear()  # Clear any existing plots from the PlotItem to prepare for new data.
-
-        # Disable auto-ranging for axes to set ranges manually, ensuring 0 is the minimum.
-        plot_item.enableAutoRange(
-            axis="x", enable=False
-        )  # Disable auto-ranging for X-axis.
-        plot_item.enableAutoRange(
-            axis="y", enable=False
-        )  # Disable auto-ranging for Y-axis.
-
-        # If no data is available, display a message on the chart and set default axis ranges.
-        if not data:
-            plot_item.setXRange(0, 1, padding=0)  # Set X-axis range from 0 to 1.
-            plot_item.setYRange(0, 1, padding=0)  # Set Y-axis range from 0 to 1.
-            # Add a text item to the plot indicating no data.
-            plot_item.addItem(
-                pg.TextItem(
-                    "Aucune donnée de vente disponible.",  # Message to display.
-                    color=QColor(
-                        theme_COLORS.get("text_disabled", "gray")
-                    ),  # Text color from theme.
-                )
-            )
-            return  # Exit the function as there's no data to plot.
 
-        try:
-            # Convert month strings from data to numerical timestamps for plotting on a time-series axis.
-            # Timestamps are generally seconds since the epoch.
-            timestamps = [
-                datetime.datetime.strptime(
-                    d[0] + "-01",
-                    "%Y-%m-%d",  # Assumes 'YYYY-MM' format from DB, appends '-01' for day to create a full date.
-                ).timestamp()  # Convert datetime object to a Unix timestamp.
-                for d in data
-            ]
-            # Ensure all sales values are non-negative. Clamp any negative values to 0.
-            values = [max(0, d[1]) for d in data]
-        except (
-            ValueError
-        ) as e:  # Catch errors if date parsing fails (e.g., unexpected date format).
-            print(
-                f"Dashboard: Error parsing date for sales trend: {e}"
-            )  # Log the error.
-            # Display an error message on the chart.
-            plot_item.setXRange(0, 1, padding=0)
-            plot_item.setYRange(0, 1, padding=0)
-            plot_item.addItem(
-                pg.TextItem(
-                    "Erreur format date.",
-                    color=QColor(
-                        theme_COLORS.get("error", "red")
-                    ),  # Error text color from theme.
+        # Signals of the ViewBox are held back while the ranges and axes are updated,
+        # then replayed once (see _deferred_viewbox).
+        with self._deferred_viewbox(plot_item.getViewBox()) as vb:
+            # Disable auto-ranging for both axes to set ranges manually, ensuring 0 is the minimum.
+            vb.disableAutoRange()
+
+            # If no data is available, display a message on the chart and set default axis ranges.
+            if not data:
+                self._sales_curve.setData([], [])  # Remove any previously plotted data.
+                plot_item.setXRange(0, 1, padding=0)  # Set X-axis range from 0 to 1.
+                plot_item.setYRange(0, 1, padding=0)  # Set Y-axis range from 0 to 1.
+                self._set_chart_message(
+                    self._sales_message, "Aucune donnée de vente disponible."
                 )
-            )
-            return  # Exit due to parsing error.
-
-        # Use DateAxisItem for the bottom (X) axis to display dates correctly.
-        axis = DateAxisItem(orientation="bottom")
-        plot_item.setAxisItems(
-            {"bottom": axis}
-        )  # Set the custom date axis for the bottom.
-
-        # Manually set the X and Y axis ranges.
-        # X-axis (time): Ensure minimum is 0 or the earliest timestamp.
-        # Y-axis (sales amount): Ensure minimum is 0.
-        min_x = (
-            min(timestamps) if timestamps else 0
-        )  # Minimum timestamp or 0 if no timestamps.
-        max_x = (
-            max(timestamps) if timestamps else 1
-        )  # Maximum timestamp or 1 if no timestamps.
-        plot_item.setXRange(
-            max(0, min_x), max(0, max_x), padding=0.05
-        )  # Set X-range with a small padding.
-        plot_item.setYRange(
-            0, max(values) if values else 1, padding=0.1
-        )  # Set Y-range from 0 to max sales value, with padding.
-
-        # Define colors for the plot line and symbols from theme.CHART_COLORS or fallback to theme.COLORS.
-        pen_color = QColor(
-            CHART_COLORS[0] if CHART_COLORS else theme_COLORS.get("primary", "#3498DB")
-        )
-        symbol_brush_color = QColor(
-            CHART_COLORS[0] if CHART_COLORS else theme_COLORS.get("primary", "#3498DB")
-        )
-
-        # Plot the sales trend data (timestamps vs. sales values).
-        plot_item.plot(
-            timestamps,  # X-values (time).
-            values,  # Y-values (sales amounts).
-            pen=pg.mkPen(color=pen_color, width=2),  # Line style (color and width).
-            symbol="o",  # Use circle ('o') symbols for data points.
-            symbolBrush=symbol_brush_color,  # Fill color for the symbols.
-            symbolSize=6,  # Size of the symbols.
-            antialias=True,  # Enable antialiasing for smoother lines and symbols.
-        )
-        # Set labels for the axes.
-        plot_item.setLabel(
-            "left",  # Target the left Y-axis.
-            "Montant Total (DA)",  # Label text (e.g., Total Amount in Algerian Dinar).
-            color=theme_COLORS.get(
-                "text_light_hex", "#FFFFFF"
-            ),  # Label text color from theme.
-        )
-        # Set text colors for the axis tick labels.
-        plot_item.getAxis("left").setTextPen(
-            QColor(
-                theme_COLORS.get("text_light_hex", "#FFFFFF")
-            )  # Y-axis tick label color.
-        )
-        plot_item.getAxis("bottom").setTextPen(
-            QColor(
-                theme_COLORS.get("text_light_hex", "#FFFFFF")
-            )  # X-axis (date) tick label color.
-        )
+                return  # Exit the function as there's no data to plot.
+
+            try:
+                # Convert month strings from data to numerical timestamps for plotting on a time-series axis.
+                # Timestamps are generally seconds since the epoch.
+                # The monthly totals are aggregated by SQL (GROUP BY month); only the month
+                # strings are converted here, through the cached _month_to_timestamp().
+                timestamps = np.fromiter(
+                    (_month_to_timestamp(d[0]) for d in data),
+                    dtype=np.float64,
+                    count=len(data),
+                )
+                # Ensure all sales values are non-negative. Clamp any negative values to 0.
+                values = np.fromiter((d[1] for d in data), dtype=np.float64, count=len(data))
+                np.maximum(values, 0, out=values)
+            except (
+                ValueError
+            ) as e:  # Catch errors if date parsing fails (e.g., unexpected date format).
+                print(
+                    f"Dashboard: Error parsing date for sales trend: {e}"
+                )  # Log the error.
+                # Display an error message on the chart.
+                self._sales_curve.setData([], [])
+                plot_item.setXRange(0, 1, padding=0)
+                plot_item.setYRange(0, 1, padding=0)
+                self._set_chart_message(
+                    self._sales_message, "Erreur format date.", self._error_color
+                )
+                return  # Exit due to parsing error.
+
+            self._set_chart_message(self._sales_message, None)  # Hide any previous message.
+
+            # Manually set the X and Y axis ranges.
+            # X-axis (time): Ensure minimum is 0 or the earliest timestamp.
+            # Y-axis (sales amount): Ensure minimum is 0.
+            min_x = (
+                timestamps[0] if timestamps.size else 0
+            )  # Earliest timestamp (data is sorted by month) or 0 if no timestamps.
+            max_x = (
+                timestamps[-1] if timestamps.size else 1
+            )  # Latest timestamp or 1 if no timestamps.
+            plot_item.setXRange(
+                max(0, min_x), max(0, max_x), padding=0.05
+            )  # Set X-range with a small padding.
+            plot_item.setYRange(
+                0, float(values.max()) if values.size else 1.0, padding=0.1
+            )  # Set Y-range from 0 to max sales value, with padding.
+
+            # Update the existing curve in place with the new data, after the ranges so
+            # clipToView and auto-downsampling work on the final view range (the ViewBox
+            # signals are blocked here, see _deferred_viewbox). Both arrays are
+            # contiguous float64, so pyqtgraph uses them without converting or copying.
+            self._sales_curve.setData(timestamps, values)
+
+            # Axis label and tick colors never change: set them only on the first plot.
+            if not self._sales_axes_styled:
+                # Set labels for the axes.
+                plot_item.setLabel(
+                    "left",  # Target the left Y-axis.
+                    "Montant Total (DA)",  # Label text (e.g., Total Amount in Algerian Dinar).
+                    color=_TEXT_LIGHT_HEX,  # Label text color from theme.
+                )
+                # Set text colors for the axis tick labels.
+                plot_item.getAxis("left").setTextPen(self._text_pen)  # Y-axis tick label color.
+                plot_item.getAxis("bottom").setTextPen(
+                    self._text_pen
+                )  # X-axis (date) tick label color.
+                self._sales_axes_styled = True
+
+    # Helper method returning a small vertical gradient texture for the given bar color.
+    # The gradient is rendered once into a BAR_TEXTURE_HEIGHT pixels tall pixmap and cached
+    # in self._bar_pixmap_cache; painting a bar is then a pixmap copy instead of a gradient
+    # computed by Qt on every paint.
+    # Parameters:
+    #   color_hex (str): The bar color in hexadecimal format (an entry of CHART_COLORS).
+    def _get_bar_pixmap(self, color_hex):
+        pixmap = self._bar_pixmap_cache.get(color_hex)
+        if pixmap is None:
+            color = QColor(color_hex)
+            pixmap = QPixmap(1, BAR_TEXTURE_HEIGHT)
+            gradient = QLinearGradient(0, 0, 0, BAR_TEXTURE_HEIGHT)  # Vertical gradient.
+            gradient.setColorAt(0, color.lighter(130))  # Lighter shade at the base (y = 0) of the bar.
+            gradient.setColorAt(1, color.darker(110))  # Darker shade at the end (y = height) of the bar.
+            painter = QPainter(pixmap)
+            painter.fillRect(pixmap.rect(), QBrush(gradient))
+            painter.end()
+            self._bar_pixmap_cache[color_hex] = pixmap
+        return pixmap
+
+    # Helper method returning the brush for a group of bars of the given color.
+    # The cached gradient texture is stretched so that it spans from 0 to 'height'
+    # (in data units), which gives the same look as a gradient over the bar itself.
+    # Parameters:
+    #   color_hex (str): The bar color in hexadecimal format.
+    #   height (float): Height of the tallest bar of the group.
+    def _get_bar_brush(self, color_hex, height):
+        brush = QBrush(self._get_bar_pixmap(color_hex))
+        if height > 0:
+            brush.setTransform(QTransform().scale(1.0, height / BAR_TEXTURE_HEIGHT))
+        return brush
 
     # Helper method to plot the top selling products data as a bar chart.
     # Parameters:
@@ -670,115 +857,121 @@ class DashboardView(
 
         plot_widget = self.top_products_plot_widget.plot_widget  # Get the PlotWidget.
         plot_item = plot_widget.getPlotItem()  # Get the PlotItem.
-        plot_item.clear()  # Clear any previous plots.
-
-        # Disable auto-ranging for axes to set ranges manually.
-        plot_item.enableAutoRange(axis="x", enable=False)
-        plot_item.enableAutoRange(axis="y", enable=False)
-
-        # If no data, display a message and set default axis ranges.
-        if not data:
-            plot_item.setXRange(0, 1, padding=0)
-            plot_item.setYRange(0, 1, padding=0)
-            plot_item.addItem(
-                pg.TextItem(
-                    "Aucune donnée produit disponible.",
-                    color=QColor(theme_COLORS.get("text_disabled", "gray")),
+
+        # Signals of the ViewBox are held back while the ranges, ticks and styles are
+        # updated, then replayed once (see _deferred_viewbox).
+        with self._deferred_viewbox(plot_item.getViewBox()) as vb:
+            # Disable auto-ranging for both axes to set ranges manually.
+            vb.disableAutoRange()
+
+            # If no data, display a message and set default axis ranges.
+            if not data:
+                for bg_item in self._bar_items:
+                    bg_item.setVisible(False)  # Hide the bars of the previous refresh.
+                plot_item.getAxis("bottom").setTicks(None)  # Back to automatic ticks.
+                plot_item.setXRange(0, 1, padding=0)
+                plot_item.setYRange(0, 1, padding=0)
+                self._set_chart_message(
+                    self._bar_message, "Aucune donnée produit disponible."
                 )
+                return  # Exit if no data.
+
+            self._set_chart_message(self._bar_message, None)  # Hide any previous message.
+
+            # Prepare data for the bar chart.
+            # Truncate long product names for better display on the X-axis.
+            # Names longer than MAX_BAR_LABEL_LENGTH characters are cut and end with "…".
+            product_names = [
+                (name[:MAX_BAR_LABEL_LENGTH] + ELLIPSIS)
+                if len(name) > MAX_BAR_LABEL_LENGTH
+                else name
+                for name, _quantity in data
+            ]
+            # Ensure all quantities are non-negative (clamped to >= 0 in a single numpy pass).
+            quantities = np.fromiter(
+                (item[1] for item in data), dtype=np.float64, count=len(data)
             )
-            return  # Exit if no data.
-
-        # Prepare data for the bar chart.
-        # Truncate long product names for better display on the X-axis.
-        product_names = [
-            item[0][:15] + "..." if len(item[0]) > 15 else item[0]
-            for item in data  # Truncate names longer than 15 characters.
-        ]
-        # Ensure all quantities are non-negative.
-        quantities = [max(0, item[1]) for item in data]  # Clamp quantities to be >= 0.
-        x_values = list(
-            range(len(product_names))
-        )  # X-coordinates for the bars (0, 1, 2, ...).
-
-        # Create a list of brushes for the bars, using gradients and cycling through theme.CHART_COLORS.
-        bar_brushes = []
-        for i in range(len(data)):
-            color = QColor(
-                CHART_COLORS[
-                    i % len(CHART_COLORS)
-                ]  # Cycle through available chart colors.
-            )
-            gradient = QLinearGradient(0, 0, 0, 1)  # Define a vertical linear gradient.
-            gradient.setCoordinateMode(
-                QGradient.CoordinateMode.ObjectBoundingMode  # Gradient coordinates are relative to the bar's bounding box.
-            )
-            gradient.setColorAt(
-                0, color.lighter(130)
-            )  # Lighter shade at the top of the bar.
-            gradient.setColorAt(
-                1, color.darker(110)
-            )  # Darker shade at the bottom of the bar.
-            bar_brushes.append(
-                QBrush(gradient)
-            )  # Add the created gradient brush to the list.
-
-        # Create a BarGraphItem with the prepared data and brushes.
-        bg_item = BarGraphItem(
-            x=x_values,  # X-positions of the bars.
-            height=quantities,  # Heights of the bars (quantities sold).
-            width=0.6,  # Width of each bar.
-            brushes=bar_brushes,  # List of QBrush objects for each bar.
-        )
-        plot_item.addItem(bg_item)  # Add the bar graph item to the plot.
-
-        # Manually set the X and Y axis ranges.
-        min_x = -0.5  # Start X-axis slightly before the first bar for padding.
-        max_x = (
-            max(x_values) if x_values else 0
-        ) + 0.5  # End X-axis slightly after the last bar.
-        plot_item.setXRange(
-            min_x, max_x, padding=0
-        )  # Set X-range. No additional padding here as it's handled by min_x/max_x.
-        plot_item.setYRange(
-            0, max(quantities) if quantities else 1, padding=0.1
-        )  # Y-range from 0 to max quantity, with padding.
-
-        # Configure the bottom (X) axis to show product names as tick labels.
-        axis_bottom = plot_item.getAxis("bottom")
-        ticks = [
-            list(
-                zip(x_values, product_names)
-            )  # Create a list of (position, label) pairs for ticks.
-        ]
-        axis_bottom.setTicks(ticks)  # Set the custom ticks on the X-axis.
-        # Set label for the left (Y) axis.
-        plot_item.setLabel(
-            "left",  # Target the Y-axis.
-            "Quantité Vendue",  # Label text.
-            color=theme_COLORS.get("text_light_hex", "#FFFFFF"),  # Label text color.
-        )
-        # Set text colors for axis tick labels.
-        plot_item.getAxis("left").setTextPen(
-            QColor(
-                theme_COLORS.get("text_light_hex", "#FFFFFF")
-            )  # Y-axis tick label color.
-        )
-        axis_bottom.setTextPen(
-            QColor(theme_COLORS.get("text_light_hex", "#FFFFFF"))
-        )  # X-axis tick label color.
-        # Style the bottom axis ticks for better readability (e.g., offset, tick length, font).
-        axis_bottom.setStyle(
-            tickTextOffset=10,
-            tickLength=-5,  # Offset text from axis, adjust tick mark appearance.
-        )
-        axis_bottom.setTickFont(
-            QFont(
-                theme_FONTS.get("font_family", "Arial"),
-                int(
-                    theme_FONTS.get("xs", 9)
-                ),  # Smaller font for X-axis tick labels from theme.
-            )
-        )
+            np.maximum(quantities, 0, out=quantities)
+            x_values = np.arange(
+                len(product_names), dtype=np.float64
+            )  # X-coordinates for the bars (0, 1, 2, ...).
+
+            # Group the bars by palette color (bar i uses CHART_COLORS[i % len(CHART_COLORS)])
+            # and draw each group with one BarGraphItem and one shared brush. This keeps the
+            # number of brush changes while painting to the number of colors actually used,
+            # instead of one per bar.
+            # The BarGraphItems are kept across refreshes and only updated with setOpts();
+            # groups that are not needed for the current data are simply hidden.
+            num_colors = len(CHART_COLORS)
+            num_groups = min(num_colors, len(x_values))
+            while len(self._bar_items) < num_groups:
+                color_index = len(self._bar_items)
+                bg_item = pg.BarGraphItem(
+                    x=x_values[color_index::num_colors],  # X-positions of the bars using this color.
+                    height=quantities[color_index::num_colors],  # Heights (quantities sold).
+                    width=0.6,  # Width of each bar.
+                    brush=QBrush(),  # Set below, with the group's gradient texture.
+                    # No outline: the bars are plain filled rectangles, so there is no
+                    # antialiased stroke to draw around each of them.
+                    pen=pg.mkPen(None),
+                )
+                # Same pixmap caching as the sales curve; setOpts() invalidates it.
+                bg_item.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+                plot_item.addItem(bg_item)  # Add the bar graph item to the plot.
+                self._bar_items.append(bg_item)
+            for color_index, bg_item in enumerate(self._bar_items):
+                if color_index < num_groups:
+                    group_heights = quantities[color_index::num_colors]
+                    bg_item.setOpts(
+                        x=x_values[color_index::num_colors],
+                        height=group_heights,
+                        brush=self._get_bar_brush(
+                            CHART_COLORS[color_index], float(group_heights.max())
+                        ),  # Gradient texture shared by the bars of this color.
+                    )
+                    bg_item.setVisible(True)
+                else:
+                    bg_item.setVisible(False)
+
+            # Manually set the X and Y axis ranges.
+            min_x = -0.5  # Start X-axis slightly before the first bar for padding.
+            max_x = (
+                len(x_values) - 1
+            ) + 0.5  # End X-axis slightly after the last bar.
+            plot_item.setXRange(
+                min_x, max_x, padding=0
+            )  # Set X-range. No additional padding here as it's handled by min_x/max_x.
+            plot_item.setYRange(
+                0, float(quantities.max()) if quantities.size else 1.0, padding=0.1
+            )  # Y-range from 0 to max quantity, with padding.
+
+            # Configure the bottom (X) axis to show product names as tick labels.
+            axis_bottom = plot_item.getAxis("bottom")
+            ticks = [
+                tuple(
+                    enumerate(product_names)
+                )  # Major ticks as (position, label) pairs: bar i is drawn at x = i.
+            ]
+            axis_bottom.setTicks(ticks)  # Set the custom ticks on the X-axis.
+            # Axis label, tick colors, style and font never change: set them only on the
+            # first plot. The tick labels themselves (product names) are updated above.
+            if not self._bar_axes_styled:
+                # Set label for the left (Y) axis.
+                plot_item.setLabel(
+                    "left",  # Target the Y-axis.
+                    "Quantité Vendue",  # Label text.
+                    color=_TEXT_LIGHT_HEX,  # Label text color.
+                )
+                # Set text colors for axis tick labels.
+                plot_item.getAxis("left").setTextPen(self._text_pen)  # Y-axis tick label color.
+                axis_bottom.setTextPen(self._text_pen)  # X-axis tick label color.
+                # Style the bottom axis ticks for better readability (e.g., offset, tick length, font).
+                axis_bottom.setStyle(
+                    tickTextOffset=10,
+                    tickLength=-5,  # Offset text from axis, adjust tick mark appearance.
+                )
+                axis_bottom.setTickFont(self._tick_font)  # Smaller font for X-axis tick labels.
+                self._bar_axes_styled = True
 
 
 if (
@@ -808,48 +1001,41 @@ if (
             initialize_database,
             add_product,
             add_customer,
-            add_sale,
+            bulk_add_sales,
+            has_any_sale,
         )
 
         initialize_database()  # Create database tables if they don't exist.
-        # Add sample data only if no sales trend data exists (indicative of an empty or newly initialized database).
+        # Add sample data only if no sale exists yet (indicative of an empty or newly initialized database).
         # This prevents re-adding sample data every time the test is run if the DB already has data.
-        if not get_monthly_sales_trend():
+        if not has_any_sale():
             # Add a sample customer and products.
             c1 = add_customer("Test Client Dash", phone="0101010101")
             p1 = add_product("Produit Alpha", "Desc", "CatDash", 10, 20, 100)
             p2 = add_product("Produit Beta", "Desc", "CatDash", 5, 15, 50)
 
-            if (
-                p1 and p2 and c1 is not None
-            ):  # Ensure sample objects were created successfully.
-                # Add sample sales with specific dates to test the sales trend chart.
-                add_sale(  # Sale 1
+            if p1 and p2:  # Ensure sample products were created successfully.
+                # Add sample sales with specific dates to test the sales trend chart,
+                # all in one transaction. If customer creation failed (c1 is None),
+                # the sales are recorded without a customer.
+                bulk_add_sales(
                     [
-                        {"product_id": p1, "quantity": 2, "price_at_sale": 20},
-                        {"product_id": p2, "quantity": 5, "price_at_sale": 15},
-                    ],
-                    customer_id=c1,
-                    sale_date_str="2023-01-15 10:00:00",  # Older sale (example date).
-                )
-                add_sale(  # Sale 2
-                    [{"product_id": p1, "quantity": 3, "price_at_sale": 20}],
-                    customer_id=c1,
-                    sale_date_str="2023-02-10 12:00:00",  # More recent sale (example date).
-                )
-            elif (
-                p1 and p2
-            ):  # Fallback if customer creation failed, add sales without customer.
-                add_sale(
-                    [
-                        {"product_id": p1, "quantity": 2, "price_at_sale": 20},
-                        {"product_id": p2, "quantity": 5, "price_at_sale": 15},
-                    ],
-                    sale_date_str="2023-01-15 10:00:00",
-                )
-                add_sale(
-                    [{"product_id": p1, "quantity": 3, "price_at_sale": 20}],
-                    sale_date_str="2023-02-10 12:00:00",
+                        {  # Sale 1: older sale (example date).
+                            "sale_items": [
+                                {"product_id": p1, "quantity": 2, "price_at_sale": 20},
+                                {"product_id": p2, "quantity": 5, "price_at_sale": 15},
+                            ],
+                            "customer_id": c1,
+                            "sale_date_str": "2023-01-15 10:00:00",
+                        },
+                        {  # Sale 2: more recent sale (example date).
+                            "sale_items": [
+                                {"product_id": p1, "quantity": 3, "price_at_sale": 20}
+                            ],
+                            "customer_id": c1,
+                            "sale_date_str": "2023-02-10 12:00:00",
+                        },
+                    ]
                 )
 
     else:  # If the database file already exists.
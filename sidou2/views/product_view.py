@@ -1,4 +1,8 @@
 # Updated content for sidou2/views/product_view.py
+import re  # Turns a LIKE pattern into a regular expression (see _like_matches)
+from functools import partial  # Binds the column index to the column-menu slots
+from contextlib import ExitStack  # Holds several QSignalBlockers in one 'with' block
+
 # Import necessary modules from PyQt6 for creating the GUI
 from PyQt6.QtWidgets import (
     QWidget,  # Base class for all UI objects
@@ -8,8 +12,6 @@ from PyQt6.QtWidgets import (
     QLineEdit,  # Single-line text input
     QPushButton,  # Command button
     QTextEdit,  # Multi-line rich text editor
-    QTableWidget,  # Displays data in a table
-    QTableWidgetItem,  # Represents an item in a QTableWidget
     QMessageBox,  # Standard dialog box for messages
     QHeaderView,  # Provides header rows or columns for item views
     QAbstractItemView,  # Abstract base class for item views
@@ -21,6 +23,10 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import (
     Qt,
     pyqtSignal,
+    QAbstractTableModel,  # Base class for the table model feeding the product QTableView
+    QModelIndex,  # Identifies a cell (row, column) in a model
+    QTimer,  # Delays the search until the user stops typing
+    QSignalBlocker,  # Blocks a widget's signals for the duration of a 'with' block
 )  # Core Qt functionalities, including signals and alignment flags
 from PyQt6.QtGui import (
     QAction,
@@ -29,11 +35,13 @@ from PyQt6.QtGui import (
 # Import custom modules from the project
 from views.base_view import (
     BaseView,
+    LRUCache,  # Small LRU cache of search results
 )  # Base class for all views, providing common functionality
 from utils.error_handler import (
     DatabaseError,
     ValidationError,
-)  # Custom error classes for database and validation issues
+    log_error,
+)  # Custom error classes for database and validation issues, and error logging
 from theme import (
     STYLES,
     COLORS,
@@ -43,13 +51,232 @@ from theme import (
 )  # Theme settings (styles, colors, fonts, etc.)
 from database.database import (  # Functions for interacting with the database
     get_all_products,  # Retrieves all products from the database
+    get_product_by_id,  # Retrieves a single product (to refresh only its row)
     add_product,  # Adds a new product to the database
     update_product,  # Updates an existing product in the database
     delete_product,  # Deletes a product from the database
     search_products,  # Searches for products based on criteria
+    count_products,  # Counts the products matching the same criteria
     get_all_categories,  # Retrieves all unique product categories
 )
 
+# SQLite's LOWER(), LIKE and COLLATE NOCASE only fold the ASCII letters A-Z
+# ("É" stays "É"); rows patched in place use the same folding as the queries.
+_ASCII_LOWER = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"
+)
+
+
+def _ascii_lower(text):
+    """Returns text with only the ASCII letters lowercased, like SQLite's LOWER()."""
+    return text.translate(_ASCII_LOWER)
+
+
+def _like_matches(value, search_query):
+    """
+    Returns True if LOWER(value) LIKE LOWER('%search_query%') in SQLite
+    (the condition used by search_products): '%' and '_' in the query are wildcards.
+    """
+    if value is None:  # NULL LIKE ... is never true
+        return False
+    pattern = "".join(
+        ".*" if char == "%" else "." if char == "_" else re.escape(char)
+        for char in _ascii_lower(search_query)
+    )
+    return re.search(pattern, _ascii_lower(value), re.DOTALL) is not None
+
+
+class ProductTableModel(QAbstractTableModel):
+    """
+    Table model holding the products displayed in ProductView.
+    The rows are the records returned by search_products(); the view only asks for
+    the cells it actually paints, so no item object is created per cell.
+    The displayed texts are formatted once when rows are loaded and kept column by
+    column (one list of strings per column), so painting a cell is a plain lookup.
+    """
+
+    # Column header labels, in display order.
+    COLUMNS = [
+        "ID",
+        "Nom",
+        "Catégorie",
+        "Description",
+        "Prix Achat",
+        "Prix Vente",
+        "Stock",
+    ]
+    # One function per column, turning a product record into the displayed text
+    # (applied once per loaded row, not on every paint).
+    FORMATTERS = [
+        lambda p: str(p["id"]),  # Product ID
+        lambda p: p["name"],  # Name
+        lambda p: p["category"] or "",  # Category (or empty string if None)
+        lambda p: p["description"] or "",  # Description
+        lambda p: f"{p['purchase_price']:.2f} DZD",  # Purchase Price (formatted)
+        lambda p: f"{p['selling_price']:.2f} DZD",  # Selling Price (formatted)
+        lambda p: str(p["quantity_in_stock"]),  # Stock Quantity
+    ]
+
+    # Number of products loaded at once; more are fetched when the user scrolls down.
+    PAGE_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []  # Product records (sqlite3.Row), one per loaded table row
+        self._display = [
+            [] for _ in self.COLUMNS
+        ]  # Displayed texts, one list per column (same order as self._rows)
+        self._total = 0  # Number of products matching the current search
+        self._id_to_row = {}  # Product ID -> row index of the loaded products
+        self._fetch_page = None  # Function (offset, limit) -> list of product records
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        # Qt asks each painted cell for many roles (font, colors, alignment, ...);
+        # the role is checked first so all the unused ones return None right away.
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.isValid():
+                return self._display[index.column()][index.row()]
+        elif role == Qt.ItemDataRole.UserRole:
+            if index.isValid():
+                # The whole product record (raw numeric prices), for any cell of the row
+                return self._rows[index.row()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def _format_columns(self, rows):
+        """Formats the given product records, column by column (one list of strings per column)."""
+        return [[fmt(p) for p in rows] for fmt in self.FORMATTERS]
+
+    def _reindex(self, start=0):
+        """Updates self._id_to_row for the rows from 'start' to the end (rows before it are unchanged)."""
+        if start == 0:
+            self._id_to_row = {}
+        # Local names: the loop body runs once per loaded product
+        id_to_row = self._id_to_row
+        rows = self._rows
+        for row in range(start, len(rows)):
+            id_to_row[rows[row]["id"]] = row
+
+    def _replace_rows(self, rows):
+        """
+        Replaces the loaded rows by 'rows'.
+        Done as a removal of the old rows followed by an insertion of the new ones rather
+        than a model reset: a reset also resets the header, losing the hidden columns
+        and column widths, whereas the columns never change here.
+        """
+        if self._rows:
+            self.beginRemoveRows(QModelIndex(), 0, len(self._rows) - 1)
+            self._rows = []
+            self._display = [[] for _ in self.COLUMNS]
+            self._id_to_row = {}
+            self.endRemoveRows()
+        if rows:
+            self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+            self._rows = rows
+            self._display = self._format_columns(rows)
+            self._reindex()
+            self.endInsertRows()
+
+    def set_rows(self, rows):
+        """Replaces all the rows of the model."""
+        rows = list(rows)
+        self._total = len(rows)
+        self._fetch_page = None  # Everything is loaded, nothing to fetch later
+        self._replace_rows(rows)
+
+    def set_source(self, fetch_page, total):
+        """
+        Loads the first page of a new result set.
+        Args:
+            fetch_page (callable): fetch_page(offset, limit) returns the next product records.
+            total (int): Number of products in the whole result set.
+        """
+        rows = list(fetch_page(0, self.PAGE_SIZE)) if total else []
+        self._fetch_page = fetch_page
+        self._total = total
+        self._replace_rows(rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        # Called by the view when it scrolls near the last loaded row.
+        return (
+            not parent.isValid()
+            and self._fetch_page is not None
+            and len(self._rows) < self._total
+        )
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fetch_page is None:
+            return
+        try:
+            new_rows = list(self._fetch_page(len(self._rows), self.PAGE_SIZE))
+        except Exception as e:  # The table keeps the rows already loaded
+            log_error(e, "ProductTableModel.fetchMore")
+            new_rows = []
+        if not new_rows:  # Fewer products than counted (deleted meanwhile): stop fetching
+            self._total = len(self._rows)
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        self._rows.extend(new_rows)
+        for col, texts in zip(self._display, self._format_columns(new_rows)):
+            col.extend(texts)
+        self._reindex(first)
+        self.endInsertRows()
+
+    def row_data(self, row):
+        """Returns the product record displayed at the given row."""
+        return self._rows[row]
+
+    def row_of(self, product_id):
+        """Returns the row of the given product, or None if it is not loaded."""
+        return self._id_to_row.get(product_id)
+
+    def insert_product(self, product):
+        """
+        Inserts one product at its place in the name order (like ORDER BY name COLLATE NOCASE).
+        A product sorting after the last loaded page is only counted: fetchMore will load it.
+        """
+        key = _ascii_lower(product["name"])
+        row = 0
+        while row < len(self._rows) and _ascii_lower(self._rows[row]["name"]) <= key:
+            row += 1
+        self._total += 1
+        if row == len(self._rows) and len(self._rows) < self._total - 1:
+            return  # Belongs to a page that is not loaded yet
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, product)
+        for col, fmt in zip(self._display, self.FORMATTERS):
+            col.insert(row, fmt(product))
+        self._reindex(row)  # The rows after it moved down by one
+        self.endInsertRows()
+
+    def remove_product(self, product_id):
+        """Removes the row of the given product, if it is loaded."""
+        row = self.row_of(product_id)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        for col in self._display:
+            del col[row]
+        del self._id_to_row[product_id]
+        self._reindex(row)  # The rows after it moved up by one
+        self._total -= 1
+        self.endRemoveRows()
+
 
 class ProductView(BaseView):  # ProductView class, inherits from BaseView
     """
@@ -66,19 +293,33 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
     def __init__(self):
         """
         Constructor for ProductView.
-        Initializes the UI elements, loads categories for filtering,
-        and loads the initial list of products.
+        Initializes the UI elements. Categories and products are loaded
+        once the view is first shown (see showEvent).
         """
         super().__init__(
             "Gestion des Produits"
         )  # Call BaseView constructor, passing the view title
         self.current_product_id = None  # Stores the ID of the currently selected product in the table (None if no selection)
-        self.visible_columns = list(
+        self.visible_columns = set(
             range(7)
-        )  # List of column indices that are currently visible in the product table
+        )  # Set of column indices that are currently visible in the product table
         # Default: ID, Nom, Cat, Desc, PA, PV, Stock
+        # Small LRU cache of search results (product counts and pages), keyed on the query,
+        # so going back to a previous search or category does not query the database again.
+        # Only the search input and the category filter reuse it (load_products(use_cache=True));
+        # every other reload clears it, so stock changed by a sale or a purchase is shown.
+        self._search_cache = LRUCache()
+        self._columns_dirty = (
+            True  # Column visibility must be (re)applied by the next load_products
+        )
+        self._last_categories = (
+            None  # Categories currently in the filter combo box (frozenset once loaded)
+        )
 
         self.init_ui_product()  # Initialize the specific UI elements for the product view
+
+    def _initial_load(self):
+        """Loads the categories and the product list when the view is first shown."""
         self.load_categories()  # Load product categories into the filter combo box
         self.load_products()  # Load and display the list of products in the table
 
@@ -98,17 +339,23 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
                 with_category_filter=True,  # Indicates that a category filter should be included
             )
         )
-        # Connect signals from search and filter widgets to the filter_products method
+        # Debounce timer for the search input: each keystroke restarts it, so the products
+        # are only searched once the user has paused typing for 200 ms.
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(200)
+        self._search_timer.timeout.connect(self.filter_products)
+        # Connect signals from search and filter widgets
         if self.search_input:  # Check if search_input was successfully created
             self.search_input.textChanged.connect(
-                self.filter_products
-            )  # Trigger filter on text change
+                lambda _text: self._search_timer.start()
+            )  # (Re)start the debounce timer on text change
         if (
             self.category_filter_combo
         ):  # Check if category_filter_combo was successfully created
             self.category_filter_combo.currentIndexChanged.connect(
                 self.filter_products
-            )  # Trigger filter on selection change
+            )  # Trigger filter right away on selection change (one signal per user action)
 
         # Create a styled widget and layout for the product input form using a BaseView helper method
         form_widget, form_layout = self.create_form_widget()
@@ -216,45 +463,32 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
             )
 
         # --- Product Table ---
-        # Create the table to display products using a BaseView helper method
-        self.product_table = self.create_table(
-            columns=[  # Define the column headers for the table
-                "ID",
-                "Nom",
-                "Catégorie",
-                "Description",
-                "Prix Achat",
-                "Prix Vente",
-                "Stock",
-            ]
-        )
+        # Create the table to display products using a BaseView helper method.
+        # The table is a QTableView backed by ProductTableModel (column headers come from the model).
+        self.product_model = ProductTableModel(self)
+        self.product_table = self.create_table_view(self.product_model)
+        header = self.product_table.horizontalHeader()  # Used several times below
         # Configure column resizing behavior
-        self.product_table.horizontalHeader().setSectionResizeMode(
+        header.setSectionResizeMode(
             0,
             QHeaderView.ResizeMode.ResizeToContents,  # Resize 'ID' column to fit content
         )
-        self.product_table.horizontalHeader().setSectionResizeMode(
+        header.setSectionResizeMode(
             6,
             QHeaderView.ResizeMode.ResizeToContents,  # Resize 'Stock' column to fit content
         )
         # By default, hide the 'Description' column as it can be lengthy
         self.product_table.setColumnHidden(3, True)
-        if (
-            3 in self.visible_columns
-        ):  # If 'Description' (index 3) was in visible_columns, remove it
-            self.visible_columns.remove(3)
+        self.visible_columns.discard(3)  # 'Description' (index 3) is not visible
 
         # Connect signals from the table
-        self.product_table.itemSelectionChanged.connect(
+        self.product_table.selectionModel().selectionChanged.connect(
             self.on_row_selected
         )  # Trigger when table selection changes
         # Enable custom context menu for the table header (to show/hide columns)
-        self.product_table.horizontalHeader().setContextMenuPolicy(
-            Qt.ContextMenuPolicy.CustomContextMenu
-        )
-        self.product_table.horizontalHeader().customContextMenuRequested.connect(
-            self.show_column_menu
-        )
+        header.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        header.customContextMenuRequested.connect(self.show_column_menu)
+        self._build_column_menu()  # Build the header context menu once
         # Add the product table to the main view layout
         self.main_layout.addWidget(self.product_table)
         # self.setLayout(self.main_layout) # This is handled by BaseView constructor
@@ -262,12 +496,22 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
     def load_categories(self):
         """
         Loads product categories from the database and populates the category filter combo box.
+        The combo box is only rebuilt when the set of categories has changed.
         Uses a BaseView helper method for populating the combo box.
         """
         if not self.category_filter_combo:  # If the combo box doesn't exist, do nothing
             return
+        try:
+            categories = get_all_categories()
+        except Exception:  # Same fallback as populate_category_combo
+            categories = []
+        category_set = frozenset(categories)
+        if category_set == self._last_categories:
+            return  # Same categories: keep the combo box (and its selection) as is
+        self._last_categories = category_set
         # Call the BaseView helper to populate the combo box
-        self.populate_category_combo(self.category_filter_combo)
+        # (it blocks its signals and restores the previous selection if still present)
+        self.populate_category_combo(self.category_filter_combo, categories)
 
     def add_new_product(self):
         """
@@ -302,8 +546,9 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
                 name, description, category, purchase_price, selling_price
             )
             # After successful addition:
+            self._search_cache.clear()  # Cached search results are now outdated
             self.clear_form()  # Clear the input fields
-            self.load_products()  # Reload the product list in the table
+            self._refresh_product_row(product_id)  # Insert only the new row in the table
             self.load_categories()  # Reload categories (in case a new one was added)
             self.product_updated.emit()  # Emit signal that product data has changed
             self.show_info(
@@ -360,7 +605,10 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
                 selling_price,
             )
             if success:  # If update was successful
-                self.load_products()  # Reload product list
+                self._search_cache.clear()  # Cached search results are now outdated
+                self._refresh_product_row(
+                    self.current_product_id
+                )  # Refresh only the modified row
                 self.load_categories()  # Reload categories
                 self.product_updated.emit()  # Emit signal
                 self.show_info(
@@ -396,10 +644,14 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
         ):
             try:
                 # Call database function to delete the product
-                success = delete_product(self.current_product_id)
+                product_id = self.current_product_id
+                success = delete_product(product_id)
                 if success:  # If deletion was successful
+                    self._search_cache.clear()  # Cached search results are now outdated
                     self.clear_form()  # Clear the form
-                    self.load_products()  # Reload product list
+                    self.product_model.remove_product(
+                        product_id
+                    )  # Remove only its row from the table
                     self.load_categories()  # Reload categories
                     self.product_updated.emit()  # Emit signal
                     self.show_info(
@@ -419,13 +671,57 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
                     "Erreur Inattendue", f"Erreur lors de la suppression: {str(e)}"
                 )
 
-    def load_products(self):
+    def load_products(self, *, use_cache=False):
         """
         Loads products from the database based on current search and filter criteria,
         then populates the product table with this data.
         Manages column visibility based on self.visible_columns.
+        By default the cached search results are dropped first, so refreshes requested
+        by other views (after a sale or a purchase) show the current stock; the search
+        input and the category filter pass use_cache=True to reuse the searches already made.
         """
+        self._loaded = True
+        if not use_cache:
+            self._search_cache.clear()
         # Get current search query and category filter
+        search_query, category = self._current_filters()
+
+        # Suspend painting while the model is reset and the columns are shown/hidden,
+        # so the table is repainted once at the end instead of after each step.
+        self.product_table.setUpdatesEnabled(False)
+        try:
+            # Count the matching products, then let the model load them page by page:
+            # only the first page is read now, the next ones when the user scrolls down.
+            total = self._search_cache.get_or_fetch(
+                ("count", search_query, category),
+                partial(count_products, search_query, category),
+            )
+            self.product_model.set_source(
+                partial(self._fetch_product_page, search_query, category), total
+            )
+
+            # Update column visibility based on self.visible_columns,
+            # only when it changed since the last load (the model keeps the header as is)
+            if self._columns_dirty:
+                set_column_hidden = self.product_table.setColumnHidden
+                visible = self.visible_columns
+                for col_idx in range(self.product_model.columnCount()):
+                    set_column_hidden(
+                        col_idx,
+                        col_idx
+                        not in visible,  # Hide column if its index is not in visible_columns
+                    )
+                self._columns_dirty = False
+        except Exception as e:  # Catch any errors during product loading
+            self.show_error(
+                "Erreur Chargement Produits", f"Impossible de charger les produits: {e}"
+            )
+        finally:
+            self.product_table.setUpdatesEnabled(True)
+            self.product_table.viewport().update()  # Single repaint with the new rows
+
+    def _current_filters(self):
+        """Returns the (search_query, category) pair of the current search and category filter."""
         search_query = self.search_input.text().strip() if self.search_input else ""
         category = (
             self.category_filter_combo.currentText()
@@ -438,124 +734,67 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
             category == "Toutes les catégories"
         ):  # Treat "Toutes les catégories" as no filter
             category = None
+        return search_query, category
 
-        self.product_table.setRowCount(0)  # Clear existing rows in the table
-        try:
-            # Search for products in the database using the current filters
-            products = search_products(search_query, category)
-            self.product_table.setRowCount(
-                len(products)
-            )  # Set table rows to the number of products found
-
-            # Populate the table row by row
-            for row_idx, product in enumerate(products):
-                # Create QTableWidgetItem for each piece of product data and add to the table
-                self.product_table.setItem(
-                    row_idx, 0, QTableWidgetItem(str(product["id"]))  # Product ID
-                )
-                self.product_table.setItem(
-                    row_idx, 1, QTableWidgetItem(product["name"])  # Name
-                )
-                self.product_table.setItem(
-                    row_idx,
-                    2,
-                    QTableWidgetItem(
-                        product["category"] or ""
-                    ),  # Category (or empty string if None)
-                )
-                self.product_table.setItem(
-                    row_idx,
-                    3,
-                    QTableWidgetItem(product["description"] or ""),  # Description
-                )
-                self.product_table.setItem(
-                    row_idx,
-                    4,
-                    QTableWidgetItem(
-                        f"{product['purchase_price']:.2f} DZD"
-                    ),  # Purchase Price (formatted)
-                )
-                self.product_table.setItem(
-                    row_idx,
-                    5,
-                    QTableWidgetItem(
-                        f"{product['selling_price']:.2f} DZD"
-                    ),  # Selling Price (formatted)
-                )
-                self.product_table.setItem(
-                    row_idx,
-                    6,
-                    QTableWidgetItem(
-                        str(product["quantity_in_stock"])
-                    ),  # Stock Quantity
-                )
+    def _refresh_product_row(self, product_id):
+        """
+        Re-reads a single product after it was added or modified and puts its row
+        back in the table (at its place in the name order) if it matches the current
+        filters, instead of reloading the whole product list.
+        """
+        self.product_model.remove_product(product_id)  # Old version of the row, if any
+        product = get_product_by_id(product_id)
+        if not product:
+            return
+        search_query, category = self._current_filters()
+        # Same criteria as search_products (LIKE match on the name or the description)
+        if category and product["category"] != category:
+            return
+        if search_query and not (
+            _like_matches(product["name"], search_query)
+            or _like_matches(product["description"], search_query)
+        ):
+            return
+        self.product_model.insert_product(product)
 
-            # Update column visibility based on self.visible_columns
-            for col_idx in range(self.product_table.columnCount()):
-                self.product_table.setColumnHidden(
-                    col_idx,
-                    col_idx
-                    not in self.visible_columns,  # Hide column if its index is not in visible_columns
-                )
-        except Exception as e:  # Catch any errors during product loading
-            self.show_error(
-                "Erreur Chargement Produits", f"Impossible de charger les produits: {e}"
-            )
+    def _fetch_product_page(self, search_query, category, offset, limit):
+        """Returns one page of the search results (bound with partial and handed to the model)."""
+        return self._search_cache.get_or_fetch(
+            ("page", search_query, category, offset, limit),
+            partial(search_products, search_query, category, limit, offset),
+        )
 
     def filter_products(self):
         """
-        Triggered when the search input or category filter changes.
-        Calls load_products to refresh the table based on new filter criteria.
+        Triggered when the category filter changes and by the search debounce timer.
+        Calls load_products to refresh the table based on new filter criteria
+        (cached searches are reused).
         """
-        self.load_products()
+        self.load_products(use_cache=True)
 
-    def on_row_selected(self):
+    def on_row_selected(self, *_args):
         """
-        Called when a row in the product table is selected.
+        Called when the selection of the product table changes
+        (the selected/deselected arguments of the signal are not needed).
         Populates the input form with the data of the selected product.
         Enables/disables CRUD buttons based on selection.
         """
-        selected_items = (
-            self.product_table.selectedItems()
-        )  # Get currently selected items
-        if selected_items:  # If any items are selected (i.e., a row is selected)
-            selected_row = (
-                self.product_table.currentRow()
-            )  # Get the index of the selected row
-            # Get product ID from the first column of the selected row
-            self.current_product_id = int(
-                self.product_table.item(selected_row, 0).text()
-            )
-            # Populate form fields with data from the selected row
-            self.name_input.setText(self.product_table.item(selected_row, 1).text())
-            self.category_input.setText(
-                self.product_table.item(selected_row, 2).text() or ""  # Category
-            )
-            self.description_input.setPlainText(
-                self.product_table.item(selected_row, 3).text() or ""  # Description
-            )
-            # Safely parse purchase price (string to float)
-            try:
-                purchase_price_text = (
-                    self.product_table.item(selected_row, 4)  # Get text from cell
-                    .text()
-                    .replace(" DZD", "")  # Remove currency suffix
-                    .replace(",", ".")  # Replace comma with dot for float conversion
+        selected_rows = (
+            self.product_table.selectionModel().selectedRows()
+        )  # Get currently selected rows
+        if selected_rows:  # If a row is selected
+            # Read the product record stored under UserRole (no parsing of cell text)
+            product = selected_rows[0].data(Qt.ItemDataRole.UserRole)
+            self.current_product_id = product["id"]
+            # Populate form fields with data from the selected product
+            with self._blocked_form_signals():
+                self.name_input.setText(product["name"])
+                self.category_input.setText(product["category"] or "")  # Category
+                self.description_input.setPlainText(
+                    product["description"] or ""  # Description
                 )
-                self.purchase_price_input.setValue(float(purchase_price_text))
-            except ValueError:  # If conversion fails, set to 0.0
-                self.purchase_price_input.setValue(0.0)
-            # Safely parse selling price
-            try:
-                selling_price_text = (
-                    self.product_table.item(selected_row, 5)
-                    .text()
-                    .replace(" DZD", "")
-                    .replace(",", ".")
-                )
-                self.selling_price_input.setValue(float(selling_price_text))
-            except ValueError:
-                self.selling_price_input.setValue(0.0)
+                self.purchase_price_input.setValue(product["purchase_price"])
+                self.selling_price_input.setValue(product["selling_price"])
 
             # Enable Update and Delete buttons, disable Add button
             if self.update_button:
@@ -569,6 +808,22 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
         else:  # If no row is selected (e.g., selection cleared)
             self.clear_form()  # Clear the form and reset button states
 
+    def _blocked_form_signals(self):
+        """
+        Returns a context manager blocking the signals of the form inputs, so that
+        filling or clearing the form emits no textChanged/valueChanged per field.
+        """
+        stack = ExitStack()
+        for widget in (
+            self.name_input,
+            self.category_input,
+            self.description_input,
+            self.purchase_price_input,
+            self.selling_price_input,
+        ):
+            stack.enter_context(QSignalBlocker(widget))
+        return stack
+
     def clear_form(self):
         """
         Clears all input fields in the form, resets the current_product_id,
@@ -576,11 +831,12 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
         """
         self.current_product_id = None  # No product is selected
         # Clear all input fields
-        self.name_input.clear()
-        self.category_input.clear()
-        self.description_input.clear()
-        self.purchase_price_input.setValue(0.0)
-        self.selling_price_input.setValue(0.0)
+        with self._blocked_form_signals():
+            self.name_input.clear()
+            self.category_input.clear()
+            self.description_input.clear()
+            self.purchase_price_input.setValue(0.0)
+            self.selling_price_input.setValue(0.0)
         if self.product_table:  # If the table exists
             self.product_table.clearSelection()  # Clear any selection in the table
 
@@ -592,56 +848,54 @@ class ProductView(BaseView):  # ProductView class, inherits from BaseView
         if self.add_button:
             self.add_button.setEnabled(True)
 
+    def _build_column_menu(self):
+        """
+        Creates the header context menu and its checkable actions (one per column).
+        Built once; show_column_menu only updates the check marks before showing it.
+        """
+        self._column_menu = QMenu(self)
+        self._column_actions = []
+        for column in range(self.product_model.columnCount()):
+            column_name = self.product_model.headerData(
+                column, Qt.Orientation.Horizontal
+            )  # Get column name
+            action = QAction(
+                column_name, self, checkable=True
+            )  # Create a checkable action for this column
+            # triggered(checked) calls toggle_column_visibility(column, checked)
+            action.triggered.connect(partial(self.toggle_column_visibility, column))
+            self._column_menu.addAction(action)  # Add the action to the menu
+            self._column_actions.append(action)
+
     def show_column_menu(self, position):
         """
         Displays a context menu for the table header, allowing users to show/hide columns.
         Args:
             position: The position where the context menu was requested (usually mouse click position).
         """
-        menu = QMenu(self)  # Create a new context menu
-        header = (
-            self.product_table.horizontalHeader()
-        )  # Get the table's horizontal header
-
-        # Iterate through each column in the header
-        for column in range(header.count()):
-            column_name = self.product_table.horizontalHeaderItem(
-                column
-            ).text()  # Get column name
-            action = QAction(
-                column_name, self, checkable=True
-            )  # Create a checkable action for this column
-            action.setChecked(
-                column in self.visible_columns
-            )  # Check it if the column is currently visible
-            # Connect the action's triggered signal to toggle_column_visibility method
-            # Use a lambda function to pass the column index and checked state
-            action.triggered.connect(
-                lambda checked, col=column: self.toggle_column_visibility(col, checked)
-            )
-            menu.addAction(action)  # Add the action to the menu
-        menu.exec(
-            header.mapToGlobal(position)
+        # Check the actions of the currently visible columns
+        for column, action in enumerate(self._column_actions):
+            action.setChecked(column in self.visible_columns)
+        self._column_menu.exec(
+            self.product_table.horizontalHeader().mapToGlobal(position)
         )  # Display the menu at the global cursor position
 
     def toggle_column_visibility(self, column, visible):
         """
         Toggles the visibility of a specified column in the product table.
-        Updates the self.visible_columns list.
+        Updates the self.visible_columns set.
         Args:
             column (int): The index of the column to toggle.
             visible (bool): True to show the column, False to hide it.
         """
         if visible:  # If the action is to make the column visible
-            if column not in self.visible_columns:  # And it's not already in the list
-                self.visible_columns.append(column)  # Add it to the list
+            self.visible_columns.add(column)
         else:  # If the action is to hide the column
-            if column in self.visible_columns:  # And it's currently in the list
-                self.visible_columns.remove(column)  # Remove it from the list
+            self.visible_columns.discard(column)
         self.product_table.setColumnHidden(
             column, not visible
         )  # Update table's column visibility
-        self.visible_columns.sort()  # Keep the list of visible columns sorted (optional, for consistency)
+        self._columns_dirty = True
 
 
 if (
@@ -1,6 +1,7 @@
 # Updated content for sidou2/views/purchase_view.py
 import sys  # Standard Python library for system-specific parameters and functions.
 import datetime  # Standard Python library for working with dates and times.
+import functools  # For caching the formatted purchase dates.
 from PyQt6.QtWidgets import (  # Import necessary UI components from PyQt6.
     QApplication,  # Manages the application's control flow and main settings.
     QWidget,  # Base class for all UI objects.
@@ -8,8 +9,6 @@ from PyQt6.QtWidgets import (  # Import necessary UI components from PyQt6.
     QHBoxLayout,  # Arranges widgets horizontally.
     QLabel,  # Displays text or images.
     QPushButton,  # Represents a command button.
-    QTableWidget,  # Provides a table display.
-    QTableWidgetItem,  # Represents an item in a QTableWidget.
     QMessageBox,  # Displays modal dialogs for messages.
     QHeaderView,  # Provides header rows or columns for item views.
     QAbstractItemView,  # Provides an abstract model for item views.
@@ -21,25 +20,160 @@ from PyQt6.QtWidgets import (  # Import necessary UI components from PyQt6.
     QSpacerItem,  # Represents a blank space in a layout.
     QSizePolicy,  # Describes how a widget should resize.
     QFrame,  # Provides a frame, often used as a container or for styling.
+    QStyledItemDelegate,  # Formats numeric cells when they are painted.
 )
 from PyQt6.QtCore import (
     Qt,
     pyqtSignal,
+    QAbstractTableModel,  # Base class for the purchase history table model.
+    QModelIndex,  # Identifies a cell (row, column) in a model.
+    QTimer,  # Used to coalesce the purchase_recorded notifications.
 )  # Import core Qt functionalities like alignment flags and signals.
 
 # Import custom theme settings (colors, fonts, spacing, radius, styles).
-from theme import COLORS, FONTS, SPACING, RADIUS, STYLES
+from theme import COLORS, FONTS, SPACING, SPACING_PX, RADIUS, STYLES
 
 # Import database interaction functions.
 from database.database import (
     add_purchase,  # Function to add a new purchase record.
     get_purchase_history,  # Function to retrieve purchase history.
-    get_all_products,  # Function to retrieve all products (for product selection).
+    get_all_products,  # Function to retrieve all products (example usage in __main__).
+    get_product_summaries,  # Function to retrieve the id, name and stock of all products (for product selection).
     add_product,  # Function to add a new product (example usage in __main__).
     get_product_by_id,  # Function to retrieve a product by its ID.
 )
 from .base_view import BaseView  # Import BaseView for common UI functionalities.
-from utils.error_handler import DatabaseError  # Import custom DatabaseError exception.
+from utils.error_handler import (
+    DatabaseError,
+    log_error,
+)  # Import custom DatabaseError exception and error logging.
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_purchase_date(date_str):
+    """
+    Formats a purchase date string as 'YYYY-MM-DD HH:MM' for display.
+    Purchases never change once recorded, so results are cached by the raw string:
+    on later history loads only new purchases are formatted.
+    """
+    # Fast path: 'YYYY-MM-DD HH:MM[:SS...]' (as stored by add_purchase) only needs slicing.
+    if len(date_str) >= 16 and date_str[10] in " T" and date_str[13] == ":":
+        return f"{date_str[:10]} {date_str[11:16]}"
+    try:
+        # Attempt to parse ISO date string and format it for display.
+        dt_obj = datetime.datetime.fromisoformat(date_str)
+        return dt_obj.strftime("%Y-%m-%d %H:%M")  # Format as YYYY-MM-DD HH:MM.
+    except ValueError:
+        return date_str  # Fallback to original string if parsing fails.
+
+
+class FormatDelegate(QStyledItemDelegate):
+    """
+    Item delegate displaying a numeric cell through a format string (e.g. "{:.2f} DZD").
+    The model keeps the raw number; the text is only built for the cells actually painted.
+    """
+
+    def __init__(self, fmt, parent=None):
+        super().__init__(parent)
+        self._format = fmt.format  # Bound once, called for each painted cell
+
+    def displayText(self, value, locale):
+        return self._format(value)
+
+
+class PurchaseHistoryModel(QAbstractTableModel):
+    """
+    Table model holding the purchase history displayed in PurchaseView.
+    Each row is a tuple of cell values: texts for the ID, date, product and
+    supplier, raw numbers for the quantity and the cost (formatted by a
+    FormatDelegate when painted).
+    """
+
+    # Column header labels, in display order.
+    COLUMNS = [
+        "ID Achat",
+        "Date",
+        "Produit",
+        "Quantité",
+        "Coût Unit.",
+        "Fournisseur",
+    ]
+
+    # Number of purchases loaded at once; older ones are fetched when the user scrolls down.
+    PAGE_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []  # One tuple of cell values per purchase
+        self._fetch_page = None  # Function (offset, limit) -> list of row tuples
+        self._has_more = False  # True while the last page loaded was full
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self._rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, rows, fetch_page=None):
+        """
+        Replaces all the rows of the model (the view is refreshed once).
+        If 'fetch_page' is given, 'rows' is the first page of the history and
+        fetch_page(offset, limit) is used to load the next pages on scroll.
+        When the number of rows is unchanged (the usual case for the "last N purchases"
+        history), the cells are updated in place instead of resetting the model.
+        """
+        self._fetch_page = fetch_page
+        self._has_more = fetch_page is not None and len(rows) == self.PAGE_SIZE
+        if rows and len(rows) == len(self._rows):
+            # Only the rows whose values differ are repainted (none if nothing changed).
+            changed = [
+                row
+                for row, (new, old) in enumerate(zip(rows, self._rows))
+                if new != old
+            ]
+            self._rows = rows
+            if changed:
+                self.dataChanged.emit(
+                    self.index(changed[0], 0),
+                    self.index(changed[-1], len(self.COLUMNS) - 1),
+                )
+            return
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        # Called by the view when it scrolls near the last loaded row.
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+        try:
+            new_rows = self._fetch_page(len(self._rows), self.PAGE_SIZE)
+        except Exception as e:  # The table keeps the rows already loaded
+            log_error(e, "PurchaseHistoryModel.fetchMore")
+            new_rows = []
+        self._has_more = len(new_rows) == self.PAGE_SIZE
+        if not new_rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        self._rows.extend(new_rows)
+        self.endInsertRows()
 
 
 class PurchaseView(BaseView):  # PurchaseView class inherits from BaseView.
@@ -57,10 +191,17 @@ class PurchaseView(BaseView):  # PurchaseView class inherits from BaseView.
         )
         self.products_data = (
             {}
-        )  # Cache to store product data (e.g., for the product dropdown).
+        )  # Cache of the products in the dropdown: {product_id: {"row_idx", "name", "stock"}}.
+        self._refresh_pending = (
+            False  # True while a purchase_recorded emission is scheduled.
+        )
         self._init_ui_elements()  # Initialize UI elements specific to this view.
         self.load_products_for_combo()  # Load products into the product selection dropdown.
-        self.load_purchase_history()  # Load and display existing purchase history.
+        # The purchase history is loaded once the view is first shown (see _initial_load).
+
+    def _initial_load(self):
+        """Loads the purchase history when the view is first shown."""
+        self.load_purchase_history()
 
     def _init_ui_elements(self):
         """
@@ -79,17 +220,15 @@ class PurchaseView(BaseView):  # PurchaseView class inherits from BaseView.
         form_layout_outer = QVBoxLayout(form_card)
         # Set content margins for the form card using spacing values from the theme.
         form_layout_outer.setContentsMargins(
-            int(SPACING["lg"].replace("px", "")),
-            int(SPACING["lg"].replace("px", "")),
-            int(SPACING["lg"].replace("px", "")),
-            int(SPACING["lg"].replace("px", "")),
+            SPACING_PX["lg"],
+            SPACING_PX["lg"],
+            SPACING_PX["lg"],
+            SPACING_PX["lg"],
         )
 
         # Create a grid layout for arranging form elements (labels and input fields).
         form_grid_layout = QGridLayout()
-        form_grid_layout.setSpacing(
-            int(SPACING["md"].replace("px", ""))
-        )  # Set spacing between grid cells.
+        form_grid_layout.setSpacing(SPACING_PX["md"])  # Set spacing between grid cells.
 
         # --- Form Row 1: Product Selection and Quantity Input ---
         product_label = QLabel(
@@ -97,6 +236,13 @@ class PurchaseView(BaseView):  # PurchaseView class inherits from BaseView.
         )  # Label for product selection (asterisk indicates required).
         self.product_combo = QComboBox()  # Dropdown for selecting a product.
         quantity_label = QLabel("Quantité*:")  # Label for quantity input.
+        # Every item has the same height, and the width is not computed from every
+        # product name: both keep (re)filling the dropdown cheap with many products.
+        self.product_combo.view().setUniformItemSizes(True)
+        self.product_combo.setSizeAdjustPolicy(
+            QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon
+        )
+        self.product_combo.setMinimumContentsLength(20)  # Room for ~20 characters.
         self.quantity_spinbox = QSpinBox()  # Spinbox for entering purchase quantity.
         self.quantity_spinbox.setRange(1, 99999)  # Set min and max allowed quantity.
 
@@ -173,17 +319,19 @@ class PurchaseView(BaseView):  # PurchaseView class inherits from BaseView.
         )  # Add history title to the main layout.
 
         # Create the table to display purchase history using BaseView's helper method.
-        self.history_table = self.create_table(
-            [
-                "ID Achat",
-                "Date",
-                "Produit",
-                "Quantité",
-                "Coût Unit.",
-                "Fournisseur",
-            ],  # Define column headers.
+        # It is a QTableView backed by PurchaseHistoryModel (column headers come from the model).
+        self.history_model = PurchaseHistoryModel(self)
+        self.history_table = self.create_table_view(
+            self.history_model,
             selection_mode="none",  # Disable row selection in the history table.
         )
+        # Quantity and cost are stored as numbers and formatted only when painted.
+        self.history_table.setItemDelegateForColumn(
+            3, FormatDelegate("{}", self.history_table)
+        )
+        self.history_table.setItemDelegateForColumn(
+            4, FormatDelegate("{:.2f} DZD", self.history_table)
+        )
         # Configure how columns resize.
         self.history_table.horizontalHeader().setSectionResizeMode(
             QHeaderView.ResizeMode.Stretch  # Stretch most columns to fill available width.
@@ -222,26 +370,37 @@ class PurchaseView(BaseView):  # PurchaseView class inherits from BaseView.
     def load_products_for_combo(self):
         """
         Loads product data from the database and populates the product selection dropdown (QComboBox).
-        Stores product IDs in the `products_data` cache for later retrieval.
+        Stores each product's dropdown index, name and stock in the `products_data` cache,
+        so a single entry can be updated after a purchase without reloading the list.
         """
-        self.product_combo.clear()  # Clear existing items from the dropdown.
         self.products_data.clear()  # Clear the product data cache.
-        self.product_combo.addItem(
-            "Sélectionner un produit...", -1
-        )  # Add a default placeholder item.
-        # -1 can be used as user data for the placeholder.
+        # Block the dropdown's signals while it is rebuilt (restored in 'finally').
+        self.product_combo.blockSignals(True)
         try:
-            products = get_all_products()  # Fetch all products from the database.
-            if products:
-                for product in products:
-                    # Create a display text showing product name and current stock.
-                    display_text = (
-                        f"{product['name']} (Stock: {product['quantity_in_stock']})"
-                    )
-                    # Add item to dropdown: display text and product ID as item data.
-                    self.product_combo.addItem(display_text, product["id"])
-                    # Store product ID in cache, keyed by display text (alternative: key by ID if preferred).
-                    self.products_data[display_text] = product["id"]
+            self.product_combo.clear()  # Clear existing items from the dropdown.
+            products = (
+                get_product_summaries()
+            )  # Fetch the id, name and stock of all products from the database.
+            # Display texts: a default placeholder item, then product name and current stock.
+            texts = ["Sélectionner un produit..."]
+            texts.extend(
+                f"{product['name']} (Stock: {product['quantity_in_stock']})"
+                for product in products or []
+            )
+            # Add all the items at once (one insertion instead of one per product).
+            self.product_combo.addItems(texts)
+            self.product_combo.setItemData(
+                0, -1
+            )  # -1 can be used as user data for the placeholder.
+            for row_idx, product in enumerate(products or [], start=1):
+                # Product ID as item data.
+                self.product_combo.setItemData(row_idx, product["id"])
+                # Remember where the product is in the dropdown and its stock, keyed by ID.
+                self.products_data[product["id"]] = {
+                    "row_idx": row_idx,
+                    "name": product["name"],
+                    "stock": product["quantity_in_stock"],
+                }
         except DatabaseError as e:  # Catch specific database errors.
             self.show_error(
                 "Erreur Produits", f"Impossible de charger la liste des produits: {e}"
@@ -251,72 +410,37 @@ class PurchaseView(BaseView):  # PurchaseView class inherits from BaseView.
                 "Erreur Inattendue",
                 f"Une erreur s'est produite lors du chargement des produits: {e}",
             )
+        finally:
+            self.product_combo.blockSignals(False)
+            if self.product_combo.count() == 0:  # Loading failed: keep the placeholder.
+                self.product_combo.addItem("Sélectionner un produit...", -1)
+
+    def _update_product_stock(self, product_id, quantity_added):
+        """
+        Adds 'quantity_added' to the cached stock of a product and rewrites its dropdown text.
+        Falls back to a full reload if the product is not in the cache.
+        """
+        entry = self.products_data.get(product_id)
+        if entry is None:
+            self.load_products_for_combo()
+            return
+        entry["stock"] += quantity_added
+        self.product_combo.setItemText(
+            entry["row_idx"], f"{entry['name']} (Stock: {entry['stock']})"
+        )
 
     def load_purchase_history(self):
         """
         Loads purchase history from the database and populates the history table.
         Formats dates and currency for display.
         """
-        self.history_table.setRowCount(0)  # Clear existing rows from the table.
+        self._loaded = True
         try:
-            history = (
-                get_purchase_history()
-            )  # Fetch purchase history (typically recent records).
-            if history:
-                self.history_table.setRowCount(
-                    len(history)
-                )  # Set table rows based on number of history records.
-                for row_idx, purchase in enumerate(
-                    history
-                ):  # Iterate through history records.
-                    # Create QTableWidgetItem for each piece of purchase data.
-                    self.history_table.setItem(
-                        row_idx,
-                        0,
-                        QTableWidgetItem(str(purchase["id"])),  # Purchase ID.
-                    )
-                    date_str = purchase["purchase_date"]  # Get purchase date string.
-                    try:
-                        # Attempt to parse ISO date string and format it for display.
-                        dt_obj = datetime.datetime.fromisoformat(date_str)
-                        display_date = dt_obj.strftime(
-                            "%Y-%m-%d %H:%M"
-                        )  # Format as YYYY-MM-DD HH:MM.
-                    except ValueError:
-                        display_date = (
-                            date_str  # Fallback to original string if parsing fails.
-                        )
-                    self.history_table.setItem(
-                        row_idx,
-                        1,
-                        QTableWidgetItem(display_date),  # Formatted purchase date.
-                    )
-                    self.history_table.setItem(
-                        row_idx,
-                        2,
-                        QTableWidgetItem(purchase["product_name"]),  # Product name.
-                    )
-                    self.history_table.setItem(
-                        row_idx,
-                        3,
-                        QTableWidgetItem(
-                            str(purchase["quantity"])
-                        ),  # Quantity purchased.
-                    )
-                    self.history_table.setItem(
-                        row_idx,
-                        4,
-                        QTableWidgetItem(
-                            f"{purchase['cost_per_unit']:.2f} DZD"
-                        ),  # Cost per unit, formatted as currency.
-                    )
-                    self.history_table.setItem(
-                        row_idx,
-                        5,
-                        QTableWidgetItem(
-                            purchase["supplier"] or ""
-                        ),  # Supplier name, or empty string if None.
-                    )
+            # Only the most recent page is read now; older purchases are
+            # loaded by the model when the user scrolls down.
+            rows = self._fetch_history_page(0, self.history_model.PAGE_SIZE)
+            # Hand all the rows to the model at once: the table is refreshed in one step.
+            self.history_model.set_rows(rows, fetch_page=self._fetch_history_page)
         except DatabaseError as e:  # Catch specific database errors.
             self.show_error(
                 "Erreur Historique",
@@ -328,6 +452,44 @@ class PurchaseView(BaseView):  # PurchaseView class inherits from BaseView.
                 f"Une erreur s'est produite lors du chargement de l'historique: {e}",
             )
 
+    def _fetch_history_page(self, offset, limit):
+        """
+        Fetches one page of the purchase history (most recent first) and
+        returns it as a list of row tuples for PurchaseHistoryModel.
+        """
+        history = get_purchase_history(
+            limit, offset
+        )  # Fetch one page of purchase history records.
+        # One tuple of cell values per purchase. Each record is unpacked once, in the
+        # column order of get_purchase_history's SELECT, instead of six lookups by name.
+        return [
+            (
+                str(pid),  # Purchase ID.
+                _format_purchase_date(pdate),  # Formatted purchase date.
+                pname,  # Product name.
+                qty,  # Quantity purchased (shown as is).
+                cost,  # Cost per unit (shown as currency by its delegate).
+                sup or "",  # Supplier name, or empty string if None.
+            )
+            for pid, pdate, pname, qty, cost, sup in history or []
+        ]
+
+    def _schedule_purchase_recorded(self):
+        """
+        Schedules the emission of purchase_recorded shortly after, instead of emitting it
+        right away: purchases recorded in quick succession cause a single refresh of the
+        other views.
+        """
+        if self._refresh_pending:
+            return  # An emission is already scheduled and will cover this purchase.
+        self._refresh_pending = True
+        QTimer.singleShot(50, self._emit_purchase_recorded)
+
+    def _emit_purchase_recorded(self):
+        """Emits the purchase_recorded signal scheduled by _schedule_purchase_recorded."""
+        self._refresh_pending = False
+        self.purchase_recorded.emit()  # Emit signal indicating a purchase was made.
+
     def add_new_purchase(self):
         """
         Handles the recording of a new purchase.
@@ -360,38 +522,51 @@ class PurchaseView(BaseView):  # PurchaseView class inherits from BaseView.
                 "La quantité doit être positive et le coût doit être positif ou nul.",
             )
             return
-        try:  # Wrap database operation in a try-except block.
-            new_purchase_id = add_purchase(
-                product_id, quantity, cost, supplier
-            )  # Call DB function.
-            if new_purchase_id:  # If purchase was successfully added (returns ID).
-                self.show_info(
-                    "Succès",
-                    f"Achat pour le produit ID {product_id} enregistré.",  # Show success message.
-                )
-                self.load_purchase_history()  # Refresh the purchase history table.
-                self.load_products_for_combo()  # Reload products (stock levels will have changed).
-                # Clear form fields for the next entry.
-                self.product_combo.setCurrentIndex(
-                    0
-                )  # Reset product dropdown to placeholder.
-                self.quantity_spinbox.setValue(1)  # Reset quantity to 1.
-                self.cost_spinbox.setValue(0.0)  # Reset cost to 0.0.
-                self.supplier_input.clear()  # Clear supplier input.
-                self.purchase_recorded.emit()  # Emit signal indicating a purchase was made.
-            else:  # Should not happen if add_purchase raises an error or returns an ID.
-                self.show_error(
-                    "Erreur", "L'achat n'a pas pu être enregistré."
-                )  # Generic error if no ID returned.
-        except DatabaseError as e:  # Catch specific database errors.
+        # Record the purchase in a background thread; the button stays disabled
+        # until _on_purchase_done receives the result.
+        self.add_purchase_button.setEnabled(False)
+        self._purchase_signals = self.run_in_background(
+            functools.partial(self._on_purchase_done, product_id, quantity),
+            add_purchase,
+            product_id,
+            quantity,
+            cost,
+            supplier,
+        )  # Keep the signal holder alive until the result arrives.
+
+    def _on_purchase_done(self, product_id, quantity, new_purchase_id, error_message):
+        """
+        Called in the GUI thread when add_purchase (run by run_in_background) has finished.
+        Shows the result and refreshes the relevant UI parts.
+        """
+        self.add_purchase_button.setEnabled(True)
+        self._purchase_signals = None
+        if error_message:  # add_purchase raised an error.
             self.show_error(
                 "Erreur Base de Données",
-                f"Erreur lors de l'enregistrement de l'achat: {e}",
+                f"Erreur lors de l'enregistrement de l'achat: {error_message}",
             )
-        except Exception as e:  # Catch any other unexpected errors.
-            self.show_error(
-                "Erreur Inattendue", f"Une erreur inattendue est survenue: {e}"
+        elif new_purchase_id:  # If purchase was successfully added (returns ID).
+            self.show_info(
+                "Succès",
+                f"Achat pour le produit ID {product_id} enregistré.",  # Show success message.
             )
+            self.load_purchase_history()  # Refresh the purchase history table.
+            # The purchase raised this product's stock (database trigger):
+            # update only its dropdown entry instead of reloading every product.
+            self._update_product_stock(product_id, quantity)
+            # Clear form fields for the next entry.
+            self.product_combo.setCurrentIndex(
+                0
+            )  # Reset product dropdown to placeholder.
+            self.quantity_spinbox.setValue(1)  # Reset quantity to 1.
+            self.cost_spinbox.setValue(0.0)  # Reset cost to 0.0.
+            self.supplier_input.clear()  # Clear supplier input.
+            self._schedule_purchase_recorded()  # Notify that a purchase was made.
+        else:  # Should not happen if add_purchase raises an error or returns an ID.
+            self.show_error(
+                "Erreur", "L'achat n'a pas pu être enregistré."
+            )  # Generic error if no ID returned.
 
 
 # This block allows the PurchaseView to be run standalone for testing purposes.
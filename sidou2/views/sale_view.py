@@ -1,14 +1,15 @@
 # Updated content for sidou2/views/sale_view.py
 import sys  # Provides access to system-specific parameters and functions, e.g., for running the app.
 import datetime  # Standard library for working with dates and times.
+import functools  # For binding arguments to signal handlers (functools.partial) and lru_cache.
+from contextlib import contextmanager  # For the table refill helper below.
 from PyQt6.QtWidgets import (  # Import necessary UI components from PyQt6.
     QWidget,  # Base class for all UI objects.
     QVBoxLayout,  # Arranges widgets vertically.
     QHBoxLayout,  # Arranges widgets horizontally.
     QLabel,  # Displays text or images.
     QPushButton,  # Command button.
-    QTableWidget,  # For displaying data in a grid.
-    QTableWidgetItem,  # Represents a cell in a QTableWidget.
+    QTableView,  # Displays the rows of a table model.
     QMessageBox,  # For showing pop-up messages (alerts, warnings, info).
     QHeaderView,  # Provides headers for item views like QTableWidget.
     QAbstractItemView,  # Base class for item views.
@@ -20,12 +21,22 @@ from PyQt6.QtWidgets import (  # Import necessary UI components from PyQt6.
     QDialogButtonBox,  # Provides a standard layout for dialog buttons (OK, Cancel, etc.).
     QTextEdit,  # For displaying and editing multi-line rich text.
     QFrame,  # Provides a frame, often used as a container or for styling.
+    QStyledItemDelegate,  # Base class for custom cell painting in item views.
+    QStyle,  # Provides alignedRect, used to center the delete icon in its cell.
 )
 from PyQt6.QtCore import (
     Qt,
     pyqtSignal,
+    QAbstractTableModel,  # Base class for the cart and sales history table models.
+    QModelIndex,  # Identifies a cell (row, column) in a model.
+    QEvent,  # Event types, used to detect clicks in the "Retirer" column.
+    QTimer,  # Used to coalesce the sale_recorded notifications and price updates.
+    QSize,  # Size of the delete icon painted in the cart.
 )  # Import core Qt functionalities, including signals for custom communication.
-from PyQt6.QtGui import QFont  # Import classes for graphical elements like fonts.
+from PyQt6.QtGui import (
+    QFont,
+    QColor,
+)  # Import classes for graphical elements like fonts and colors.
 
 # --- Local Module Imports ---
 # Import database interaction functions.
@@ -33,23 +44,371 @@ from database.database import (
     add_sale,  # Function to record a new sale in the database.
     get_sales_history,  # Function to retrieve past sales records.
     get_sale_items,  # Function to get all items associated with a specific sale.
+    get_sale_receipt,  # Function to get a sale's header, customer and items in one query.
     get_all_products,  # Function to fetch all products from the database.
+    get_products_for_sale,  # Function to fetch the products in stock (id, name, price, stock).
     get_all_customers,  # Function to fetch all customers from the database.
     get_product_by_id,  # Function to retrieve a single product by its ID.
-    get_db_connection,  # Function to establish a database connection.
     get_product_details_for_sale,  # Function to fetch product details (name, price, stock) for sale.
 )
 
 # Import theme-related variables and functions for consistent styling.
-from theme import STYLES, COLORS, FONTS, SPACING, RADIUS
+from theme import STYLES, COLORS, FONTS, SPACING, SPACING_PX, RADIUS, get_icon
 
 # Import custom error handler for database-related exceptions.
-from utils.error_handler import DatabaseError
+from utils.error_handler import DatabaseError, log_error
 
 # Import the BaseView class, which provides common functionalities for all views.
 from views.base_view import BaseView
 
 
+# Style of the unit price and stock labels of the new sale form (built once).
+_INFO_LABEL_STYLE = (
+    f"font-weight: bold; color: {COLORS.get('text_secondary', '#4f46e5')}; "
+    f"font-size: {FONTS['sm']}pt;"
+)
+
+# Formats an amount for display, e.g. 1234.5 -> "1234.50 DZD" (format method bound once).
+_money = "{:.2f} DZD".format
+
+# Alignment of the price and amount columns.
+_ALIGN_RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+
+@functools.lru_cache(maxsize=4096)  # Many sales share the same minute; parse each date once.
+def _format_sale_date(date_str):
+    """
+    Formats a sale date string as 'YYYY-MM-DD HH:MM' for display.
+    Falls back to the original string if it is not an ISO date.
+    """
+    try:
+        dt_obj = datetime.datetime.fromisoformat(date_str)
+        return dt_obj.strftime("%Y-%m-%d %H:%M")  # Formatted date.
+    except ValueError:  # If parsing fails, use the original string.
+        return date_str
+
+
+# Item table header of the receipts, between two separator lines (built once).
+_RECEIPT_TABLE_HEADER = (
+    f"{'-'*40}\n"
+    f"{'Produit':<20} {'Qté':>3} {'Prix U.':>8} {'Total':>8}\n"
+    f"{'-'*40}\n"
+)
+
+# One item line of a receipt: name, quantity, unit price and subtotal.
+_RECEIPT_ITEM_FMT = "{name:<20} {qty:>3} {price:>8.2f} {sub:>8.2f}\n"
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_receipt_date(date_str):
+    """
+    Formats a sale date string as 'DD/MM/YYYY HH:MM:SS' for receipts.
+    Falls back to the original string if it is not an ISO date.
+    """
+    try:
+        dt_obj = datetime.datetime.fromisoformat(date_str)
+        return dt_obj.strftime("%d/%m/%Y %H:%M:%S")  # Formatted date.
+    except ValueError:  # Fallback if date format is unexpected.
+        return date_str
+
+
+@contextmanager
+def _table_refill(table):
+    """
+    Context manager for refilling a table view: repaints and automatic column
+    sizing (Stretch / ResizeToContents) are suspended inside the block, then the
+    columns are sized and the table repainted once on exit.
+    """
+    header = table.horizontalHeader()
+    modes = [header.sectionResizeMode(col) for col in range(header.count())]
+    table.setUpdatesEnabled(False)
+    header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+    try:
+        yield
+    finally:
+        for col, mode in enumerate(modes):  # Restore the configured modes.
+            header.setSectionResizeMode(col, mode)
+        table.setUpdatesEnabled(True)
+
+
+class CartModel(QAbstractTableModel):
+    """
+    Table model of the current sale (the cart) displayed in SaleView.
+    It reads the cart item dicts directly ('name', 'quantity', 'price_at_sale', 'subtotal');
+    the "Retirer" column has no text, it is painted by a RemoveButtonDelegate.
+    """
+
+    # Column header labels, in display order.
+    COLUMNS = ["Produit", "Qté", "Prix Unit.", "Sous-Total", "Retirer"]
+    REMOVE_COLUMN = 4  # Index of the "Retirer" column.
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.items = []  # The cart item dicts (SaleView.current_sale_items)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            item = self.items[index.row()]
+            if column == 0:
+                return item["name"]
+            if column == 1:
+                return str(item["quantity"])
+            if column == 2:
+                return _money(item["price_at_sale"])  # Formatted price.
+            if column == 3:
+                return _money(item["subtotal"])  # Formatted subtotal.
+        elif role == Qt.ItemDataRole.TextAlignmentRole and column in (2, 3):
+            return _ALIGN_RIGHT
+        elif role == Qt.ItemDataRole.ToolTipRole and column == self.REMOVE_COLUMN:
+            return "Retirer cet article du panier"
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def set_items(self, items):
+        """Displays the given list of cart items (the view is refreshed once)."""
+        self.beginResetModel()
+        self.items = items
+        self.endResetModel()
+
+    def append_item(self, item):
+        """Appends one item to the cart; only its row is inserted in the view."""
+        row = len(self.items)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.items.append(item)
+        self.endInsertRows()
+
+    def item_changed(self, row):
+        """Repaints the quantity and subtotal of the item at 'row' after it was updated."""
+        self.dataChanged.emit(self.index(row, 1), self.index(row, 3))
+
+    def remove_item(self, row):
+        """Removes the item at 'row' from the cart; the other rows are kept as they are."""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.items[row]
+        self.endRemoveRows()
+
+
+class SaleHistoryModel(QAbstractTableModel):
+    """
+    Table model holding the sales history rows (as returned by get_sales_history())
+    displayed in SaleView. Cells are formatted when they are painted.
+    """
+
+    # Column header labels, in display order.
+    COLUMNS = ["ID Vente", "Date", "Client", "Montant Total"]
+
+    # Number of sales loaded at once; older ones are fetched when the user scrolls down.
+    PAGE_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []  # Sale records: 'id', 'sale_date', 'customer_name', 'total_amount'
+        self._fetch_page = None  # Function (offset, limit) -> list of sale records
+        self._has_more = False  # True while the last page loaded was full
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            sale = self._rows[index.row()]
+            if column == 0:
+                return str(sale["id"])  # Sale ID.
+            if column == 1:
+                return _format_sale_date(sale["sale_date"])  # Sale date.
+            if column == 2:
+                return sale["customer_name"] or "Anonyme"  # Customer name or "Anonyme".
+            if column == 3:
+                return _money(sale["total_amount"])  # Total amount, formatted.
+        elif role == Qt.ItemDataRole.TextAlignmentRole and column == 3:
+            return _ALIGN_RIGHT
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, rows, fetch_page=None):
+        """
+        Replaces all the rows of the model (the view is refreshed once).
+        If 'fetch_page' is given, 'rows' is the first page of the history and
+        fetch_page(offset, limit) is used to load the next pages on scroll.
+        """
+        self._fetch_page = fetch_page
+        self._has_more = fetch_page is not None and len(rows) == self.PAGE_SIZE
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        # Called by the view when it scrolls near the last loaded row.
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+        try:
+            new_rows = self._fetch_page(len(self._rows), self.PAGE_SIZE)
+        except Exception as e:  # The table keeps the rows already loaded
+            log_error(e, "SaleHistoryModel.fetchMore")
+            new_rows = []
+        self._has_more = len(new_rows) == self.PAGE_SIZE
+        if not new_rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        self._rows.extend(new_rows)
+        self.endInsertRows()
+
+    def insert_sale(self, sale):
+        """
+        Shows a newly recorded sale (dict with the keys of a history record)
+        at the top of the history, without reloading the other rows.
+        """
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._rows.insert(0, sale)
+        self.endInsertRows()
+
+    def sale_id(self, row):
+        """Returns the ID of the sale displayed at 'row'."""
+        return self._rows[row]["id"]
+
+
+class SaleItemsModel(QAbstractTableModel):
+    """
+    Table model of the items of one sale (as returned by get_sale_items()),
+    displayed in SaleDetailsDialog. A sale's items never change, so the cell
+    texts are formatted once, when the rows are set.
+    """
+
+    # Column header labels, in display order.
+    COLUMNS = ["Produit", "Quantité", "Prix Unit.", "Sous-Total"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []  # Cell texts of each item: (name, quantity, unit price, subtotal)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][column]  # Preformatted cell text.
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in (2, 3):
+            return _ALIGN_RIGHT
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, rows):
+        """
+        Replaces all the rows of the model (the view is refreshed once).
+        'rows' are sale item records with 'product_name', 'quantity' and 'price_at_sale'.
+        """
+        cells = []
+        for item in rows:
+            quantity, price = item["quantity"], item["price_at_sale"]
+            cells.append(
+                (
+                    item["product_name"],  # Product name.
+                    str(quantity),  # Quantity.
+                    _money(price),  # Unit price.
+                    _money(quantity * price),  # Subtotal.
+                )
+            )
+        self.beginResetModel()
+        self._rows = cells
+        self.endResetModel()
+
+
+class RemoveButtonDelegate(QStyledItemDelegate):
+    """
+    Paints a delete icon (or a red "X" if the icon file is missing) in the "Retirer"
+    column of the cart and emits remove_requested(row) when it is clicked,
+    instead of creating a QPushButton widget for every row.
+    """
+
+    # Emitted with the row index of the clicked item.
+    remove_requested = pyqtSignal(int)
+
+    ICON_SIZE = 16  # Size of the painted icon, in pixels.
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Built once, not per paint.
+        self._icon = get_icon("delete-svgrepo-com.svg")
+        self._color = QColor(COLORS.get("error", "red"))
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)  # Background and selection.
+        if self._icon is not None:
+            self._icon.paint(
+                painter,
+                QStyle.alignedRect(
+                    option.direction,
+                    Qt.AlignmentFlag.AlignCenter,
+                    QSize(self.ICON_SIZE, self.ICON_SIZE),
+                    option.rect,
+                ),
+            )
+            return
+        painter.save()
+        font = painter.font()
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(self._color)
+        painter.drawText(option.rect, Qt.AlignmentFlag.AlignCenter, "X")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.Type.MouseButtonRelease
+            and event.button() == Qt.MouseButton.LeftButton
+            and option.rect.contains(event.position().toPoint())
+        ):
+            self.remove_requested.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
 class SaleView(
     BaseView
 ):  # Main class for the sales management view, inheriting from BaseView.
@@ -78,9 +437,37 @@ class SaleView(
         self.current_sale_items = (
             []
         )  # List to hold items currently added to the new sale (the cart).
+        # Row of each product in current_sale_items, keyed by product ID,
+        # so adding a product does not scan the whole cart.
+        self._cart_index = {}
+        self._cart_total = 0.0  # Running total of the cart's subtotals.
         self.selected_sale_id_for_details = None  # Stores the ID of a sale selected from the history table for viewing details.
+        self._history_request = 0  # Number of the latest history load (older results are ignored)
+        self._history_signals = None  # Signal holder of the running history load
+        self._sale_signals = None  # Signal holder of the running sale recording
+        self._refresh_pending = (
+            False  # True while a sale_recorded emission is scheduled.
+        )
+        # True once the product / customer dropdown has been loaded (by this view or by
+        # MainWindow.change_page, which loads it before the first-show load runs).
+        self._products_loaded = False
+        self._customers_loaded = False
         self._init_ui_elements()  # Initialize the user interface elements specific to this view.
-        self.load_initial_data()  # Load initial data required for the view (products, customers, sales history).
+        # Only the sales history is loaded now; the product and customer dropdowns
+        # are filled when the view is first shown (see _initial_load).
+        self.load_sales_history()
+
+    @property
+    def _loaded(self):
+        """True once both dropdowns of the new sale form are loaded (see BaseView)."""
+        return self._products_loaded and self._customers_loaded
+
+    def _initial_load(self):
+        """Loads the dropdowns of the new sale form that are not loaded yet."""
+        if not self._products_loaded:
+            self.load_products_for_sale()  # Populate the product selection dropdown.
+        if not self._customers_loaded:
+            self.load_customers_for_sale()  # Populate the customer selection dropdown.
 
     def _init_ui_elements(
         self,
@@ -94,13 +481,13 @@ class SaleView(
         # Main layout for the SaleView will be horizontal, splitting space between new sale and history sections.
         main_layout = QHBoxLayout()  # <-- FIX: do not parent to self
         main_layout.setContentsMargins(  # Set margins around the main layout using theme spacing.
-            int(SPACING["lg"].replace("px", "")),  # Left margin.
-            int(SPACING["lg"].replace("px", "")),  # Top margin.
-            int(SPACING["lg"].replace("px", "")),  # Right margin.
-            int(SPACING["lg"].replace("px", "")),  # Bottom margin.
+            SPACING_PX["lg"],  # Left margin.
+            SPACING_PX["lg"],  # Top margin.
+            SPACING_PX["lg"],  # Right margin.
+            SPACING_PX["lg"],  # Bottom margin.
         )
         main_layout.setSpacing(
-            int(SPACING["lg"].replace("px", ""))
+            SPACING_PX["lg"]
         )  # Set spacing between child widgets/layouts.
 
         # --- "Nouvelle Vente" (New Sale) Section ---
@@ -113,7 +500,7 @@ class SaleView(
             new_sale_group
         )  # Vertical layout for content inside the new_sale_group.
         new_sale_layout.setSpacing(
-            int(SPACING["md"].replace("px", ""))
+            SPACING_PX["md"]
         )  # Spacing for elements within this group.
 
         # Customer selection area.
@@ -132,12 +519,18 @@ class SaleView(
         add_item_layout = (
             QGridLayout()
         )  # Grid layout for better arrangement of product, quantity, price, stock.
-        add_item_layout.setSpacing(int(SPACING["sm"].replace("px", "")))
+        add_item_layout.setSpacing(SPACING_PX["sm"])
         product_label = QLabel("Produit:")  # Label for product selection.
         self.product_combo = QComboBox()  # Dropdown to select a product.
         # Connect the product selection change to update displayed price and stock.
-        self.product_combo.currentIndexChanged.connect(
-            self.update_price_and_stock_display
+        # The update is coalesced by a zero-delay single-shot timer: several index
+        # changes in a row (e.g. while typing in the combobox) cause a single update.
+        self._price_update_timer = QTimer(self)
+        self._price_update_timer.setSingleShot(True)
+        self._price_update_timer.setInterval(0)
+        self._price_update_timer.timeout.connect(self.update_price_and_stock_display)
+        self.product_combo.currentIndexChanged[int].connect(
+            self._schedule_price_update
         )
         quantity_label = QLabel("Qté:")  # Label for quantity input.
         self.quantity_spinbox = QSpinBox()  # Spinbox for entering product quantity.
@@ -160,7 +553,7 @@ class SaleView(
             "Prix Unit.: --.-- DZD"
         )  # Placeholder for price.
         self.price_display_label.setStyleSheet(  # Styling for the price display.
-            f"font-weight: bold; color: {COLORS.get('text_secondary', '#4f46e5')}; font-size: {FONTS['sm']}pt;"
+            _INFO_LABEL_STYLE
         )
         add_item_layout.addWidget(
             self.price_display_label,
@@ -173,7 +566,7 @@ class SaleView(
             "Stock: --"
         )  # Placeholder for stock quantity.
         self.stock_display_label.setStyleSheet(  # Styling for the stock display.
-            f"font-weight: bold; color: {COLORS.get('text_secondary', '#4f46e5')}; font-size: {FONTS['sm']}pt;"
+            _INFO_LABEL_STYLE
         )
         add_item_layout.addWidget(
             self.stock_display_label,
@@ -199,12 +592,12 @@ class SaleView(
         )  # Add the item addition layout to the new sale group.
 
         # Apply styles to input fields and labels within the new_sale_group using BaseView methods.
+        label_style = STYLES.get("label", "")  # Looked up once for all the labels.
         for widget in [customer_label, product_label, quantity_label]:
-            widget.setStyleSheet(STYLES.get("label", ""))  # Apply standard label style.
+            widget.setStyleSheet(label_style)  # Apply standard label style.
+        input_style = STYLES.get("input", "")  # Looked up once for all the inputs.
         for widget in [self.customer_combo, self.product_combo, self.quantity_spinbox]:
-            widget.setStyleSheet(
-                STYLES.get("input", "")
-            )  # Apply standard input field style.
+            widget.setStyleSheet(input_style)  # Apply standard input field style.
             widget.setMinimumHeight(35)  # Ensure consistent height for input fields.
 
         # "Panier Actuel" (Current Cart) section.
@@ -215,16 +608,19 @@ class SaleView(
         new_sale_layout.addWidget(cart_label)
 
         # Table to display items added to the current sale (the cart).
-        self.current_sale_table = (
-            self.create_table(  # Use BaseView's helper to create a themed table.
-                [
-                    "Produit",
-                    "Qté",
-                    "Prix Unit.",
-                    "Sous-Total",
-                    "Retirer",
-                ]  # Column headers.
-            )
+        # It is a QTableView backed by CartModel (column headers come from the model).
+        self.cart_model = CartModel(self)
+        # The model works directly on the cart list.
+        self.cart_model.set_items(self.current_sale_items)
+        self.current_sale_table = self.create_table_view(
+            self.cart_model
+        )  # Use BaseView's helper to create a themed table.
+        # The "Retirer" column is painted and handled by a delegate (no widget per row).
+        remove_delegate = RemoveButtonDelegate(self.current_sale_table)
+        remove_delegate.remove_requested.connect(self.remove_item_from_sale)
+        self.current_sale_table.setItemDelegateForColumn(
+            CartModel.REMOVE_COLUMN,
+            remove_delegate,
         )
         # Configure column resizing behavior.
         self.current_sale_table.horizontalHeader().setSectionResizeMode(
@@ -240,7 +636,7 @@ class SaleView(
 
         # Layout for total amount display and finalize/clear sale buttons.
         finalize_layout = QHBoxLayout()
-        finalize_layout.setSpacing(int(SPACING["md"].replace("px", "")))
+        finalize_layout.setSpacing(SPACING_PX["md"])
         self.total_label = QLabel(
             "Total Vente: 0.00 DZD"
         )  # Label to display the total amount of the current sale.
@@ -293,12 +689,13 @@ class SaleView(
         history_layout = QVBoxLayout(
             history_group
         )  # Vertical layout for content inside history_group.
-        history_layout.setSpacing(int(SPACING["md"].replace("px", "")))
+        history_layout.setSpacing(SPACING_PX["md"])
 
-        # Table to display past sales records.
-        self.history_table = self.create_table(  # Use BaseView's helper.
-            ["ID Vente", "Date", "Client", "Montant Total"]  # Column headers.
-        )
+        # Table to display past sales records, backed by SaleHistoryModel.
+        self.history_model = SaleHistoryModel(self)
+        self.history_table = self.create_table_view(
+            self.history_model
+        )  # Use BaseView's helper.
         # Configure column resizing behavior.
         self.history_table.horizontalHeader().setSectionResizeMode(
             QHeaderView.ResizeMode.Stretch
@@ -320,14 +717,14 @@ class SaleView(
         self.history_table.verticalHeader().setVisible(
             False
         )  # Hide vertical row numbers.
-        self.history_table.itemSelectionChanged.connect(
+        self.history_table.selectionModel().selectionChanged.connect(
             self.on_history_row_selected
-        )  # Add this line
+        )  # Update the selected sale when the selection changes.
         history_layout.addWidget(self.history_table)  # Add history table to its group.
 
         # Layout for buttons related to sales history (view details, generate receipt, refresh).
         history_button_layout = QHBoxLayout()
-        history_button_layout.setSpacing(int(SPACING["sm"].replace("px", "")))
+        history_button_layout.setSpacing(SPACING_PX["sm"])
 
         # Button to view detailed items of a selected sale from the history. Initially disabled.
         self.view_details_button = self.create_button(
@@ -390,69 +787,109 @@ class SaleView(
         """
         Fetches all products from the database and populates the product_combo QComboBox.
         Only products with stock > 0 are shown. Caches product details for quick access.
+        The dropdown is left as is if the products are unchanged since the last load.
         """
-        self.product_combo.clear()  # Clear existing items.
-        self.products_cache.clear()  # Clear product cache.
-        self.product_combo.addItem(
-            "Sélectionner un produit...", -1
-        )  # Add a default placeholder item.
+        self._products_loaded = True
         try:
-            products = get_all_products()  # Fetch all products from the database.
-            if products:
-                for product in products:
-                    # Only add products that are in stock.
-                    if product["quantity_in_stock"] > 0:
-                        # Display product name and current stock in the combobox item text.
-                        self.product_combo.addItem(
-                            f"{product['name']} (Stock: {product['quantity_in_stock']})",
-                            product["id"],  # Store product ID as item data.
-                        )
-                        # Cache essential product details.
-                        self.products_cache[product["id"]] = {
-                            "name": product["name"],
-                            "price": product["selling_price"],
-                            "stock": product["quantity_in_stock"],
-                        }
-            self.update_price_and_stock_display()  # Update price/stock labels for the currently selected/default product.
+            # Fetch the products in stock (only they can be sold; filtered by the query).
+            # Each record is unpacked once, in the column order of get_products_for_sale's
+            # SELECT (id, name, selling_price, quantity_in_stock), instead of lookups by name.
+            products = {
+                pid: {"name": name, "price": price, "stock": stock}
+                for pid, name, price, stock in get_products_for_sale() or []
+            }  # Essential product details (in name order, like the query).
         except DatabaseError as e:  # Handle potential database errors.
             self.show_error(  # Use BaseView's error message display.
                 "Erreur Produits",
                 f"Impossible de charger les produits: {e}",
             )
+            products = {}  # Only the placeholder is shown.
+        if (
+            products == self.products_cache
+            and list(products) == list(self.products_cache)  # Same order too.
+            and self.product_combo.count() == len(products) + 1  # Placeholder + products.
+        ):
+            # Nothing changed (e.g. the stock of the sold items was already applied):
+            # keep the dropdown and its current selection.
+            return
+        self.products_cache = products  # Cache essential product details.
+        # Display texts: a default placeholder item, then product name and current stock.
+        texts = ["Sélectionner un produit..."]
+        texts.extend(
+            f"{info['name']} (Stock: {info['stock']})" for info in products.values()
+        )
+        # Rebuild the dropdown without repainting or emitting currentIndexChanged
+        # for every inserted item (both restored in 'finally').
+        self.product_combo.setUpdatesEnabled(False)
+        self.product_combo.blockSignals(True)
+        try:
+            self.product_combo.clear()  # Clear existing items.
+            # Add all the items at once (one insertion instead of one per product).
+            self.product_combo.addItems(texts)
+            self.product_combo.setItemData(0, -1)  # Placeholder item data.
+            for row_idx, pid in enumerate(products, start=1):
+                self.product_combo.setItemData(
+                    row_idx, pid
+                )  # Store product ID as item data.
+        finally:
+            self.product_combo.blockSignals(False)
+            self.product_combo.setUpdatesEnabled(True)
+        self.update_price_and_stock_display()  # Update price/stock labels once for the default product.
 
     def load_customers_for_sale(self):
         """
         Fetches all customers from the database and populates the customer_combo QComboBox.
         Includes an option for anonymous sales. Caches customer names.
         """
-        self.customer_combo.clear()  # Clear existing items.
+        self._customers_loaded = True
         self.customers_cache.clear()  # Clear customer cache.
-        self.customer_combo.addItem(
-            "Vente Anonyme", -1
-        )  # Default option for sales without a specific customer.
+        # Rebuild the dropdown in one pass, without per-item repaints or signals.
+        self.customer_combo.setUpdatesEnabled(False)
+        self.customer_combo.blockSignals(True)
         try:
-            customers = get_all_customers()  # Fetch all customers.
-            if customers:
-                for customer in customers:
-                    self.customer_combo.addItem(
-                        customer["name"], customer["id"]
-                    )  # Add customer name and store ID.
-                    self.customers_cache[customer["id"]] = customer[
-                        "name"
-                    ]  # Cache customer name.
+            self.customer_combo.clear()  # Clear existing items.
+            customers = get_all_customers() or []  # Fetch all customers.
+            # Default option for sales without a specific customer, then customer names.
+            self.customer_combo.addItems(
+                ["Vente Anonyme"] + [customer["name"] for customer in customers]
+            )
+            self.customer_combo.setItemData(0, -1)
+            for row_idx, customer in enumerate(customers, start=1):
+                self.customer_combo.setItemData(
+                    row_idx, customer["id"]
+                )  # Store customer ID.
+                self.customers_cache[customer["id"]] = customer[
+                    "name"
+                ]  # Cache customer name.
         except Exception as e:  # Handle potential errors.
             QMessageBox.critical(  # Standard Qt MessageBox for critical errors.
                 self, "Erreur Clients", f"Impossible de charger les clients: {e}"
             )
+        finally:
+            if self.customer_combo.count() == 0:  # Loading failed: keep the default option.
+                self.customer_combo.addItem("Vente Anonyme", -1)
+            self.customer_combo.blockSignals(False)
+            self.customer_combo.setUpdatesEnabled(True)
 
-    def update_price_and_stock_display(self):
+    def _schedule_price_update(self, _index):
+        """
+        Slot of product_combo.currentIndexChanged: schedules update_price_and_stock_display
+        (restarting the timer if already pending, so only the last index is handled).
+        """
+        self._price_update_timer.start()
+
+    def update_price_and_stock_display(self, selected_index=-1):
         """
         Updates the price and stock display labels based on the currently selected product
         in the product_combo. Also adjusts the range of the quantity_spinbox.
+        Args:
+            selected_index (int): The new current index, as sent by currentIndexChanged;
+                                  -1 (direct calls) reads it from the combobox.
         """
-        selected_index = (
-            self.product_combo.currentIndex()
-        )  # Get the index of the currently selected item.
+        if selected_index == -1:
+            selected_index = (
+                self.product_combo.currentIndex()
+            )  # Get the index of the currently selected item.
         if (
             selected_index > 0
         ):  # If a product is selected (index 0 is "Sélectionner un produit...").
@@ -465,7 +902,7 @@ class SaleView(
                 product_info = self.products_cache[product_id]
                 # Update labels with formatted price and stock.
                 self.price_display_label.setText(
-                    f"Prix Unit.: {product_info['price']:.2f} DZD"
+                    "Prix Unit.: " + _money(product_info["price"])
                 )
                 self.stock_display_label.setText(f"Stock: {product_info['stock']}")
                 # Set the quantity spinbox range from 1 to available stock.
@@ -516,11 +953,11 @@ class SaleView(
         product_info = self.products_cache[product_id]
 
         # Check stock availability (considering items already in the cart for the same product).
-        current_cart_qty_for_product = 0
-        for item in self.current_sale_items:
-            if item["product_id"] == product_id:
-                current_cart_qty_for_product = item["quantity"]
-                break
+        existing_row = self._cart_index.get(product_id)
+        existing_item = (
+            self.current_sale_items[existing_row] if existing_row is not None else None
+        )
+        current_cart_qty_for_product = existing_item["quantity"] if existing_item else 0
 
         if quantity_to_add + current_cart_qty_for_product > product_info["stock"]:
             self.show_warning(
@@ -531,32 +968,31 @@ class SaleView(
             return
 
         # Add or update item in the current_sale_items list (cart).
-        found_in_cart = False
-        for item in self.current_sale_items:
-            if (
-                item["product_id"] == product_id
-            ):  # If product already in cart, update its quantity.
-                item["quantity"] += quantity_to_add
-                item["subtotal"] = (
-                    item["quantity"] * item["price_at_sale"]
-                )  # Recalculate subtotal.
-                found_in_cart = True
-                break
-
-        if not found_in_cart:  # If product not in cart, add as a new item.
-            self.current_sale_items.append(
-                {
-                    "product_id": product_id,
-                    "name": product_info["name"],
-                    "quantity": quantity_to_add,
-                    "price_at_sale": product_info[
-                        "price"
-                    ],  # Price at the time of adding to cart.
-                    "subtotal": quantity_to_add * product_info["price"],
-                }
-            )
+        # Only the affected row of the cart table is updated (no full rebuild).
+        if existing_item:  # If product already in cart, update its quantity.
+            existing_item["quantity"] += quantity_to_add
+            existing_item["subtotal"] = (
+                existing_item["quantity"] * existing_item["price_at_sale"]
+            )  # Recalculate subtotal.
+            self._cart_total += quantity_to_add * existing_item["price_at_sale"]
+            self.cart_model.item_changed(existing_row)  # Repaint this row only.
+        else:  # If product not in cart, add as a new item.
+            new_item = {
+                "product_id": product_id,
+                "name": product_info["name"],
+                "quantity": quantity_to_add,
+                "price_at_sale": product_info[
+                    "price"
+                ],  # Price at the time of adding to cart.
+                "subtotal": quantity_to_add * product_info["price"],
+            }
+            self._cart_index[product_id] = len(self.current_sale_items)
+            self._cart_total += new_item["subtotal"]
+            self.cart_model.append_item(
+                new_item
+            )  # Appends to current_sale_items and inserts one row.
 
-        self.refresh_current_sale_table()  # Update the visual cart table.
+        self.finalize_button.setEnabled(True)  # The cart is not empty.
         self.update_total()  # Recalculate and display the total sale amount.
         # Optionally, reset product selection and quantity input after adding.
         self.product_combo.setCurrentIndex(0)  # Reset product selection.
@@ -567,48 +1003,14 @@ class SaleView(
 
     def refresh_current_sale_table(self):
         """
-        Updates the current_sale_table QTableWidget with items from the current_sale_items list.
-        Also adds a "Remove" button for each item in the cart.
+        Updates the current_sale_table with items from the current_sale_items list.
+        The "Remove" (X) cells are painted by the table's RemoveButtonDelegate.
+        Used when the whole cart is replaced (e.g. cleared); adding or removing a
+        single item updates only its row through cart_model.
         """
-        self.current_sale_table.setRowCount(0)  # Clear existing rows.
-        self.current_sale_table.setRowCount(
-            len(self.current_sale_items)
-        )  # Set row count based on cart items.
-        for row_idx, item in enumerate(self.current_sale_items):
-            # Populate cells with item details.
-            self.current_sale_table.setItem(row_idx, 0, QTableWidgetItem(item["name"]))
-            self.current_sale_table.setItem(
-                row_idx, 1, QTableWidgetItem(str(item["quantity"]))
-            )
-            self.current_sale_table.setItem(
-                row_idx,
-                2,
-                QTableWidgetItem(
-                    f"{item['price_at_sale']:.2f} DZD"
-                ),  # Formatted price.
-            )
-            self.current_sale_table.setItem(
-                row_idx,
-                3,
-                QTableWidgetItem(f"{item['subtotal']:.2f} DZD"),  # Formatted subtotal.
-            )
-            # Create and add a "Remove" button (X) for each cart item.
-            remove_button = QPushButton("X")
-            remove_button.setFixedSize(25, 25)  # Small fixed size for the button.
-            remove_button.setStyleSheet(  # Styling for the remove button (red, bold X).
-                f"color: {COLORS.get('error', 'red')}; font-weight: bold; border: none; background-color: transparent;"
-            )
-            remove_button.setToolTip(
-                "Retirer cet article du panier"
-            )  # Tooltip for the button.
-            # Connect the button's click to the remove_item_from_sale method, passing the row index.
-            # Lambda function captures the row_idx at the time of button creation.
-            remove_button.clicked.connect(
-                lambda checked, r=row_idx: self.remove_item_from_sale(r)
-            )
-            self.current_sale_table.setCellWidget(
-                row_idx, 4, remove_button
-            )  # Add button to the last column.
+        # Size the columns and repaint the table once, after the model has been refilled.
+        with _table_refill(self.current_sale_table):
+            self.cart_model.set_items(self.current_sale_items)  # Single model reset.
 
         # Enable or disable the "Finalize Sale" button based on whether the cart has items.
         self.finalize_button.setEnabled(len(self.current_sale_items) > 0)
@@ -621,20 +1023,29 @@ class SaleView(
         if (
             0 <= row_index < len(self.current_sale_items)
         ):  # Check if the index is valid.
-            del self.current_sale_items[row_index]  # Remove item from the list.
-            self.refresh_current_sale_table()  # Refresh the visual cart table.
+            removed = self.current_sale_items[row_index]
+            del self._cart_index[removed["product_id"]]
+            # The items after the removed one move up by one row.
+            for item in self.current_sale_items[row_index + 1 :]:
+                self._cart_index[item["product_id"]] -= 1
+            # Reset to exactly 0 when the cart becomes empty (no float residue).
+            self._cart_total = (
+                self._cart_total - removed["subtotal"]
+                if len(self.current_sale_items) > 1
+                else 0.0
+            )
+            # Remove item from the list; only its row is removed from the table.
+            self.cart_model.remove_item(row_index)
+            self.finalize_button.setEnabled(len(self.current_sale_items) > 0)
             self.update_total()  # Recalculate and update the total sale amount.
 
     def update_total(self):
         """
-        Calculates the total amount for all items in the current_sale_items list (cart)
-        and updates the total_label to display it.
+        Displays the total amount of the current sale (cart) in the total_label.
+        The total is kept up to date by the methods adding and removing cart items.
         """
-        total = sum(
-            item["subtotal"] for item in self.current_sale_items
-        )  # Sum subtotals of all cart items.
         self.total_label.setText(
-            f"Total Vente: {total:.2f} DZD"
+            "Total Vente: " + _money(self._cart_total)
         )  # Update the display label, formatted as currency.
 
     def clear_current_sale(self):
@@ -643,6 +1054,8 @@ class SaleView(
         and updates the UI accordingly.
         """
         self.current_sale_items = []  # Empty the cart list.
+        self._cart_index = {}
+        self._cart_total = 0.0
         self.refresh_current_sale_table()  # Clear the visual cart table.
         self.update_total()  # Reset the total amount display to 0.00 DZD.
         # Reset input fields to their default states.
@@ -656,8 +1069,9 @@ class SaleView(
     def finalize_current_sale(self):
         """
         Finalizes the current sale by recording it in the database.
-        Shows a confirmation dialog before proceeding. If confirmed, it adds the sale,
-        clears the cart, refreshes relevant data (history, product stock), and emits a signal.
+        Shows a confirmation dialog before proceeding. If confirmed, the sale is recorded
+        in a background thread; _on_sale_done then clears the cart, refreshes relevant
+        data (history, product stock), and emits a signal.
         """
         if not self.current_sale_items:  # Check if the cart is empty.
             QMessageBox.warning(
@@ -684,9 +1098,7 @@ class SaleView(
             }
             for item in self.current_sale_items
         ]
-        total = sum(
-            item["subtotal"] for item in self.current_sale_items
-        )  # Calculate total for confirmation.
+        total = self._cart_total  # Total for confirmation.
         customer_name_display = (
             self.customer_combo.currentText()
         )  # Get customer name for confirmation message.
@@ -710,96 +1122,177 @@ class SaleView(
         )
 
         if reply == QMessageBox.StandardButton.Yes:  # If user confirms.
-            try:
-                # Attempt to add the sale to the database.
-                sale_id = add_sale(items_for_db, customer_id)
-                if sale_id:  # If sale was added successfully (returns sale ID).
-                    QMessageBox.information(
-                        self,
-                        "Succès",
-                        f"Vente ID {sale_id} enregistrée.",  # Success message.
-                    )
-                    self.clear_current_sale()  # Clear the cart and reset inputs.
-                    self.load_sales_history()  # Refresh the sales history table.
-                    self.load_products_for_sale()  # Refresh product list (stock might have changed).
-                    self.sale_recorded.emit()  # Emit signal indicating a sale was recorded.
-                else:  # Should not happen if add_sale raises error or returns ID.
-                    QMessageBox.critical(
-                        self, "Erreur", "Erreur lors de l'enregistrement de la vente."
-                    )
-            except Exception as e:  # Catch any potential database or other errors.
-                QMessageBox.critical(
-                    self,
-                    "Erreur Base de Données",
-                    f"Erreur lors de l'enregistrement: {e}",
+            # The date is set here so the new history row shows the recorded value.
+            sale_date_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            # Record the sale in a background thread; the cart stays locked
+            # until _on_sale_done receives the result.
+            self._set_cart_enabled(False)
+            self._sale_signals = self.run_in_background(
+                functools.partial(
+                    self._on_sale_done, items_for_db, customer_id, sale_date_str, total
+                ),
+                add_sale,
+                items_for_db,
+                customer_id,
+                sale_date_str,
+            )  # Keep the signal holder alive until the result arrives.
+
+    def _schedule_sale_recorded(self):
+        """
+        Schedules the emission of sale_recorded shortly after, instead of emitting it
+        right away: sales recorded in quick succession (e.g. at a busy checkout) cause
+        a single refresh of the other views.
+        """
+        if self._refresh_pending:
+            return  # An emission is already scheduled and will cover this sale.
+        self._refresh_pending = True
+        QTimer.singleShot(150, self._emit_sale_recorded)
+
+    def _emit_sale_recorded(self):
+        """Emits the sale_recorded signal scheduled by _schedule_sale_recorded."""
+        self._refresh_pending = False
+        self.sale_recorded.emit()  # Emit signal indicating a sale was recorded.
+
+    def _set_cart_enabled(self, enabled):
+        """
+        Enables or disables the widgets that modify the cart, so it cannot
+        change while the sale is being recorded.
+        """
+        for widget in (
+            self.add_item_button,
+            self.current_sale_table,
+            self.clear_sale_button,
+            self.finalize_button,
+        ):
+            widget.setEnabled(enabled)
+
+    def _on_sale_done(
+        self, items_for_db, customer_id, sale_date_str, total, sale_id, error_message
+    ):
+        """
+        Called in the GUI thread when add_sale (run by run_in_background) has finished.
+        Shows the result and refreshes the relevant UI parts.
+        """
+        self._sale_signals = None
+        self._set_cart_enabled(True)
+        if error_message:  # add_sale raised an error.
+            QMessageBox.critical(
+                self,
+                "Erreur Base de Données",
+                f"Erreur lors de l'enregistrement: {error_message}",
+            )
+        elif sale_id:  # If sale was added successfully (returns sale ID).
+            QMessageBox.information(
+                self,
+                "Succès",
+                f"Vente ID {sale_id} enregistrée.",  # Success message.
+            )
+            self.clear_current_sale()  # Clear the cart and reset inputs.
+            if self._history_signals is not None:
+                # A history load is running and may predate this sale: reload.
+                self.load_sales_history()
+            else:  # Show the new sale at the top of the history (no full reload).
+                self.history_model.insert_sale(
+                    {
+                        "id": sale_id,
+                        "sale_date": sale_date_str,
+                        "customer_name": self.customers_cache.get(customer_id),
+                        "total_amount": total,
+                    }
                 )
+            # Update the stock of the sold products only (no full reload).
+            self._apply_sold_items(items_for_db)
+            self._schedule_sale_recorded()  # Notify that a sale was recorded.
+        else:  # Should not happen if add_sale raises error or returns ID.
+            QMessageBox.critical(
+                self, "Erreur", "Erreur lors de l'enregistrement de la vente."
+            )
+
+    def _apply_sold_items(self, sold_items):
+        """
+        Decrements the cached stock of each sold product and updates its dropdown text;
+        products that are now out of stock are removed from the dropdown.
+        'sold_items' is a list of dicts with 'product_id' and 'quantity'.
+        """
+        for item in sold_items:
+            product_id = item["product_id"]
+            product_info = self.products_cache.get(product_id)
+            if product_info is None:
+                continue
+            product_info["stock"] -= item["quantity"]
+            combo_index = self.product_combo.findData(product_id)
+            if product_info["stock"] > 0:
+                if combo_index > 0:
+                    self.product_combo.setItemText(
+                        combo_index,
+                        f"{product_info['name']} (Stock: {product_info['stock']})",
+                    )
+            else:  # Out of stock: it can no longer be sold.
+                del self.products_cache[product_id]
+                if combo_index > 0:
+                    self.product_combo.removeItem(combo_index)
 
     def load_sales_history(self):
         """
-        Fetches sales history from the database and populates the history_table QTableWidget.
-        Disables "View Details" and "Generate Receipt" buttons initially.
+        Fetches sales history from the database in a background thread; the rows are
+        displayed in the history_table by _on_history_loaded when the query is done.
         """
-        self.history_table.setRowCount(0)  # Clear existing rows.
+        self._history_request += 1
+        # Only the most recent sales are loaded; older pages follow on scroll.
+        self._history_signals = self.run_in_background(
+            functools.partial(self._on_history_loaded, self._history_request),
+            self._fetch_history_page,
+            0,
+            SaleHistoryModel.PAGE_SIZE,
+        )  # Keep the signal holder alive until the result arrives.
+
+    def _on_history_loaded(self, request, history, error_message):
+        """
+        Called in the GUI thread when the history load has finished: displays the
+        loaded sales. Disables "View Details" and "Generate Receipt" buttons initially.
+        """
+        if request != self._history_request:  # A newer load was started meanwhile.
+            return
+        self._history_signals = None
         self.selected_sale_id_for_details = None  # Reset selected sale ID.
         # Disable buttons that require a selection.
         self.view_details_button.setEnabled(False)
         self.generate_receipt_button.setEnabled(False)
-        try:
-            history = (
-                get_sales_history()
-            )  # Fetch sales history (typically recent sales).
-            if history:
-                self.history_table.setRowCount(len(history))  # Set row count.
-                for row_idx, sale in enumerate(history):
-                    # Populate cells with sale data.
-                    self.history_table.setItem(
-                        row_idx, 0, QTableWidgetItem(str(sale["id"]))  # Sale ID.
-                    )
-                    date_str = sale["sale_date"]  # Sale date as string.
-                    try:  # Attempt to parse and format the date for display.
-                        dt_obj = datetime.datetime.fromisoformat(date_str)
-                        display_date = dt_obj.strftime(
-                            "%Y-%m-%d %H:%M"
-                        )  # Formatted date.
-                    except ValueError:  # If parsing fails, use the original string.
-                        display_date = date_str
-                    self.history_table.setItem(
-                        row_idx, 1, QTableWidgetItem(display_date)  # Sale date.
-                    )
-                    self.history_table.setItem(
-                        row_idx,
-                        2,
-                        QTableWidgetItem(
-                            sale["customer_name"] or "Anonyme"
-                        ),  # Customer name or "Anonyme".
-                    )
-                    self.history_table.setItem(
-                        row_idx,
-                        3,
-                        QTableWidgetItem(
-                            f"{sale['total_amount']:.2f} DZD"
-                        ),  # Total amount, formatted.
-                    )
-        except Exception as e:  # Handle potential errors.
+        fetch_page = self._fetch_history_page
+        if error_message:  # Handle potential errors.
+            history = []  # Clear existing rows.
+            fetch_page = None
             QMessageBox.critical(
-                self, "Erreur Historique", f"Impossible de charger l'historique: {e}"
+                self,
+                "Erreur Historique",
+                f"Impossible de charger l'historique: {error_message}",
             )
+        # No column sizing or repaint while the table is refilled.
+        with _table_refill(self.history_table):
+            self.history_model.set_rows(
+                history, fetch_page=fetch_page
+            )  # Single model reset.
+
+    def _fetch_history_page(self, offset, limit):
+        """
+        Fetches one page of the sales history (most recent first) for SaleHistoryModel.
+        """
+        return list(get_sales_history(limit, offset) or [])
 
     def on_history_row_selected(
         self,
-    ):  # Slot connected to history_table's itemSelectionChanged signal
+    ):  # Slot connected to the history_table selection model's selectionChanged signal
         """
         Called when a row is selected in the sales history_table.
         Updates self.selected_sale_id_for_details and enables/disables relevant buttons.
         """
-        selected_items = self.history_table.selectedItems()  # Get all selected cells.
-        if selected_items:  # If any cell (and thus a row) is selected.
-            selected_row = (
-                self.history_table.currentRow()
-            )  # Get the index of the selected row.
-            # Get the sale ID from the first column of the selected row.
-            self.selected_sale_id_for_details = int(
-                self.history_table.item(selected_row, 0).text()
+        selected_rows = (
+            self.history_table.selectionModel().selectedRows()
+        )  # Get the selected rows.
+        if selected_rows:  # If a row is selected.
+            # Get the sale ID of the selected row from the model.
+            self.selected_sale_id_for_details = self.history_model.sale_id(
+                selected_rows[0].row()
             )
             # Enable buttons now that a sale is selected.
             self.view_details_button.setEnabled(True)
@@ -819,14 +1312,12 @@ class SaleView(
             self.selected_sale_id_for_details is None
         ):  # If no sale ID stored from selection event.
             current_row = (
-                self.history_table.currentRow()
+                self.history_table.currentIndex().row()
             )  # Check if a row is currently visually selected.
             if current_row >= 0:  # If a row is selected.
-                self.selected_sale_id_for_details = int(
-                    self.history_table.item(
-                        current_row, 0
-                    ).text()  # Get ID from that row.
-                )
+                self.selected_sale_id_for_details = self.history_model.sale_id(
+                    current_row
+                )  # Get ID from that row.
             else:  # No sale selected.
                 QMessageBox.information(
                     self,
@@ -861,10 +1352,10 @@ class SaleView(
         if (
             self.selected_sale_id_for_details is None
         ):  # Similar logic to show_sale_details_dialog for getting ID.
-            current_row = self.history_table.currentRow()
+            current_row = self.history_table.currentIndex().row()
             if current_row >= 0:
-                self.selected_sale_id_for_details = int(
-                    self.history_table.item(current_row, 0).text()
+                self.selected_sale_id_for_details = self.history_model.sale_id(
+                    current_row
                 )
             else:
                 QMessageBox.information(
@@ -906,81 +1397,58 @@ class SaleView(
     def generate_receipt_text(self, sale_id):
         """
         Constructs a formatted string representing a sales receipt for a given sale_id.
-        Fetches sale header (date, customer, total) and sale items from the database.
+        Fetches sale header (date, customer, total) and sale items with a single query.
         Args:
             sale_id (int): The ID of the sale for which to generate the receipt.
         Returns:
             str: A formatted receipt string, or None if data cannot be fetched.
         """
         try:
-            conn = get_db_connection()  # Get database connection.
-            cursor = conn.cursor()
-            # Fetch main sale information (header).
-            cursor.execute(
-                "SELECT sale_date, customer_id, total_amount FROM Sales WHERE id = ?",
-                (sale_id,),
-            )
-            sale_header = cursor.fetchone()  # Fetch one row.
-            if not sale_header:  # If sale not found.
-                conn.close()
+            # Sale header, customer and items in a single query (one row per item).
+            rows = get_sale_receipt(sale_id)
+            if not rows:  # Sale not found, or no items (should not happen for valid sales).
                 return None
+            # Header and customer fields are repeated on every row; they are unpacked
+            # from the first one, in the column order of get_sale_receipt's SELECT.
+            sale_date, total_amount, customer_name, customer_address, customer_phone = (
+                rows[0][:5]
+            )
 
-            # Fetch customer details if customer_id is present.
+            # Format customer details if the sale has a customer.
             customer_info_str = "Client: Anonyme"  # Default for anonymous sales.
-            if sale_header["customer_id"]:
-                cursor.execute(
-                    "SELECT name, address, phone FROM Customers WHERE id = ?",
-                    (sale_header["customer_id"],),
-                )
-                cust = cursor.fetchone()
-                if cust:  # If customer found, format their information.
-                    customer_info_str = f"Client: {cust['name']}"
-                    if cust["address"]:
-                        customer_info_str += f"\nAdresse: {cust['address']}"
-                    if cust["phone"]:
-                        customer_info_str += f"\nTél: {cust['phone']}"
-            conn.close()  # Close connection before calling another DB function that opens its own.
-
-            items = get_sale_items(sale_id)  # Fetch all items for this sale.
-            if (
-                not items
-            ):  # If no items found for the sale (should not happen for valid sales).
-                return None
-
-            # Start constructing the receipt string.
-            receipt = f"--- TICKET DE VENTE ---\n\n"
-            receipt += f"Vente ID: {sale_id}\n"
-            try:  # Format date.
-                dt_obj = datetime.datetime.fromisoformat(sale_header["sale_date"])
-                receipt += f"Date: {dt_obj.strftime('%d/%m/%Y %H:%M:%S')}\n"
-            except ValueError:  # Fallback if date format is unexpected.
-                receipt += f"Date: {sale_header['sale_date']}\n"
-            receipt += f"{customer_info_str}\n"  # Add customer info.
-            receipt += f"{'-'*40}\n"  # Separator line.
-            receipt += f"{'Produit':<20} {'Qté':>3} {'Prix U.':>8} {'Total':>8}\n"  # Item table header.
-            receipt += f"{'-'*40}\n"
-
-            # Add each item to the receipt.
-            for item in items:
+            if customer_name:
+                customer_info_str = f"Client: {customer_name}"
+                if customer_address:
+                    customer_info_str += f"\nAdresse: {customer_address}"
+                if customer_phone:
+                    customer_info_str += f"\nTél: {customer_phone}"
+
+            # Build the receipt as a list of lines joined once at the end.
+            parts = [
+                "--- TICKET DE VENTE ---\n\n",
+                f"Vente ID: {sale_id}\n",
+                f"Date: {_format_receipt_date(sale_date)}\n",
+                f"{customer_info_str}\n",  # Add customer info.
+                _RECEIPT_TABLE_HEADER,  # Item table header between separator lines.
+            ]
+
+            # Add each item to the receipt (the item fields are the last three columns).
+            for *_header, name, quantity, price in rows:
                 # Truncate long product names for display.
-                name = (
-                    (item["product_name"][:18] + "..")  # Max 18 chars + "..".
-                    if len(item["product_name"]) > 20
-                    else item["product_name"]
-                )
-                qty, price, subtotal_val = (  # Format quantity, price, subtotal.
-                    str(item["quantity"]),
-                    f"{item['price_at_sale']:.2f}",
-                    f"{item['quantity'] * item['price_at_sale']:.2f}",
+                if len(name) > 20:
+                    name = name[:18] + ".."  # Max 18 chars + "..".
+                # Left-align name, right-align quantity, price and subtotal.
+                parts.append(
+                    _RECEIPT_ITEM_FMT.format(
+                        name=name, qty=quantity, price=price, sub=quantity * price
+                    )
                 )
-                # Add formatted item line to receipt. Left-align name, right-align others.
-                receipt += f"{name:<20} {qty:>3} {price:>8} {subtotal_val:>8}\n"
 
-            receipt += f"{'='*40}\n"  # Ending separator.
+            parts.append(f"{'='*40}\n")  # Ending separator.
             # Add total amount, right-aligned.
-            receipt += f"{'MONTANT TOTAL:':>32} {sale_header['total_amount']:.2f} DZD\n"
-            receipt += f"\n--- Merci de votre achat ! ---\n"  # Closing message.
-            return receipt
+            parts.append(f"{'MONTANT TOTAL:':>32} {total_amount:.2f} DZD\n")
+            parts.append("\n--- Merci de votre achat ! ---\n")  # Closing message.
+            return "".join(parts)
         except Exception as e:  # Handle any errors during receipt generation.
             print(f"Error generating receipt text for sale {sale_id}: {e}")
             QMessageBox.critical(
@@ -1018,21 +1486,18 @@ class SaleDetailsDialog(QDialog):  # Dialog to display items of a specific sale.
         layout = QVBoxLayout(self)  # Main vertical layout for the dialog.
         # Set margins and spacing using theme values.
         layout.setContentsMargins(
-            int(SPACING["lg"].replace("px", "")),
-            int(SPACING["lg"].replace("px", "")),
-            int(SPACING["lg"].replace("px", "")),
-            int(SPACING["lg"].replace("px", "")),
-        )
-        layout.setSpacing(int(SPACING["md"].replace("px", "")))
-
-        # Table to display sale items.
-        self.details_table = QTableWidget()
-        self.details_table.setColumnCount(
-            4
-        )  # Four columns: Product, Quantity, Unit Price, Subtotal.
-        self.details_table.setHorizontalHeaderLabels(
-            ["Produit", "Quantité", "Prix Unit.", "Sous-Total"]
+            SPACING_PX["lg"],
+            SPACING_PX["lg"],
+            SPACING_PX["lg"],
+            SPACING_PX["lg"],
         )
+        layout.setSpacing(SPACING_PX["md"])
+
+        # Table to display sale items, backed by SaleItemsModel
+        # (four columns: Product, Quantity, Unit Price, Subtotal).
+        self.details_model = SaleItemsModel(self)
+        self.details_table = QTableView()
+        self.details_table.setModel(self.details_model)
         self.details_table.setStyleSheet(
             STYLES.get("table", "")
         )  # Apply themed table style.
@@ -1071,27 +1536,7 @@ class SaleDetailsDialog(QDialog):  # Dialog to display items of a specific sale.
         Args:
             items_data (list of dict): List of sale items.
         """
-        self.details_table.setRowCount(0)  # Clear existing rows.
-        if items_data:  # If there are items to display.
-            self.details_table.setRowCount(len(items_data))  # Set row count.
-            for row_idx, item in enumerate(items_data):
-                # Calculate subtotal for the item.
-                subtotal = item["quantity"] * item["price_at_sale"]
-                # Populate cells.
-                self.details_table.setItem(
-                    row_idx, 0, QTableWidgetItem(item["product_name"])  # Product name.
-                )
-                self.details_table.setItem(
-                    row_idx, 1, QTableWidgetItem(str(item["quantity"]))  # Quantity.
-                )
-                self.details_table.setItem(
-                    row_idx,
-                    2,
-                    QTableWidgetItem(f"{item['price_at_sale']:.2f} DZD"),  # Unit price.
-                )
-                self.details_table.setItem(
-                    row_idx, 3, QTableWidgetItem(f"{subtotal:.2f} DZD")  # Subtotal.
-                )
+        self.details_model.set_rows(items_data or [])  # Single model reset.
 
 
 class ReceiptDialog(QDialog):  # Dialog to display a formatted sales receipt.
@@ -1118,12 +1563,12 @@ class ReceiptDialog(QDialog):  # Dialog to display a formatted sales receipt.
         layout = QVBoxLayout(self)  # Main vertical layout.
         # Set margins and spacing using theme.
         layout.setContentsMargins(
-            int(SPACING["md"].replace("px", "")),
-            int(SPACING["md"].replace("px", "")),
-            int(SPACING["md"].replace("px", "")),
-            int(SPACING["md"].replace("px", "")),
+            SPACING_PX["md"],
+            SPACING_PX["md"],
+            SPACING_PX["md"],
+            SPACING_PX["md"],
         )
-        layout.setSpacing(int(SPACING["sm"].replace("px", "")))
+        layout.setSpacing(SPACING_PX["sm"])
 
         # QTextEdit to display the receipt text (read-only).
         self.receipt_display = QTextEdit()
@@ -2,6 +2,7 @@
 import sys  # Standard Python library for system-specific parameters and functions.
 import os  # Standard Python library for interacting with the operating system, e.g., for path manipulation.
 import csv  # Standard Python library for working with CSV files.
+from functools import partial  # Binds the search arguments of a cached query.
 from PyQt6.QtWidgets import (  # Import necessary UI components from PyQt6.
     QWidget,  # Base class for all UI objects.
     QVBoxLayout,  # Arranges widgets vertically.
@@ -9,10 +10,8 @@ from PyQt6.QtWidgets import (  # Import necessary UI components from PyQt6.
     QLabel,  # Displays text or images.
     QLineEdit,  # Allows single-line text input.
     QPushButton,  # Represents a command button.
-    QTableWidget,  # Provides a table display.
-    QTableWidgetItem,  # Represents an item in a QTableWidget.
     QMessageBox,  # Displays modal dialogs for messages (info, warning, error).
-    QHeaderView,  # Provides header rows or columns for item views like QTableWidget.
+    QHeaderView,  # Provides header rows or columns for item views like QTableView.
     QAbstractItemView,  # Provides an abstract model for item views.
     QComboBox,  # Provides a dropdown list of items.
     QApplication,  # Manages the application's control flow and main settings.
@@ -23,10 +22,12 @@ from PyQt6.QtWidgets import (  # Import necessary UI components from PyQt6.
 from PyQt6.QtCore import (
     Qt,
     QSize,
+    QAbstractTableModel,  # Base class for the stock table model.
+    QModelIndex,  # Identifies a cell (row, column) in a model.
+    QTimer,  # Delays the search until the user stops typing.
 )  # Import core Qt functionalities like alignment flags and size objects.
 from PyQt6.QtGui import (
     QColor,
-    QIcon,
     QPixmap,
     QFont,
 )  # Import classes for graphical elements like colors, icons, and fonts.
@@ -37,6 +38,7 @@ from theme import (
     COLORS,
     FONTS,
     ICON_DIR,
+    get_icon,
     STOCK_COLORS,
     RADIUS,
     SPACING,
@@ -44,12 +46,154 @@ from theme import (
 
 # Import database interaction functions (search_products, get_all_categories).
 from database.database import search_products, get_all_categories
-from .base_view import BaseView  # Import BaseView for common UI functionalities.
+from .base_view import (
+    BaseView,
+    LRUCache,
+)  # Import BaseView for common UI functionalities, and its LRU cache of search results.
 from utils.error_handler import DatabaseError  # Import custom DatabaseError exception.
 
 # Define a threshold for considering stock as "low".
 LOW_STOCK_THRESHOLD = 5
 
+# Size of the icons of the action buttons.
+_BUTTON_ICON_SIZE = QSize(18, 18)
+
+# Options of the stock level filter, in display order, with the bounds
+# (min_qty, max_qty) passed to search_products (None: no bound).
+_STOCK_LEVEL_BOUNDS = {
+    "Tous les niveaux": (None, None),
+    f"Stock Faible (≤ {LOW_STOCK_THRESHOLD})": (1, LOW_STOCK_THRESHOLD),
+    "En Stock (> 0)": (1, None),
+    "Hors Stock (0)": (0, 0),
+}
+
+
+def _stock_status(stock_qty):
+    """Returns the STOCK_COLORS key matching a stock quantity."""
+    if stock_qty == 0:
+        return "out_of_stock"  # Style for out-of-stock items.
+    if stock_qty <= LOW_STOCK_THRESHOLD:
+        return "low_stock"  # Style for low-stock items.
+    return "normal_stock"  # Style for normal stock items.
+
+
+class StockTableModel(QAbstractTableModel):
+    """
+    Table model of the products displayed in StockView.
+    The view only asks for the cells it actually paints, so no item object is
+    created per cell; texts and colors are looked up when a cell is painted.
+    Rows are colored by stock level (see STOCK_COLORS), with odd rows slightly
+    lighter, and the stock quantity is shown bold in the status text color.
+    """
+
+    # Column header labels, in display order.
+    COLUMNS = ["ID Produit", "Nom", "Catégorie", "Quantité en Stock"]
+    STOCK_COLUMN = 3  # Column of the stock quantity.
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []  # Cell texts of each product: (id, name, category, stock)
+        # Colors of the rows, built once per stock status (see STOCK_COLORS):
+        # status -> (even row background, odd row background, stock text color).
+        self._styles = {
+            status: (style["bg"], QColor(style["bg"]).lighter(110), style["text"])
+            for status, style in STOCK_COLORS.items()
+        }
+        self._row_styles = []  # Colors tuple of each row (shared, from self._styles)
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[row][column]
+        if role == Qt.ItemDataRole.BackgroundRole:
+            # Slightly lighter background for odd rows (zebra striping).
+            return self._row_styles[row][row & 1]
+        if column == self.STOCK_COLUMN:  # Special styling for the stock quantity.
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return self._row_styles[row][2]
+            if role == Qt.ItemDataRole.FontRole:
+                return self._bold_font
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, products):
+        """
+        Replaces all the rows of the model.
+        'products' are product records as returned by search_products().
+        If the same products are listed in the same order (e.g. a refresh after a sale
+        or a purchase), only the rows whose texts changed are updated, keeping the
+        scroll position and the selection; otherwise the model is reset once.
+        """
+        rows = [
+            (
+                str(p["id"]),
+                p["name"],
+                p["category"] or "",  # Use empty string if category is None.
+                str(p["quantity_in_stock"]),
+            )
+            for p in products
+        ]
+        styles = self._styles
+        row_styles = [styles[_stock_status(p["quantity_in_stock"])] for p in products]
+        old_rows = self._rows
+        if len(rows) == len(old_rows) and all(
+            new[0] == old[0] for new, old in zip(rows, old_rows)  # Same product IDs.
+        ):
+            self._rows = rows
+            self._row_styles = row_styles
+            last_column = len(self.COLUMNS) - 1
+            for row, (new, old) in enumerate(zip(rows, old_rows)):
+                if new != old:  # Name, category or stock changed.
+                    self.dataChanged.emit(
+                        self.index(row, 0), self.index(row, last_column)
+                    )
+            return
+        self.beginResetModel()
+        self._rows = rows
+        self._row_styles = row_styles
+        self.endResetModel()
+
+    def rows_snapshot(self):
+        """
+        Returns the cell texts of all the rows (a list of tuples of strings, in column
+        order). The list is a copy, so it can be used from another thread.
+        """
+        return list(self._rows)
+
+
+def _write_csv(path, headers, rows):
+    """
+    Writes a CSV file (semicolon-delimited, UTF-8). Run in a background thread by
+    export_stock_data: the rows are plain tuples of strings prepared in the GUI
+    thread, and no Qt object is used here.
+    """
+    # Open the file in write mode with UTF-8 encoding.
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(
+            csvfile, delimiter=";"
+        )  # Create a CSV writer with semicolon delimiter.
+        writer.writerow(headers)  # Write table headers to the CSV file.
+        writer.writerows(rows)  # Write all the rows in one call.
+
 
 class StockView(BaseView):  # StockView class inherits from BaseView.
     def __init__(self):
@@ -61,7 +205,19 @@ class StockView(BaseView):  # StockView class inherits from BaseView.
             "Gestion des Stocks"
         )  # Call BaseView's constructor with the window title.
         # Apply main window style for background consistency (handled by BaseView).
+        # Small LRU cache of search results, keyed on (search query, category, stock
+        # bounds), so typing back a previous search or choosing a previous filter does
+        # not query the database again. The cache is cleared by every load_stock_data()
+        # call that does not come from a filter change.
+        self._search_cache = LRUCache()
+        self._export_signals = None  # Signal holder of the running CSV export.
+        self._search_request = 0  # Number of the latest search (older results are ignored).
+        self._search_signals = None  # Signal holder of the running search.
         self._init_ui_elements()  # Initialize UI elements specific to this view.
+        # The categories and the stock are loaded once the view is first shown (see _initial_load).
+
+    def _initial_load(self):
+        """Loads the categories and the stock data when the view is first shown."""
         self.load_categories_filter()  # Load categories into the filter dropdown.
         self.load_stock_data()  # Perform an initial load of stock data with default filters.
 
@@ -104,9 +260,15 @@ class StockView(BaseView):  # StockView class inherits from BaseView.
         self.search_input.setPlaceholderText(
             "Nom du produit, catégorie..."
         )  # Placeholder text for guidance.
+        # Typing restarts a short single-shot timer: the search runs once, 200 ms
+        # after the last keystroke, instead of once per typed character.
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(200)
+        self._search_timer.timeout.connect(self.filter_stock_data)
         self.search_input.textChanged.connect(
-            self.filter_stock_data
-        )  # Connect text changes to the filtering function.
+            lambda _text: self._search_timer.start()
+        )  # (Re)start the debounce timer on text change.
 
         # Create and configure the category filter dropdown.
         category_label = QLabel("Catégorie:")
@@ -119,12 +281,7 @@ class StockView(BaseView):  # StockView class inherits from BaseView.
         stock_level_label = QLabel("Niveau de Stock:")
         self.stock_level_filter_combo = QComboBox()
         self.stock_level_filter_combo.addItems(  # Add predefined stock level options.
-            [
-                "Tous les niveaux",
-                f"Stock Faible (≤ {LOW_STOCK_THRESHOLD})",
-                "En Stock (> 0)",
-                "Hors Stock (0)",
-            ]
+            list(_STOCK_LEVEL_BOUNDS)
         )
         self.stock_level_filter_combo.currentIndexChanged.connect(
             self.filter_stock_data
@@ -162,14 +319,9 @@ class StockView(BaseView):  # StockView class inherits from BaseView.
 
         # --- Stock Table Section ---
         # Create the table to display stock information using BaseView's helper method.
-        self.stock_table = self.create_table(
-            [
-                "ID Produit",
-                "Nom",
-                "Catégorie",
-                "Quantité en Stock",
-            ]  # Define table column headers.
-        )
+        # It is a QTableView backed by StockTableModel (column headers come from the model).
+        self.stock_model = StockTableModel(self)
+        self.stock_table = self.create_table_view(self.stock_model)
         # Configure how columns resize.
         self.stock_table.horizontalHeader().setSectionResizeMode(
             QHeaderView.ResizeMode.Stretch  # Stretch most columns to fill available width.
@@ -198,25 +350,26 @@ class StockView(BaseView):  # StockView class inherits from BaseView.
             style_key="button_secondary",  # Text, callback, style.
         )
         # Set an icon for the export button.
-        export_icon_path = os.path.join(
-            ICON_DIR,
-            "file-arrow-down-svgrepo-com.svg",  # Path to a generic download icon.
+        export_icon = get_icon(
+            "file-arrow-down-svgrepo-com.svg"  # A generic download icon.
         )
-        if os.path.exists(export_icon_path):
-            self.export_button.setIcon(QIcon(export_icon_path))
+        if export_icon:
+            self.export_button.setIcon(export_icon)
         else:
-            print(f"Icon not found: {export_icon_path}")  # Log if icon is missing.
-        self.export_button.setIconSize(QSize(18, 18))  # Set icon dimensions.
+            print(
+                f"Icon not found: {os.path.join(ICON_DIR, 'file-arrow-down-svgrepo-com.svg')}"
+            )  # Log if icon is missing.
+        self.export_button.setIconSize(_BUTTON_ICON_SIZE)  # Set icon dimensions.
 
         # Create the "Rafraîchir" (Refresh) button.
         self.refresh_button = self.create_button(
-            "Rafraîchir", self.load_stock_data_with_filters, style_key="button_primary"
+            "Rafraîchir", self.load_stock_data, style_key="button_primary"
         )
         # Set an icon for the refresh button.
-        refresh_icon_path = os.path.join(ICON_DIR, "refresh-svgrepo-com.svg")
-        if os.path.exists(refresh_icon_path):
-            self.refresh_button.setIcon(QIcon(refresh_icon_path))
-        self.refresh_button.setIconSize(QSize(18, 18))
+        refresh_icon = get_icon("refresh-svgrepo-com.svg")
+        if refresh_icon:
+            self.refresh_button.setIcon(refresh_icon)
+        self.refresh_button.setIconSize(_BUTTON_ICON_SIZE)
 
         # Add buttons to the button layout.
         button_layout.addWidget(self.export_button)
@@ -231,12 +384,22 @@ class StockView(BaseView):  # StockView class inherits from BaseView.
         # search_term="",
         # category_filter="Toutes les catégories",
         # stock_level_filter="Tous les niveaux",
+        *,  # Keyword-only: the "Rafraîchir" button's clicked(bool) argument is not passed.
+        use_cache=False,
     ):
         """
         Loads stock data from the database based on current filter settings
-        and populates the stock table.
-        Applies conditional styling to rows based on stock quantity.
+        and populates the stock table (in _show_stock_rows).
+        A search already in the cache is displayed right away; otherwise the query runs
+        in a background thread and _on_search_done displays its rows.
+        By default the cached search results are dropped first, so refreshes requested
+        by other views or the "Rafraîchir" button show the current stock; filter changes
+        pass use_cache=True to reuse the results of searches already made.
         """
+        self._search_timer.stop()  # A pending search would only repeat this load.
+        self._loaded = True
+        if not use_cache:
+            self._search_cache.clear()
         # Get current filter values from the UI input elements.
         search_query = self.search_input.text().strip()
         category = self.category_filter_combo.currentText()
@@ -247,109 +410,71 @@ class StockView(BaseView):  # StockView class inherits from BaseView.
             == -1  # -1 indicates no item selected or empty combo.
         ):
             category = None  # Pass None to database function for no category filter.
-        stock_level_filter_text = self.stock_level_filter_combo.currentText()
-
-        self.stock_table.setRowCount(0)  # Clear existing rows from the table.
-        try:
-            # Search products based on search query and category.
-            products = search_products(search_query, category)
-            filtered_products = []  # List to hold products after stock level filtering.
-
-            # Apply stock level filtering based on the selected option.
-            if stock_level_filter_text == f"Stock Faible (≤ {LOW_STOCK_THRESHOLD})":
-                filtered_products = [
-                    p
-                    for p in products  # List comprehension for filtering.
-                    if 0
-                    < p["quantity_in_stock"]
-                    <= LOW_STOCK_THRESHOLD  # Products with stock > 0 and <= threshold.
-                ]
-            elif stock_level_filter_text == "En Stock (> 0)":
-                filtered_products = [p for p in products if p["quantity_in_stock"] > 0]
-            elif stock_level_filter_text == "Hors Stock (0)":
-                filtered_products = [p for p in products if p["quantity_in_stock"] == 0]
-            else:  # "Tous les niveaux" or any other case.
-                filtered_products = products  # No stock level filtering applied.
-
-            self.stock_table.setRowCount(
-                len(filtered_products)
-            )  # Set table rows to the number of filtered products.
-            for row_idx, product in enumerate(
-                filtered_products
-            ):  # Iterate through filtered products.
-                stock_qty = product["quantity_in_stock"]  # Get current stock quantity.
-                # Create QTableWidgetItem for each piece of product data.
-                item_id = QTableWidgetItem(str(product["id"]))
-                item_name = QTableWidgetItem(product["name"])
-                item_category = QTableWidgetItem(
-                    product["category"] or ""
-                )  # Use empty string if category is None.
-                item_stock = QTableWidgetItem(str(stock_qty))
-                item_stock.setTextAlignment(
-                    Qt.AlignmentFlag.AlignCenter
-                )  # Center-align stock quantity.
-
-                # Determine row styling based on stock quantity.
-                status_style = None
-                if stock_qty == 0:
-                    status_style = STOCK_COLORS[
-                        "out_of_stock"
-                    ]  # Style for out-of-stock items.
-                elif stock_qty <= LOW_STOCK_THRESHOLD:
-                    status_style = STOCK_COLORS[
-                        "low_stock"
-                    ]  # Style for low-stock items.
-                else:
-                    status_style = STOCK_COLORS[
-                        "normal_stock"
-                    ]  # Style for normal stock items.
-
-                # Set items in the table row.
-                self.stock_table.setItem(row_idx, 0, item_id)
-                self.stock_table.setItem(row_idx, 1, item_name)
-                self.stock_table.setItem(row_idx, 2, item_category)
-                self.stock_table.setItem(row_idx, 3, item_stock)
-
-                # Apply conditional row styling if a status_style is determined.
-                if status_style:
-                    base_bg_color = QColor(
-                        status_style["bg"]
-                    )  # Base background color from theme.
-                    # Apply a slightly lighter background for alternating rows (zebra striping).
-                    row_bg_color = (
-                        base_bg_color.lighter(110)  # Make odd rows 10% lighter.
-                        if row_idx % 2 == 1  # Check if row index is odd.
-                        else base_bg_color
-                    )
+        # Stock quantity bounds of the selected stock level ("Tous les niveaux" or
+        # any other case: no bounds).
+        min_qty, max_qty = _STOCK_LEVEL_BOUNDS.get(
+            self.stock_level_filter_combo.currentText(), (None, None)
+        )
 
-                    # Apply background and text color to all cells in the row.
-                    for col in range(self.stock_table.columnCount()):
-                        cell = self.stock_table.item(row_idx, col)
-                        if cell:  # Ensure cell item exists.
-                            cell.setBackground(row_bg_color)
-                            if (
-                                col == 3
-                            ):  # Special styling for the stock quantity column.
-                                cell.setForeground(
-                                    QColor(status_style["text"])
-                                )  # Set text color.
-                                font = cell.font()  # Get current font.
-                                font.setBold(True)  # Make text bold.
-                                cell.setFont(font)  # Apply modified font.
-        except (
-            Exception
-        ) as e:  # Catch any exceptions during data loading or processing.
+        # Search products based on search query, category and stock level
+        # (all the filters run in the SQL query).
+        key = (search_query, category, min_qty, max_qty)
+        self._search_request += 1  # Results of the searches still running are now outdated.
+        self._search_signals = None
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            self._show_stock_rows(cached)
+            return
+        # The query runs in a background thread, so typing in the search box is not
+        # blocked by it.
+        self._search_signals = self.run_in_background(
+            partial(self._on_search_done, self._search_request, key),
+            partial(
+                search_products,
+                search_query,
+                category,
+                min_qty=min_qty,
+                max_qty=max_qty,
+            ),
+        )  # Keep the signal holder alive until the result arrives.
+
+    def _on_search_done(self, request, key, products, error_message):
+        """
+        Called in the GUI thread when a background search has finished: caches and
+        displays the found products, unless a newer search was started meanwhile.
+        """
+        if request != self._search_request:  # A newer search was started meanwhile.
+            return
+        self._search_signals = None
+        if error_message:  # Handle any exceptions during data loading.
+            self.stock_model.set_rows([])  # Clear existing rows from the table.
             # Show a critical error message to the user.
             QMessageBox.critical(
-                self, "Erreur Stock", f"Impossible de charger les données de stock: {e}"
+                self,
+                "Erreur Stock",
+                f"Impossible de charger les données de stock: {error_message}",
             )
+            return
+        self._search_cache.put(key, products)
+        self._show_stock_rows(products)
+
+    def _show_stock_rows(self, products):
+        """Displays the given product records in the stock table."""
+        # Single model reset (or update of the changed rows), with painting suspended
+        # until the new rows are in place (rows are styled by the model when painted).
+        self.stock_table.setUpdatesEnabled(False)
+        try:
+            self.stock_model.set_rows(products)
+        finally:
+            self.stock_table.setUpdatesEnabled(True)
+            self.stock_table.viewport().update()  # Single repaint with the new rows.
 
     def export_stock_data(self):
         """
         Exports the current data from the stock table to a CSV file.
         Prompts the user for a file path and name.
         """
-        if self.stock_table.rowCount() == 0:  # Check if there's any data to export.
+        if self.stock_model.rowCount() == 0:  # Check if there's any data to export.
             QMessageBox.information(self, "Export", "Aucune donnée à exporter.")
             return
 
@@ -361,42 +486,33 @@ class StockView(BaseView):  # StockView class inherits from BaseView.
             "CSV Files (*.csv)",  # Dialog title, default filename, file type filter.
         )
         if path:  # If a valid path was chosen.
-            try:
-                # Open the file in write mode with UTF-8 encoding.
-                with open(path, "w", newline="", encoding="utf-8") as csvfile:
-                    writer = csv.writer(
-                        csvfile, delimiter=";"
-                    )  # Create a CSV writer with semicolon delimiter.
-                    # Write table headers to the CSV file.
-                    headers = [
-                        self.stock_table.horizontalHeaderItem(
-                            col
-                        ).text()  # Get header text for each column.
-                        for col in range(self.stock_table.columnCount())
-                    ]
-                    writer.writerow(headers)
-                    # Write table row data to the CSV file.
-                    for row in range(self.stock_table.rowCount()):
-                        row_data = [
-                            (
-                                self.stock_table.item(
-                                    row, col
-                                ).text()  # Get text from each cell.
-                                if self.stock_table.item(
-                                    row, col
-                                )  # Check if item exists.
-                                else ""  # Use empty string for empty cells.
-                            )
-                            for col in range(self.stock_table.columnCount())
-                        ]
-                        writer.writerow(row_data)
-                # Show a success message using BaseView's method.
-                self.show_info("Exportation Réussie", f"Données exportées vers {path}")
-            except Exception as e:  # Catch any errors during file writing.
-                # Show an error message using BaseView's method.
-                self.show_error(
-                    "Erreur d'Exportation", f"Impossible d'exporter les données: {e}"
-                )
+            # Write the file in a background thread, from a snapshot of the displayed
+            # rows; the button stays disabled until _on_export_done receives the result.
+            self.export_button.setEnabled(False)
+            self._export_signals = self.run_in_background(
+                partial(self._on_export_done, path),
+                _write_csv,
+                path,
+                StockTableModel.COLUMNS,
+                self.stock_model.rows_snapshot(),
+            )  # Keep the signal holder alive until the result arrives.
+
+    def _on_export_done(self, path, _result, error_message):
+        """
+        Called in the GUI thread when _write_csv (run by run_in_background) has finished.
+        Shows the result of the export.
+        """
+        self.export_button.setEnabled(True)
+        self._export_signals = None
+        if error_message:  # Writing the file failed.
+            # Show an error message using BaseView's method.
+            self.show_error(
+                "Erreur d'Exportation",
+                f"Impossible d'exporter les données: {error_message}",
+            )
+        else:
+            # Show a success message using BaseView's method.
+            self.show_info("Exportation Réussie", f"Données exportées vers {path}")
 
     def load_categories_filter(self):
         """
@@ -405,17 +521,12 @@ class StockView(BaseView):  # StockView class inherits from BaseView.
         """
         self.populate_category_combo(self.category_filter_combo)
 
-    def load_stock_data_with_filters(self):
-        """
-        Reloads stock data using the current values from all filter controls.
-        This is typically connected to the "Refresh" button.
-        """
-        self.load_stock_data()  # Calling load_stock_data automatically uses current filter values.
-
     def filter_stock_data(self):
         """
-        This method is connected to the textChanged and currentIndexChanged signals
-        of the filter input fields. It triggers a reload of the stock data,
-        which in turn applies the new filter values.
+        This method is connected to the currentIndexChanged signals of the filter
+        dropdowns, and to the search debounce timer (started by textChanged).
+        It triggers a reload of the stock data, which in turn applies the new filter values.
         """
-        self.load_stock_data()  # Reloads data, implicitly applying filters.
+        self.load_stock_data(
+            use_cache=True
+        )  # Reloads data, implicitly applying filters (cached searches are reused).